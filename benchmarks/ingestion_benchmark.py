@@ -0,0 +1,64 @@
+"""
+Ingestion benchmark for city-level price CSVs.
+
+Generates synthetic hotel-style files (quoted thousands separators, stray spaces,
+trailing empty column, some invalid cells) of growing size and times
+export_json.read_country_averages on each. Time per row should stay flat as the
+row count grows (linear scaling).
+
+    python benchmarks/ingestion_benchmark.py --rows 10000 50000 100000 200000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import export_json
+
+COUNTRIES = ["Japan ", "Britain", "United States", "France", "Italy", "Spain", "Thailand",
+             "Singapore", "Hongkong", "Indonesia", "United Arab Emirates"]
+
+
+def write_city_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Country,City ,Avg_price,\n")
+        for i in range(rows):
+            price = rng.randint(50_000, 600_000)
+            cell = "n/a" if i % 997 == 0 else f"\"{price:,}\" "
+            f.write(f"{rng.choice(COUNTRIES)},City{i},{cell},\n")
+
+
+def time_ingestion(path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        export_json.read_country_averages(path, "Avg_price", "avg_hotel_krw")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked price CSV ingestion.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 100_000, 200_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best time is kept)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'seconds':>8} | {'us/row':>7} | {'rows/s':>10}")
+    print("-" * 46)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.rows:
+            path = os.path.join(tmp_dir, f"cities_{rows}.csv")
+            write_city_csv(path, rows)
+            seconds = time_ingestion(path, args.repeat)
+            print(f"{rows:>10,} | {seconds:>8.3f} | {seconds / rows * 1e6:>7.2f} | {rows / seconds:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
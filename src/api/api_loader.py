@@ -1,24 +1,32 @@
 import os
+import sys
 import requests
 import json
-from dotenv import load_dotenv
-from datetime import datetime
 
-# --- 1. Configuration and Constants Definition ---
-load_dotenv()
-API_KEY = os.getenv("EXIM_API_KEY")
+# Add project root path so the shared HTTP client resolves when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api import http_client
+from src.utils.config import settings, SERVICE_CODE
 
-# API Base URL and Service Code (Constants)
-BASE_URL = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
-SERVICE_CODE = "AP01" 
+# --- 1. Configuration and Constants Definition ---
+# The .env file and the API key are read lazily (see src/utils/config.py): importing
+# this module never fails, load_api_key() raises ValueError if the key is missing.
 TIMEOUT_SECONDS = 10 
 
-if not API_KEY:
-    raise ValueError(" API Key is not configured in the .env file. Please check the EXIM_API_KEY variable.")
+def __getattr__(name):
+    """Lazy module attributes: API_KEY and BASE_URL are resolved on first access."""
+    if name == "API_KEY":
+        return settings.api_key
+    if name == "BASE_URL":
+        return settings.base_url
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def load_api_key():
-    """Returns the API Key, Base URL, and Service Code."""
-    return API_KEY, BASE_URL, SERVICE_CODE
+    """Returns the API Key, Base URL, and Service Code. Raises ValueError if the key is missing."""
+    return settings.api_key, settings.base_url, SERVICE_CODE
 
 def print_data_format(api_key, base_url, service_code):
     """
@@ -36,8 +44,7 @@ def print_data_format(api_key, base_url, service_code):
     print(f"\n--- Verifying API Data Format: [{date}] ---")
     
     try:
-        response = requests.get(base_url, params=params, timeout=TIMEOUT_SECONDS)
-        response.raise_for_status() 
+        response = http_client.get(base_url, params=params, timeout=TIMEOUT_SECONDS)
 
         raw_json = response.json()
         
@@ -56,5 +63,5 @@ def print_data_format(api_key, base_url, service_code):
         print(f" API Request Failed: {e}.")
 
 if __name__ == "__main__":
-    API_KEY, BASE_URL, SERVICE_CODE = load_api_key()
-    print_data_format(API_KEY, BASE_URL, SERVICE_CODE)
\ No newline at end of file
+    api_key, base_url, service_code = load_api_key()
+    print_data_format(api_key, base_url, service_code)
\ No newline at end of file
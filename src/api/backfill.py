@@ -0,0 +1,103 @@
+import os
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+# Add project root path so the shared api modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api import moveAvgDay, business_calendar
+from src.api.country_loader import get_target_currencies
+from src.api.rate_limiter import AdaptiveRateLimiter
+from src.api.quota import QuotaManager
+
+# --- 1. Settings and Constants Definition ---
+BACKFILL_YEARS = 1
+BACKFILL_WORKERS = 8
+
+
+def backfill(api_key, years=BACKFILL_YEARS, end=None, currencies=None, max_workers=BACKFILL_WORKERS,
+             quota=None, rate_limiter=None):
+    """
+    Builds the full multi-year history of all target currencies.
+
+    Dates are fetched newest first by parallel workers, under the shared rate limiter and
+    daily quota. Every fetched date is committed to the rate store right away (the store is
+    the checkpoint), so an interrupted or quota-limited run resumes exactly where it stopped.
+
+    Returns:
+        dict: {"fetched": int, "remaining": int} for this run.
+    """
+    currencies = currencies or get_target_currencies()
+    quota = quota or QuotaManager(api_key)
+    end = end or business_calendar.latest_business_day()
+    start_day = datetime.strptime(end, business_calendar.DATE_FORMAT) - timedelta(days=365 * years)
+    start = start_day.strftime(business_calendar.DATE_FORMAT)
+
+    # 1. Plan: every business date in range that is not stored for every currency yet
+    store = moveAvgDay.open_rate_store()
+    date_sets = store.date_sets(currencies)
+    known_dates = set.intersection(*date_sets.values()) if date_sets else set()
+
+    todo = [
+        search_date for search_date in business_calendar.business_days_since(start, end)
+        if search_date not in known_dates
+    ]
+    print(f" Backfill {start} ~ {end}: {len(todo)} dates to fetch (quota left: {quota.remaining()})")
+
+    # 2. Fetch in parallel, checkpointing each date into the store as soon as it arrives
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+    fetched = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(moveAvgDay.fetch_date_with_limits, api_key, search_date, rate_limiter, quota): search_date
+            for search_date in todo
+        }
+        quota_used_up = False
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            search_date = futures[future]
+            status, payload = future.result()
+
+            if status in ('limit', 'deferred'):
+                # Cancel the queued dates but keep storing the ones already in flight
+                if not quota_used_up:
+                    print(" Daily API quota used up. Run the backfill again tomorrow to resume.")
+                    quota_used_up = True
+                    for pending in futures:
+                        pending.cancel()
+                continue
+            if status == 'error':
+                print(f" [{search_date}] API request error occurred: {payload}. Will retry on the next run.")
+                continue
+
+            store.append((code, search_date, payload[code]) for code in currencies if code in payload)
+            fetched += 1
+            if fetched % 20 == 0:
+                print(f"  > {fetched}/{len(todo)} dates fetched.")
+
+    # 3. Fold the appended rows into the sorted table once the fetching is over
+    store.compact()
+
+    remaining = len(todo) - fetched
+    print(f" Backfill finished: {fetched} dates fetched, {remaining} left for a later run.")
+    return {"fetched": fetched, "remaining": remaining}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill multi-year exchange rate history.")
+    parser.add_argument("--years", type=int, default=BACKFILL_YEARS, help="Years of history to build")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="Parallel fetch workers")
+    args = parser.parse_args()
+
+    api_key, _, _ = moveAvgDay.load_api_key()
+    backfill(api_key, years=args.years, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
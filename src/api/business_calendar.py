@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# --- 1. Settings and Constants Definition ---
+DATE_FORMAT = "%Y%m%d"
+PUBLICATION_HOUR = 11  # EXIM publishes the day's rates late in the morning (KST)
+KST = ZoneInfo("Asia/Seoul")
+
+# Korean public and bank holidays, precomputed offline (lunar dates, substitute and
+# temporary holidays, election days and Labor Day included). Outside the covered
+# years only weekends are treated as closed days.
+CALENDAR_YEARS = range(2023, 2028)
+KR_HOLIDAYS = frozenset({
+    # 2023
+    "20230101", "20230121", "20230122", "20230123", "20230124", "20230301", "20230501",
+    "20230505", "20230527", "20230529", "20230606", "20230815", "20230928", "20230929",
+    "20230930", "20231002", "20231003", "20231009", "20231225",
+    # 2024
+    "20240101", "20240209", "20240210", "20240211", "20240212", "20240301", "20240410",
+    "20240501", "20240505", "20240506", "20240515", "20240606", "20240815", "20240916",
+    "20240917", "20240918", "20241001", "20241003", "20241009", "20241225",
+    # 2025
+    "20250101", "20250127", "20250128", "20250129", "20250130", "20250301", "20250303",
+    "20250501", "20250505", "20250506", "20250603", "20250606", "20250815", "20251003",
+    "20251005", "20251006", "20251007", "20251008", "20251009", "20251225",
+    # 2026
+    "20260101", "20260216", "20260217", "20260218", "20260301", "20260302", "20260501",
+    "20260505", "20260524", "20260525", "20260603", "20260606", "20260815", "20260817",
+    "20260924", "20260925", "20260926", "20261003", "20261005", "20261009", "20261225",
+    # 2027
+    "20270101", "20270206", "20270207", "20270208", "20270209", "20270301", "20270501",
+    "20270505", "20270513", "20270606", "20270815", "20270816", "20270914", "20270915",
+    "20270916", "20271003", "20271004", "20271009", "20271011", "20271225", "20271227",
+})
+
+
+def is_business_day(search_date):
+    """Returns True if EXIM publishes rates on this 'YYYYMMDD' date."""
+    day = datetime.strptime(search_date, DATE_FORMAT)
+    return day.weekday() < 5 and search_date not in KR_HOLIDAYS
+
+
+def latest_business_day(now=None):
+    """
+    Resolves the latest date whose rates are already published, without probing the API.
+    Before PUBLICATION_HOUR on a business day, that is the previous business day.
+    The cut-off is in Korean time whatever the host's time zone (a naive `now` is taken as KST).
+    """
+    now = now or datetime.now(KST)
+    if now.tzinfo is not None:
+        now = now.astimezone(KST)
+    day = now if now.hour >= PUBLICATION_HOUR else now - timedelta(days=1)
+
+    while not is_business_day(day.strftime(DATE_FORMAT)):
+        day -= timedelta(days=1)
+    return day.strftime(DATE_FORMAT)
+
+
+def previous_business_days(count, end=None):
+    """
+    Returns `count` business dates ('YYYYMMDD'), newest first, ending at `end` (inclusive).
+    `end` defaults to the latest published business day.
+    """
+    day = datetime.strptime(end or latest_business_day(), DATE_FORMAT)
+    business_days = []
+
+    while len(business_days) < count:
+        search_date = day.strftime(DATE_FORMAT)
+        if is_business_day(search_date):
+            business_days.append(search_date)
+        day -= timedelta(days=1)
+    return business_days
+
+
+def business_days_since(start, end=None):
+    """
+    Returns every business date ('YYYYMMDD') from `end` back to `start` (both inclusive), newest first.
+    `end` defaults to the latest published business day.
+    """
+    day = datetime.strptime(end or latest_business_day(), DATE_FORMAT)
+    first_day = datetime.strptime(start, DATE_FORMAT)
+    business_days = []
+
+    while day >= first_day:
+        search_date = day.strftime(DATE_FORMAT)
+        if is_business_day(search_date):
+            business_days.append(search_date)
+        day -= timedelta(days=1)
+    return business_days
@@ -1,22 +1,12 @@
 import os
 import sys
 
+# Append project root path to allow importing modules from the 'data' directory.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.registry import REGISTRY
 
-try:
-    # Append project root path to allow importing modules from the 'data' directory.
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from data.export_json import country_map 
-except ImportError:
-    # Define a default country_map if the actual file cannot be imported.
-    country_map = {
-        "United States": "USD", 
-        "Japan": "JPY(100)", 
-        "European Union": "EUR", 
-        "China": "CNY",
-        "Australia": "AUD"
-    }
-    
-    print(" Cannot find country_map... Using temporary currency codes instead.")
+# Canonical country -> currency code, from the shared country/currency registry
+country_map = REGISTRY.country_currencies()
 
 def get_target_currencies():
     """
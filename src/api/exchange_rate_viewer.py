@@ -1,42 +1,35 @@
 import os
+import sys
 import requests
 import json
-from dotenv import load_dotenv
 from datetime import datetime
 
-# 1. Configuration and Constants Definition
-load_dotenv()
-API_KEY = os.getenv("EXIM_API_KEY")
+# Add project root path so the shared api modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
-BASE_URL = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
-SERVICE_CODE = "AP01" 
-TIMEOUT_SECONDS = 10 
+from src.api import response_cache, business_calendar
+from src.utils.config import settings, SERVICE_CODE
 
-if not API_KEY:
-    print(" ERROR: EXIM_API_KEY is not configured in the .env file.")
-    exit()
+# 1. Configuration and Constants Definition
+# (The API key and base URL are resolved lazily when the viewer runs, not at import.)
+TIMEOUT_SECONDS = 10 
 
 def fetch_and_display_currency_data(api_key, base_url, service_code, currency_code):
     """
     Calls the API to retrieve and display the latest exchange rate data for a specific currency code.
     """
-    # 1. Set search date (Attempt to retrieve the latest data)
-    # search_date = datetime.now().strftime("%Y%m%d") # Using current date
-    search_date = "20251209" # Using a fixed date for testing
-    
-    params = {
-        "authkey": api_key,
-        "searchdate": search_date,
-        "data": service_code
-    }
+    # 1. Set search date (latest published business day, resolved offline)
+    search_date = business_calendar.latest_business_day()
     
     print(f"\n--- 🔍 Currency Data Lookup [{currency_code}] ({search_date}) ---")
     
     try:
-        response = requests.get(base_url, params=params, timeout=TIMEOUT_SECONDS)
-        response.raise_for_status() 
-
-        raw_json = response.json()
+        # Served from the local raw response cache when this date was already fetched
+        raw_json = response_cache.fetch_day_response(
+            api_key, search_date, base_url, service_code, timeout=TIMEOUT_SECONDS
+        )
         
         # Check for API error code
         if raw_json and raw_json[0].get('result') == 4:
@@ -74,6 +67,12 @@ def fetch_and_display_currency_data(api_key, base_url, service_code, currency_co
 if __name__ == "__main__":
     
     print("--- EXIM Bank Exchange Rate Viewer ---")
+
+    try:
+        API_KEY = settings.api_key
+    except ValueError:
+        print(" ERROR: EXIM_API_KEY is not configured in the .env file.")
+        sys.exit(1)
     
     # 4. Receive user input
     print("\nReference Currency Codes:")
@@ -83,7 +82,7 @@ if __name__ == "__main__":
     user_input_code = input("Enter the exact currency code (cur_unit) to look up: ").upper()
     
     if user_input_code:
-        fetch_and_display_currency_data(API_KEY, BASE_URL, SERVICE_CODE, user_input_code)
+        fetch_and_display_currency_data(API_KEY, settings.base_url, SERVICE_CODE, user_input_code)
     else:
         print("No currency code was entered.")
         
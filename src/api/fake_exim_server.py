@@ -0,0 +1,234 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import zlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Add project root path so the shared api modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api import http_client, business_calendar
+
+# --- 1. Settings and Constants Definition ---
+DEFAULT_UPSTREAM_URL = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+ENDPOINT_PATH = "/site/program/financial/exchangeJSON"
+MODES = ("synthetic", "replay", "record")
+SEARCHDATE_PATTERN = re.compile(r"[0-9]{8}")  # 'YYYYMMDD' (also keeps record paths inside record_dir)
+
+# Base rates (KRW) and names used for synthetic AP01 responses
+SYNTHETIC_CURRENCIES = {
+    "AED": ("아랍에미리트 디르함", 375.0),
+    "AUD": ("호주 달러", 905.0),
+    "CNH": ("위안화", 192.0),
+    "EUR": ("유로", 1600.0),
+    "GBP": ("영국 파운드", 1840.0),
+    "HKD": ("홍콩 달러", 177.0),
+    "IDR(100)": ("인도네시아 루피아", 8.8),
+    "JPY(100)": ("일본 옌", 935.0),
+    "SGD": ("싱가포르 달러", 1060.0),
+    "THB": ("태국 바트", 42.5),
+    "USD": ("미국 달러", 1380.0),
+}
+
+
+def synthetic_day_data(search_date):
+    """
+    Builds a deterministic AP01 response for a date (empty on weekends/holidays).
+    Each rate drifts +-3% around its base value, seeded by (currency, date).
+    """
+    if not business_calendar.is_business_day(search_date):
+        return []
+
+    day_data = []
+    for cur_unit, (cur_nm, base_rate) in SYNTHETIC_CURRENCIES.items():
+        rng = random.Random(zlib.crc32(f"{cur_unit}:{search_date}".encode("utf-8")))
+        rate = base_rate * (1 + rng.uniform(-0.03, 0.03))
+        day_data.append({
+            "result": 1,
+            "cur_unit": cur_unit,
+            "cur_nm": cur_nm,
+            "ttb": f"{rate * 0.99:,.2f}",
+            "tts": f"{rate * 1.01:,.2f}",
+            "deal_bas_r": f"{rate:,.2f}",
+            "bkpr": f"{int(rate):,}",
+            "kftc_deal_bas_r": f"{rate:,.2f}",
+        })
+    return day_data
+
+
+class FakeEximServer:
+    """
+    Local stand-in for the EXIM exchangeJSON endpoint.
+
+    Modes:
+        synthetic: deterministic generated AP01 responses.
+        replay: serves `<record_dir>/<searchdate>.json` files (missing dates answer []).
+        record: proxies to the real API and saves every answer into `record_dir` for replay.
+
+    Fault injection: `latency` seconds per request, `error_rate` share of HTTP 500
+    answers, and `quota_limit` requests after which every answer is `[{"result": 4}]`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, mode="synthetic", record_dir=None,
+                 latency=0.0, error_rate=0.0, quota_limit=None, seed=0,
+                 upstream_url=DEFAULT_UPSTREAM_URL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Choose one of {MODES}.")
+        if mode in ("replay", "record") and not record_dir:
+            raise ValueError(f"Mode '{mode}' needs a record_dir.")
+
+        self.mode = mode
+        self.record_dir = record_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota_limit = quota_limit
+        self.upstream_url = upstream_url
+        self.request_count = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{ENDPOINT_PATH}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark and test output clean
+
+        return Handler
+
+    def _next_request(self):
+        """Counts the request and decides on injected faults (thread-safe)."""
+        with self._lock:
+            self.request_count += 1
+            over_quota = self.quota_limit is not None and self.request_count > self.quota_limit
+            failed = self._rng.random() < self.error_rate
+        return over_quota, failed
+
+    def _handle(self, handler):
+        url = urlparse(handler.path)
+        if url.path != ENDPOINT_PATH:
+            self._send(handler, 404, {"error": "not found"})
+            return
+
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        search_date = query.get("searchdate", business_calendar.latest_business_day())
+        if not SEARCHDATE_PATTERN.fullmatch(search_date):
+            self._send(handler, 400, {"error": "searchdate must be YYYYMMDD"})
+            return
+
+        over_quota, failed = self._next_request()
+        if self.latency:
+            time.sleep(self.latency)
+
+        if failed:
+            self._send(handler, 500, {"error": "injected failure"})
+            return
+        if over_quota:
+            self._send(handler, 200, [{"result": 4}])
+            return
+
+        try:
+            day_data = self._day_data(search_date, query)
+        except Exception as e:
+            self._send(handler, 502, {"error": f"upstream failed: {e}"})
+            return
+        self._send(handler, 200, day_data)
+
+    def _day_data(self, search_date, query):
+        if self.mode == "synthetic":
+            return synthetic_day_data(search_date)
+
+        record_path = os.path.join(self.record_dir, f"{search_date}.json")
+        if self.mode == "replay":
+            if not os.path.exists(record_path):
+                return []
+            with open(record_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        # Record mode: forward the original query and keep the answer (result 4 is not recorded)
+        day_data = http_client.get(self.upstream_url, params=query).json() or []
+        if not (day_data and day_data[0].get("result") == 4):
+            os.makedirs(self.record_dir, exist_ok=True)
+            with open(record_path, "w", encoding="utf-8") as f:
+                json.dump(day_data, f, indent=4, ensure_ascii=False)
+        return day_data
+
+    def _send(self, handler, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        """Serves requests on a background thread and returns the endpoint URL."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake EXIM exchange rate server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--mode", choices=MODES, default="synthetic")
+    parser.add_argument("--record-dir", help="Folder of recorded responses (replay/record modes)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 answers (0-1)")
+    parser.add_argument("--quota", type=int, default=None, help="Answer result 4 after this many requests")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected errors")
+    parser.add_argument("--upstream-url", default=DEFAULT_UPSTREAM_URL, help="Real API URL (record mode)")
+    args = parser.parse_args()
+
+    server = FakeEximServer(
+        host=args.host, port=args.port, mode=args.mode, record_dir=args.record_dir,
+        latency=args.latency, error_rate=args.error_rate, quota_limit=args.quota,
+        seed=args.seed, upstream_url=args.upstream_url,
+    )
+    print(f"--- Fake EXIM server ({args.mode}) ---")
+    print(f" Serving on {server.base_url}")
+    print(f" Use it with: EXIM_BASE_URL={server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n Stopped.")
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
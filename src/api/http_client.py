@@ -0,0 +1,91 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- 1. Settings and Constants Definition ---
+CONNECT_TIMEOUT_SECONDS = 3.05
+READ_TIMEOUT_SECONDS = 10
+TIMEOUT_BUDGET_SECONDS = 30       # Total time allowed for one call, retries included
+MAX_RETRIES = 2                   # Extra attempts after the first one
+BACKOFF_BASE_SECONDS = 0.2        # Backoff: 0.2s, 0.4s, 0.8s, ...
+POOL_MAXSIZE = 10                 # Keep-alive connections kept per host (>= fetch workers)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the process-wide keep-alive session (connections and TLS are reused)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def close_session():
+    """Closes the shared session (a new one is created on the next call)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get(url, params=None, timeout=READ_TIMEOUT_SECONDS, retries=MAX_RETRIES,
+        budget=TIMEOUT_BUDGET_SECONDS, before_attempt=None):
+    """
+    Sends a GET request through the shared session with bounded exponential-backoff retries.
+
+    Args:
+        url (str): Request URL.
+        params (dict): Query parameters.
+        timeout (float): Read timeout for a single attempt.
+        retries (int): Maximum number of retries on connection errors, timeouts and 429/5xx.
+        budget (float): Total seconds allowed across all attempts and backoff waits.
+        before_attempt (callable, optional): Called before every attempt, retries included
+                                             (e.g. to charge a quota per real call).
+
+    Returns:
+        requests.Response: A successful (2xx) response.
+
+    Raises:
+        requests.exceptions.RequestException: When every attempt failed or the budget ran out.
+    """
+    deadline = time.monotonic() + budget
+    attempt = 0
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout(f"Timeout budget of {budget}s exhausted for {url}")
+
+        if before_attempt is not None:
+            before_attempt()
+        try:
+            response = get_session().get(
+                url, params=params,
+                timeout=(min(CONNECT_TIMEOUT_SECONDS, remaining), min(timeout, remaining))
+            )
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response
+            error = requests.exceptions.HTTPError(
+                f"{response.status_code} Server Error for url: {response.url}", response=response
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+
+        # Retry only transient failures, and only while the budget allows the backoff wait
+        backoff = BACKOFF_BASE_SECONDS * (2 ** attempt)
+        if attempt >= retries or time.monotonic() + backoff >= deadline:
+            raise error
+
+        attempt += 1
+        time.sleep(backoff)
@@ -1,10 +1,10 @@
 import os
 import sys
 import requests
+import numpy as np
 import pandas as pd
-import time
 import math
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 # **--- 1. Add Project Root Path (For Relative Import Resolution) ---**
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -13,16 +13,34 @@ if project_root not in sys.path:
 
 # Import necessary modules using relative paths
 # NOTE: Assuming the function name in country_loader is get_target_currencies
-from src.api.api_loader import load_api_key, SERVICE_CODE, BASE_URL
+from src.api.api_loader import load_api_key, SERVICE_CODE
+from src.utils.config import settings, TREND_KINDS
+from src.api import response_cache, business_calendar
 from src.api.country_loader import get_target_currencies 
+from src.api.rate_limiter import AdaptiveRateLimiter
+from src.api.quota import QuotaManager, QuotaExceededError
+from src.api.rate_store import RateStore, STORE_FILE
+from src.api.rate_schema import rate_array
+from src.utils.file_utils import file_lock, atomic_write
+from src.logic.moving_average import StreamingMovingAverage
+from src.logic.indicators import KINDS as INDICATOR_KINDS, gap_aware_indicators, bounded_ffill, window_coverage
+from src.logic.robust_baseline import rolling_median, rolling_trimmed_mean
 
 # --- 1. Settings and Constants Definition ---
 DAYS_TO_FETCH = 50
 DB_DIR = os.path.join(os.path.dirname(__file__), 'database') 
 DB_FILE_PREFIX = 'exchange_data_'
 MIN_PERIODS = 50
+MAX_LOOKBACK_DAYS = 100  # Business days searched backward at most
+MAX_WORKERS = 4  # Date requests kept in flight at once
+EMA_WARMUP = 2  # An EMA is computed over this many windows of history (when stored)
+MAX_FILL_DAYS = 3  # Longest gap (business days) bridged with the previous rate
+MIN_COVERAGE = 0.8  # Observed share of a window needed to report its MA
+LEGACY_COLUMNS = ['Date', 'Currency Code', 'Currency']
 
-# --- 2. DB and Data Management Functions (Restored Previous Functions) ---
+# --- 2. DB and Data Management Functions ---
+# NOTE: Histories now live in the single rate store (see open_rate_store / rate_store.py).
+# The per-currency CSV helpers below are kept for the legacy file format and its migration.
 
 def setup_database(currency_code):
     """Creates the DB folder and returns the file path."""
@@ -33,9 +51,11 @@ def load_db_data(file_path):
     """Loads existing DB data. Returns an empty DataFrame if file is missing or on error."""
     if os.path.exists(file_path):
         try:
-            # Column names are kept in Korean for consistency with data structure
-            df = pd.read_csv(file_path, index_col=0, parse_dates=['Date'])
-            df['Date'] = df['Date'].dt.strftime('%Y%m%d') 
+            # Only the stored columns are read (the saved index and 50-day_MA are derived data)
+            df = pd.read_csv(
+                file_path, usecols=lambda column: column in LEGACY_COLUMNS,
+                dtype={'Date': str, 'Currency Code': 'category', 'Currency': 'float64'},
+            )
             df = df.sort_values(by='Date', ascending=False)
             return df
         except Exception as e:
@@ -44,129 +64,415 @@ def load_db_data(file_path):
     return pd.DataFrame()
 
 def save_db_data(df, file_path):
-    """Saves the DataFrame to a CSV file."""
+    """Saves the DataFrame to a CSV file (locked, written to a temp file and renamed into place)."""
     if not df.empty:
         df = df.drop_duplicates(subset=['Date'], keep='first')
         df = df.sort_values(by='Date', ascending=True)
         # Convert 'Date' to string before saving (for consistency with load_db_data)
         df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%Y%m%d')
-        df.to_csv(file_path, index=True, encoding='utf-8')
+        with file_lock(f"{file_path}.lock"), atomic_write(file_path) as tmp_path:
+            df.to_csv(tmp_path, index=True, encoding='utf-8')
         print(f" DB save complete: {os.path.basename(file_path)}, total {len(df)} days of data.")
     else:
         print(f" No data to save, skipping file {os.path.basename(file_path)}.")
 
-# --- 3. Optimized Data Collection Function (Restored Previous Function) ---
-# NOTE: BASE_URL, SERVICE_CODE constants are imported from api_loader and available globally
-def fetch_optimized_data(api_key, currency_code, existing_dates, days_needed):
-    """Fetches only the required dates' data from the API that are missing from the existing DB."""
-    new_data = []
-    fetched_count = 0
-    MAX_ITERATIONS = 100
-    
-    # BASE_URL and SERVICE_CODE are global constants imported from the parent module..
+# --- 3. Optimized Data Collection Functions ---
+# NOTE: SERVICE_CODE is imported from api_loader; the base URL is resolved lazily from settings
+def parse_day_rates(day_data):
+    """Converts one AP01 response into a {cur_unit: rate} dictionary."""
+    rates = {}
+    for item in day_data:
+        cur_unit = item.get('cur_unit')
+        deal_bas_r_str = item.get('deal_bas_r')
 
-    print(f" [{currency_code}] Starting new data acquisition (Required business days: {days_needed})")
+        if cur_unit and deal_bas_r_str:
+            # Convert rate string (e.g., "1,363.50") to float
+            rates[cur_unit] = float(deal_bas_r_str.replace(',', ''))
+    return rates
 
-    for i in range(1, MAX_ITERATIONS + 1):
-        search_date = (datetime.now() - timedelta(days=i)).strftime("%Y%m%d")
-        
-        if fetched_count >= days_needed: break
-        if search_date in existing_dates: continue
+def fetch_day_rates(api_key, search_date, rate_limiter=None, quota=None):
+    """
+    Fetches the full AP01 response for one date (served from the raw response cache when possible).
+    Returns {cur_unit: rate}, or None when the API answers with result 4 (limit reached).
+    """
+    # Raises RequestException once the shared HTTP client's retries are exhausted
+    day_data = response_cache.fetch_day_response(
+        api_key, search_date, settings.base_url, SERVICE_CODE, timeout=10, rate_limiter=rate_limiter, quota=quota
+    )
 
-        params = {"authkey": api_key, "searchdate": search_date, "data": SERVICE_CODE}
-        
-        try:
-            response = requests.get(BASE_URL, params=params, timeout=10)
-            response.raise_for_status() 
-            day_data = response.json()
+    if day_data and day_data[0].get('result') == 4:
+        return None
+    return parse_day_rates(day_data)
+
+def fetch_date_with_limits(api_key, search_date, rate_limiter, quota=None):
+    """
+    Worker task: fetches one date under the rate limiter and the daily quota.
+    Reports ('ok' | 'limit' | 'deferred' | 'error', payload).
+    """
+    try:
+        day_rates = fetch_day_rates(api_key, search_date, rate_limiter, quota)
+    except QuotaExceededError as e:
+        return 'deferred', e
+    except requests.exceptions.RequestException as e:
+        rate_limiter.record_failure()
+        return 'error', e
+
+    if day_rates is None:
+        rate_limiter.record_failure()
+        if quota is not None:
+            quota.mark_exhausted()
+        return 'limit', None
+
+    rate_limiter.record_success()
+    return 'ok', day_rates
+
+def plan_missing_dates(currency_needs, remaining, candidates, skip_dates=()):
+    """
+    Picks exactly the business dates each currency still needs (its newest missing ones).
+
+    Args:
+        currency_needs (dict): {currency_code: (existing_dates, days_needed)}
+        remaining (dict): {currency_code: number of dates still needed}
+        candidates (list): Business dates ('YYYYMMDD'), newest first.
+        skip_dates (set): Dates already requested during this run.
+
+    Returns:
+        dict: {search_date: [currency codes needing it]}
+    """
+    plan = {}
+    for currency_code, needed in remaining.items():
+        existing_dates = currency_needs[currency_code][0]
+        picked = 0
+        for search_date in candidates:
+            if picked >= needed: break
+            if search_date in existing_dates or search_date in skip_dates: continue
+            plan.setdefault(search_date, []).append(currency_code)
+            picked += 1
+    return plan
+
+def rank_missing_dates(plan, deficits):
+    """
+    Orders planned dates by value, for spending a limited daily quota well.
+
+    Dates serving the currency with the fewest window dates still missing come first
+    (fewest calls until its MA becomes usable); ties go to the most recent date, then
+    to the date shared by the most currencies.
+
+    Args:
+        plan (dict): {search_date: [currency codes needing it]}
+        deficits (dict): {currency_code: window dates still missing}
+
+    Returns:
+        list: Planned dates, most valuable first.
+    """
+    def value_key(search_date):
+        codes = plan[search_date]
+        closest = min(deficits.get(code, 0) for code in codes)
+        return (closest, -int(search_date), -len(codes))
+
+    return sorted(plan, key=value_key)
 
-            if day_data and day_data[0].get('result') == 4:
+def collect_missing_data(api_key, currency_needs, max_workers=MAX_WORKERS, rate_limiter=None, quota=None,
+                         lookback_days=MAX_LOOKBACK_DAYS):
+    """
+    Fetches the dates missing across ALL target currencies, issuing one request per date.
+
+    Every AP01 response already contains every cur_unit, so a single call is fanned out
+    to each currency that still needs that date. Up to `max_workers` dates are kept in
+    flight at once; responses are merged in date order so the result is deterministic.
+
+    Args:
+        currency_needs (dict): {currency_code: (existing_dates, days_needed)}
+        max_workers (int): Concurrency cap for in-flight date requests.
+        rate_limiter (AdaptiveRateLimiter): Shared limiter (a new one is created if None).
+        quota (QuotaManager): Daily quota ledger. When set, dates are fetched in value order
+            and the ones that no longer fit the budget are deferred to a later run.
+        lookback_days (int): Business days searched backward at most.
+
+    Returns:
+        dict: {currency_code: DataFrame of newly collected rows}
+    """
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+    new_data = {currency_code: [] for currency_code in currency_needs}
+    remaining = {code: needed for code, (_, needed) in currency_needs.items() if needed > 0}
+
+    print(f" Starting shared data acquisition for {len(remaining)} currencies "
+          f"(Required business days: {sum(remaining.values())}, workers: {max_workers})")
+
+    # Business dates only (weekends/holidays are never requested), newest first
+    candidates = business_calendar.previous_business_days(lookback_days)
+    attempted = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while remaining:
+            # 1. Plan exactly the dates still needed and take the newest batch of them
+            plan = plan_missing_dates(currency_needs, remaining, candidates, skip_dates=attempted)
+            # Deficit = window dates still missing (the stored history may be long but stale)
+            batch = rank_missing_dates(plan, remaining)[:max_workers]
+            if not batch: break
+            attempted.update(batch)
+
+            # 2. Fetch the batch concurrently
+            results = list(executor.map(
+                lambda search_date: fetch_date_with_limits(api_key, search_date, rate_limiter, quota), batch
+            ))
+
+            # 3. Merge in planned order so the history is deterministic
+            # (answers that did arrive are kept even when another date of the batch hit a limit)
+            statuses = [status for status, _ in results]
+            stop = all(status == 'error' for status in statuses)
+            if 'limit' in statuses:
                 print(" API rate limit reached or no data available.")
-                break 
-
-            if day_data and not day_data[0].get('result') == 4:
-                for item in day_data:
-                    cur_unit = item.get('cur_unit')
-                    deal_bas_r_str = item.get('deal_bas_r')
-
-                    if cur_unit == currency_code and deal_bas_r_str:
-                        # Convert rate string (e.g., "1,363.50") to float
-                        numeric_rate = float(deal_bas_r_str.replace(',', ''))
-                        
-                        # Use Korean column names for consistency with DB CSVs
-                        new_data.append({'Date': search_date, 'Currency Code': cur_unit, 'Currency': numeric_rate})
-                        fetched_count += 1
-                        print(f"  > [{search_date}] New data collected. (Acquired: {fetched_count}/{days_needed} days)")
-                        break 
-        
-        except requests.exceptions.RequestException as e:
-            print(f" [{search_date}] API request error occurred: {e}. Stopping iteration.")
-            break 
-            
-        time.sleep(0.1) 
-
-    return pd.DataFrame(new_data)
+                stop = True
+            elif 'deferred' in statuses:
+                deferred = len(plan) - sum(status in ('ok', 'error') for status in statuses)
+                print(f" Daily API quota used up: {deferred} planned dates deferred to the next run.")
+                stop = True
+
+            for search_date, (status, payload) in zip(batch, results):
+                if status in ('limit', 'deferred'):
+                    continue
+                if status == 'error':
+                    print(f" [{search_date}] API request error occurred: {payload}. Skipping date.")
+                    continue
+
+                # Fan out the single response to every currency waiting for this date
+                for currency_code in list(remaining):
+                    if search_date in currency_needs[currency_code][0] or currency_code not in payload:
+                        continue
+
+                    # Use Korean column names for consistency with DB CSVs
+                    new_data[currency_code].append(
+                        {'Date': search_date, 'Currency Code': currency_code, 'Currency': payload[currency_code]}
+                    )
+                    remaining[currency_code] -= 1
+                    fetched_count = len(new_data[currency_code])
+                    needed = currency_needs[currency_code][1]
+                    print(f"  > [{currency_code}][{search_date}] New data collected. "
+                          f"(Acquired: {fetched_count}/{needed} days)")
+                    if remaining[currency_code] <= 0:
+                        del remaining[currency_code]
+
+            if stop: break
+
+    return {currency_code: pd.DataFrame(rows, columns=LEGACY_COLUMNS) for currency_code, rows in new_data.items()}
+
+def fetch_optimized_data(api_key, currency_code, existing_dates, days_needed):
+    """Fetches only the required dates' data from the API that are missing from the existing DB."""
+    return collect_missing_data(api_key, {currency_code: (existing_dates, days_needed)})[currency_code]
 
 
 # --- 4. Main Analysis Function (For External Reference) ---
 
+def open_rate_store():
+    """Opens the shared rate store, migrating legacy per-currency CSV files on first use."""
+    store = RateStore(os.path.join(DB_DIR, STORE_FILE))
+    store.migrate_csvs(DB_DIR, DB_FILE_PREFIX)
+    return store
+
+def window_state_is_current(engine, stored_dates):
+    """
+    A saved window is reusable only if no day was added inside it (e.g. by a backfill):
+    the stored dates between its first and last date must be exactly its own dates.
+    """
+    if engine.window != DAYS_TO_FETCH or not engine.dates:
+        return False
+    first_date, last_date = engine.first_date, engine.last_date
+    return sum(1 for date in stored_dates if first_date <= date <= last_date) == engine.count
+
+def update_moving_averages(store, currencies, date_sets):
+    """
+    Brings every currency's streaming MA (window state persisted in the rate store) up to date.
+    Each new day costs O(1); a window is rebuilt from the store only when it cannot be reused.
+
+    Returns:
+        dict: {currency_code: StreamingMovingAverage}
+    """
+    saved_states = store.load_window_states(currencies, DAYS_TO_FETCH)
+    engines = {}
+    for currency_code in currencies:
+        state = saved_states.get(currency_code)
+        engine = StreamingMovingAverage.from_state(state) if state else None
+        if engine and window_state_is_current(engine, date_sets[currency_code]):
+            engines[currency_code] = engine
+
+    # Current windows: apply only the newer days. Others: replay the latest window.
+    new_rows = store.load_after({currency_code: engine.last_date for currency_code, engine in engines.items()})
+    stale = [currency_code for currency_code in currencies if currency_code not in engines]
+    rebuild_rows = store.load_latest(stale, DAYS_TO_FETCH)
+    for currency_code in stale:
+        engines[currency_code] = StreamingMovingAverage(DAYS_TO_FETCH)
+
+    for rows in (rebuild_rows, new_rows):
+        for currency_code, date, rate in zip(rows['Currency Code'], rows['Date'], rows['Currency']):
+            engines[currency_code].update(date, rate)
+
+    store.save_window_states({currency_code: engine.to_state() for currency_code, engine in engines.items()},
+                             DAYS_TO_FETCH)
+    return engines
+
+def update_rate_history(api_key, store, currencies, days):
+    """
+    Fetches the last `days` business days missing for every currency (one request per date).
+    A stale or gapped history fetches its newest missing dates, however many rows it already holds.
+    Returns the up-to-date {currency_code: set of stored dates}.
+    """
+    # 1. Check every currency's history first so the missing dates can be planned together
+    date_sets = store.date_sets(currencies)  # One consistent snapshot of every history
+    window_dates = set(business_calendar.previous_business_days(days))
+    currency_needs = {}
+    for currency_code in currencies:
+        needed_days = len(window_dates - date_sets[currency_code])
+
+        if needed_days > 0:
+            currency_needs[currency_code] = (date_sets[currency_code], needed_days)
+        else:
+            print(f" [{currency_code}] Sufficient data (last {days} days) exists in DB. Skipping API call.")
+
+    # 2. Data Collection (one request per date, shared by all currencies) and Store Update
+    if currency_needs:
+        # Only the window's own business dates are candidates: older rows are never read by the trend
+        new_frames = collect_missing_data(api_key, currency_needs, quota=QuotaManager(api_key), lookback_days=days)
+        # Append-only: only the new rows are written, whatever the history length
+        saved = store.append(
+            (currency_code, date, rate)
+            for currency_code, new_df in new_frames.items()
+            for date, rate in zip(new_df['Date'], new_df['Currency'])
+        )
+        print(f" DB save complete: {saved} new rows appended.")
+        for currency_code, new_df in new_frames.items():
+            date_sets[currency_code].update(new_df['Date'])
+
+    return date_sets
+
 def get_50day_ma_data(api_key):
     """
     Collects and updates exchange rate data, calculates the Moving Average (MA), and returns the DataFrame.
     Does NOT include R-value calculation logic.
+
+    The MA covers the last DAYS_TO_FETCH business days. A currency whose stored days fill
+    that window exactly uses its streaming window; one with gaps gets the gap-aware MA,
+    flagged through the 'Coverage' and 'Partial' columns.
     """
     
     TARGET_CURRENCIES = get_target_currencies() # Load currency code list
     all_ma_results = []
-    
+    store = open_rate_store()
+
+    # 1-2. Make sure the last DAYS_TO_FETCH days of every currency are stored
+    date_sets = update_rate_history(api_key, store, TARGET_CURRENCIES, DAYS_TO_FETCH)
+
+    # 3. Moving Average Calculation (streaming: only the days added since the last run are applied)
+    engines = update_moving_averages(store, TARGET_CURRENCIES, date_sets)
+    window_dates = set(business_calendar.previous_business_days(DAYS_TO_FETCH))
+
+    gapped = []
     for currency_code in TARGET_CURRENCIES:
-        file_path = setup_database(currency_code)
-        existing_df = load_db_data(file_path) # Load previous data (string 'Date')
-        
-        existing_dates = set(existing_df['Date'].unique()) if not existing_df.empty else set()
-        current_data_count = len(existing_df)
-        needed_days = DAYS_TO_FETCH - current_data_count
-        
-        updated_df = existing_df.copy()
-
-        # 1. Data Collection and Update (Optimization)
-        if needed_days > 0:
-            new_df = fetch_optimized_data(api_key, currency_code, existing_dates, needed_days)
-            updated_df = pd.concat([existing_df, new_df], ignore_index=True)
-        else:
-            print(f" [{currency_code}] Sufficient data ({current_data_count} days) exists in DB. Skipping API call.")
-
-        
-        # 2. Moving Average Calculation
-        if len(updated_df) >= MIN_PERIODS:
-            
-            # Convert 'Date' to datetime objects and sort ascending for MA calculation
-            updated_df['Date'] = pd.to_datetime(updated_df['Date'])
-            updated_df = updated_df.sort_values(by='Date', ascending=True).reset_index(drop=True)
-            
-            # Calculate 50-day MA (Note: DAYS_TO_FETCH is currently 5)
-            updated_df['50-day_MA'] = updated_df['Currency'].rolling(window=DAYS_TO_FETCH, min_periods=MIN_PERIODS).mean()
-            
-            # 3. Database Save (Update for the next run)
-            # (The save_db_data function converts the date back to string before saving)
-            save_db_data(updated_df, file_path)
-
-            # 4. Prepare data for return (Final data needed for R-value calculation)
-            latest_ma_data = updated_df.iloc[-1]
-            
-            # Extract necessary columns and add to the list (Convert date to string)
+        engine = engines[currency_code]
+
+        if engine.ready and set(engine.dates) == window_dates:
             all_ma_results.append({
                 'Currency Code': currency_code,
-                'Date': latest_ma_data['Date'].strftime('%Y%m%d'),
-                'Currency': latest_ma_data['Currency'],
-                '50-day_MA': latest_ma_data['50-day_MA']
+                'Date': engine.last_date,
+                'Currency': engine.latest,
+                '50-day_MA': engine.mean,
+                'Coverage': 1.0,
+                'Partial': False,
             })
-
         else:
-            print(f" [{currency_code}] Data is less than the minimum {MIN_PERIODS} days. Cannot calculate MA. ({len(updated_df)} days)")
+            gapped.append(currency_code)
+
+    # 3-1. Histories with gaps or stale days: time-based window with bounded forward-fill
+    if gapped:
+        gap_df = calculate_trends(store, gapped, DAYS_TO_FETCH, 'sma')
+        all_ma_results.extend(gap_df.rename(columns={'MA': '50-day_MA'}).to_dict('records'))
+
+    # 4. Dedupe/sort the appended rows into the indexed table off the request path
+    store.compact_if_needed()
 
     return pd.DataFrame(all_ma_results)
 
+def load_rate_array(store, currencies, days):
+    """
+    Loads the last `days` business days (plus MAX_FILL_DAYS to seed the forward-fill) of every
+    currency as a (business day x currency) array, oldest first. Days not stored are NaN.
+
+    Returns:
+        tuple: (list of 'YYYYMMDD' dates, np.ndarray of rates)
+    """
+    dates = business_calendar.previous_business_days(days + MAX_FILL_DAYS)[::-1]
+    # Compact layout (categorical codes, int32 days, float32 rates): long windows stay small in memory
+    history = store.load_history(currencies, start=dates[0], compact=True)
+    return dates, rate_array(history, dates, currencies)
+
+def calculate_trends(store, currencies, window, kind):
+    """
+    Gap-aware `window`-business-day baseline of every currency: SMA or EMA (the vectorized
+    indicator engine, see indicators.gap_aware_indicators), or the robust rolling median / trimmed mean (streaming, one window update per day).
+
+    Gaps up to MAX_FILL_DAYS carry the previous rate; an average is reported only if at
+    least MIN_COVERAGE of the window was observed. 'Partial' flags windows with gaps.
+
+    Returns:
+        pd.DataFrame: Columns 'Currency Code', 'Date', 'Currency', 'MA', 'Coverage', 'Partial'.
+    """
+    history_days = window * EMA_WARMUP if kind == 'ema' else window
+    dates, values = load_rate_array(store, currencies, history_days)
+
+    if kind in INDICATOR_KINDS:
+        averages, coverages = gap_aware_indicators(values, [window], [kind], MAX_FILL_DAYS, MIN_COVERAGE)
+        averages, coverage = averages[(kind, window)], coverages[window]
+    else:
+        filled = bounded_ffill(values, MAX_FILL_DAYS)
+        coverage = window_coverage(values, window)
+        if kind == 'median':
+            averages = rolling_median(filled, window, min_periods=1)
+        elif kind == 'trimmed':
+            averages = rolling_trimmed_mean(filled, window, min_periods=1)
+        else:
+            raise ValueError(f"Unknown trend kind '{kind}'. Choose one of {TREND_KINDS}.")
+        averages = np.where(coverage >= MIN_COVERAGE, averages, np.nan)
+
+    results = []
+    for j, currency_code in enumerate(currencies):
+        observed_rows = np.flatnonzero(~np.isnan(values[:, j]))
+        if np.isnan(averages[-1, j]) or not len(observed_rows):
+            print(f" [{currency_code}] Only {coverage[-1, j]:.0%} of the last {window} business days are stored "
+                  f"(minimum {MIN_COVERAGE:.0%}). Cannot calculate {kind.upper()}.")
+            continue
+
+        last_row = observed_rows[-1]
+        results.append({
+            'Currency Code': currency_code,
+            'Date': dates[last_row],
+            'Currency': values[last_row, j],
+            'MA': averages[-1, j],
+            'Coverage': round(float(coverage[-1, j]), 4),
+            'Partial': bool(coverage[-1, j] < 1.0),
+        })
+    return pd.DataFrame(results, columns=['Currency Code', 'Date', 'Currency', 'MA', 'Coverage', 'Partial'])
+
+def get_trend_data(api_key, window=DAYS_TO_FETCH, kind='sma'):
+    """
+    Returns the latest rate and its `window`-day baseline (one of TREND_KINDS) for every currency.
+
+    The default 50-day SMA comes from the streaming engine (get_50day_ma_data). Other
+    windows are computed for all currencies at once by the gap-aware vectorized engine.
+
+    Returns:
+        pd.DataFrame: Columns 'Currency Code', 'Date', 'Currency', 'MA', 'Coverage', 'Partial'.
+    """
+    if window == DAYS_TO_FETCH and kind == 'sma':
+        return get_50day_ma_data(api_key).rename(columns={'50-day_MA': 'MA'})
+
+    TARGET_CURRENCIES = get_target_currencies()
+    store = open_rate_store()
+    update_rate_history(api_key, store, TARGET_CURRENCIES, window)
+
+    trends = calculate_trends(store, TARGET_CURRENCIES, window, kind)
+    store.compact_if_needed()
+    return trends
+
 if __name__ == "__main__":
     # Assuming load_api_key returns the key, service code, and base URL
     API_KEY, _, _ = load_api_key() 
@@ -177,6 +483,6 @@ if __name__ == "__main__":
     if not result_df.empty:
         print("\n[Final 50-day Moving Average Data (For R-Value Calculation)]")
         # Print necessary data without R-value calculation
-        print(result_df[['Currency Code', 'Date', 'Currency', '50-day_MA']].to_markdown(index=False, floatfmt=".2f"))
+        print(result_df[['Currency Code', 'Date', 'Currency', '50-day_MA', 'Coverage']].to_markdown(index=False, floatfmt=".2f"))
     else:
         print("No data was collected.")
\ No newline at end of file
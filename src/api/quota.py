@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime, timedelta
+
+# Add project root path so the shared modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.file_utils import file_lock, atomic_write
+
+# --- 1. Settings and Constants Definition ---
+DAILY_LIMIT = 1000  # EXIM daily request limit per API key
+STATE_DIR = os.path.join(os.path.dirname(__file__), 'state')
+LEDGER_FILE = 'quota_ledger.json'
+DAYS_KEPT = 7       # Older ledger days are pruned
+
+
+class QuotaExceededError(Exception):
+    """Raised when a request would exceed the daily API quota."""
+
+
+class QuotaManager:
+    """
+    Daily request ledger persisted across process runs.
+
+    Calls are counted per API key (stored as a hash) and per day in a JSON ledger.
+    Every update happens under an advisory file lock, so cron jobs and CLI runs on
+    the same machine share one budget.
+    """
+
+    def __init__(self, api_key, daily_limit=DAILY_LIMIT, state_dir=None):
+        self.key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.daily_limit = daily_limit
+        self.ledger_path = os.path.join(state_dir or STATE_DIR, LEDGER_FILE)
+        self.lock_path = f"{self.ledger_path}.lock"
+
+    def _today(self):
+        return datetime.now().strftime("%Y%m%d")
+
+    def _read_ledger(self):
+        if not os.path.exists(self.ledger_path):
+            return {}
+        try:
+            with open(self.ledger_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_ledger(self, ledger):
+        # Keep only the last DAYS_KEPT days for every key
+        cutoff = (datetime.now() - timedelta(days=DAYS_KEPT)).strftime("%Y%m%d")
+        for key_id in ledger:
+            ledger[key_id] = {day: n for day, n in ledger[key_id].items() if day >= cutoff}
+
+        with atomic_write(self.ledger_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(ledger, f, indent=4)
+
+    def used(self):
+        """Returns the number of calls already made today with this key."""
+        with file_lock(self.lock_path):
+            return self._read_ledger().get(self.key_id, {}).get(self._today(), 0)
+
+    def remaining(self):
+        """Returns the number of calls still available today."""
+        return max(0, self.daily_limit - self.used())
+
+    def try_acquire(self, calls=1):
+        """Reserves `calls` requests for today. Returns False (and reserves nothing) if over the limit."""
+        with file_lock(self.lock_path):
+            ledger = self._read_ledger()
+            key_days = ledger.setdefault(self.key_id, {})
+            today = self._today()
+
+            if key_days.get(today, 0) + calls > self.daily_limit:
+                return False
+
+            key_days[today] = key_days.get(today, 0) + calls
+            self._write_ledger(ledger)
+            return True
+
+    def acquire(self, calls=1):
+        """Same as try_acquire, but raises QuotaExceededError when over the limit."""
+        if not self.try_acquire(calls):
+            raise QuotaExceededError(f"Daily API quota of {self.daily_limit} calls reached.")
+
+    def mark_exhausted(self):
+        """Records that the API itself reported the limit (result 4): no more calls today."""
+        with file_lock(self.lock_path):
+            ledger = self._read_ledger()
+            ledger.setdefault(self.key_id, {})[self._today()] = self.daily_limit
+            self._write_ledger(ledger)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+# --- 1. Settings and Constants Definition ---
+MIN_INTERVAL_SECONDS = 0.05   # Fastest spacing between two requests
+MAX_INTERVAL_SECONDS = 2.0    # Slowest spacing after repeated failures
+BACKOFF_FACTOR = 2.0          # Interval multiplier on result 4 / errors
+RECOVERY_STEP_SECONDS = 0.01  # Interval decrease on every success
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe limiter that spaces out EXIM requests issued by concurrent workers.
+
+    The interval between two requests grows multiplicatively when the API answers
+    with `result == 4` or an error, and shrinks additively on every success (AIMD).
+    """
+
+    def __init__(self, min_interval=MIN_INTERVAL_SECONDS, max_interval=MAX_INTERVAL_SECONDS,
+                 backoff_factor=BACKOFF_FACTOR, recovery_step=RECOVERY_STEP_SECONDS):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        """Blocks the calling worker until its request slot is reached."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_success(self):
+        """Speeds up again after a successful response."""
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval - self.recovery_step)
+
+    def record_failure(self):
+        """Backs off after `result == 4` or a request error."""
+        with self._lock:
+            self.interval = min(self.max_interval, self.interval * self.backoff_factor)
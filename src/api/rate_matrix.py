@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import uuid
+import argparse
+from bisect import bisect_right
+
+import numpy as np
+
+# Add project root path so the shared api modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api import moveAvgDay, business_calendar
+from src.api.rate_schema import rate_array, to_date_strings
+from src.utils.file_utils import file_lock, atomic_write
+
+# --- 1. Settings and Constants Definition ---
+INDEX_FILE = 'rate_matrix.json'
+MATRIX_FILE_PREFIX = 'rate_matrix-'
+FORMAT_VERSION = 1
+
+
+def matrix_dir():
+    """The matrix lives next to the rate store."""
+    return moveAvgDay.DB_DIR
+
+
+def build_rate_matrix(store=None, currencies=None, start=None, end=None, directory=None):
+    """
+    Exports the rate store as a fixed-layout `date x currency` float64 matrix (.npy) plus a JSON index.
+
+    Rows are every business date from the first stored date (or `start`) to `end`,
+    oldest first; days without a stored rate are NaN. The matrix is written under a
+    fresh file name and the index is swapped in atomically, so processes that already
+    mapped the previous version keep a consistent view.
+
+    Returns:
+        dict: The index that was written.
+    """
+    store = store or moveAvgDay.open_rate_store()
+    directory = directory or matrix_dir()
+    # Compact layout (categorical codes, int32 days, float32 rates): the full history stays small in memory
+    history = store.load_history(sorted(currencies) if currencies else None, start, compact=True)
+    currencies = list(history['Currency Code'].cat.categories)
+
+    if history.empty:
+        dates = []
+    else:
+        first, last = to_date_strings([history['Day'].min(), history['Day'].max()])
+        dates = business_calendar.business_days_since(start or first, end or last)
+        dates.reverse()
+
+    matrix = np.ascontiguousarray(rate_array(history, dates, currencies))
+
+    # Builders are serialized so one never deletes the file another is about to publish
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, INDEX_FILE)
+    with file_lock(f"{index_path}.lock"):
+        # 1. Write the new matrix under a unique name
+        matrix_file = f"{MATRIX_FILE_PREFIX}{uuid.uuid4().hex}.npy"
+        np.save(os.path.join(directory, matrix_file), matrix)
+
+        # 2. Atomically point the index at it
+        index = {
+            "version": FORMAT_VERSION,
+            "matrix_file": matrix_file,
+            "dates": dates,
+            "currencies": currencies,
+        }
+        with atomic_write(index_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+
+        # 3. Drop older versions (open maps stay valid on POSIX; skipped where the OS refuses)
+        for name in os.listdir(directory):
+            if name.startswith(MATRIX_FILE_PREFIX) and name.endswith(".npy") and name != matrix_file:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    print(f" Rate matrix built: {len(dates)} dates x {len(currencies)} currencies.")
+    return index
+
+
+class RateMatrix:
+    """
+    Read-only, memory-mapped view of the exported rate matrix.
+
+    `values` is a NumPy memmap (dates x currencies, oldest date first): slicing it
+    parses nothing and copies nothing, and every process mapping the same file
+    shares the pages from the OS cache.
+    """
+
+    def __init__(self, directory=None):
+        directory = directory or matrix_dir()
+        index_path = os.path.join(directory, INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No rate matrix in {directory}. Build it with: python src/api/rate_matrix.py")
+
+        # A rebuild may replace the matrix between reading the index and mapping it: re-read once
+        for attempt in range(2):
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported rate matrix version: {index.get('version')}")
+            try:
+                self.values = np.load(os.path.join(directory, index["matrix_file"]), mmap_mode='r')
+                break
+            except FileNotFoundError:
+                if attempt:
+                    raise
+
+        self.dates = index["dates"]
+        self.currencies = index["currencies"]
+        self._columns = {currency_code: j for j, currency_code in enumerate(self.currencies)}
+
+    def column(self, currency_code):
+        """Full history of one currency (view, NaN on missing days)."""
+        return self.values[:, self._columns[currency_code]]
+
+    def row_until(self, end_date):
+        """Number of rows dated on or before `end_date` ('YYYYMMDD')."""
+        return bisect_right(self.dates, end_date)
+
+    def window(self, days, end_date=None):
+        """Last `days` rows up to `end_date` (default: newest), for all currencies (view)."""
+        stop = len(self.dates) if end_date is None else self.row_until(end_date)
+        return self.values[max(stop - days, 0):stop]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the rate store as a memory-mapped rate matrix.")
+    parser.add_argument("--start", help="First date to include (YYYYMMDD). Default: oldest stored date")
+    args = parser.parse_args()
+
+    build_rate_matrix(start=args.start)
+
+
+if __name__ == "__main__":
+    main()
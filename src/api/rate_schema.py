@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# --- 1. Settings and Constants Definition ---
+# Compact in-memory layout of a rate history (one row per currency and day):
+#   'Currency Code' -> category  (1 byte per row instead of a Python string)
+#   'Day'           -> int32     (days since 1970-01-01 instead of a 'YYYYMMDD' string)
+#   'Currency'      -> float32   (EXIM rates carry 2 decimals and stay far below float32's 7 digits)
+DAY_DTYPE = np.int32
+RATE_DTYPE = np.float32
+RATE_DECIMALS = 2  # Published precision, restored when expanding back to float64
+COMPACT_COLUMNS = ['Currency Code', 'Day', 'Currency']
+DATE_FORMAT = "%Y%m%d"
+
+
+def to_day_numbers(dates):
+    """Converts 'YYYYMMDD' strings to int32 day numbers (days since 1970-01-01)."""
+    days = pd.to_datetime(pd.Series(dates, dtype=str), format=DATE_FORMAT).to_numpy(dtype="datetime64[D]")
+    return days.astype(np.int64).astype(DAY_DTYPE)
+
+
+def to_date_strings(day_numbers):
+    """Converts int32 day numbers back to 'YYYYMMDD' strings."""
+    days = np.asarray(day_numbers, dtype=np.int64).astype("datetime64[D]")
+    return [day.replace("-", "") for day in np.datetime_as_string(days, unit="D")]
+
+
+def compact_rates(df, currencies=None):
+    """
+    Converts a rate frame with the store's columns ('Currency Code', 'Date', 'Currency')
+    to the compact layout. `currencies` fixes the category order (default: sorted codes).
+
+    Returns:
+        pd.DataFrame: Columns COMPACT_COLUMNS, same row order.
+    """
+    categories = sorted(df['Currency Code'].unique()) if currencies is None else list(currencies)
+    return pd.DataFrame({
+        'Currency Code': pd.Categorical(df['Currency Code'], categories=categories),
+        'Day': to_day_numbers(df['Date']),
+        'Currency': df['Currency'].to_numpy(dtype=RATE_DTYPE),
+    }, index=df.index)
+
+
+def expand_rates(df):
+    """Converts a compact frame back to the store's columns (string codes and 'YYYYMMDD' dates)."""
+    return pd.DataFrame({
+        'Currency Code': df['Currency Code'].astype(str),
+        'Date': to_date_strings(df['Day']),
+        'Currency': df['Currency'].astype(np.float64).round(RATE_DECIMALS),
+    }, index=df.index)
+
+
+def rate_array(df, dates, currencies):
+    """
+    Scatters a compact frame into a (date x currency) float64 array without a pandas pivot.
+
+    Args:
+        df (pd.DataFrame): Compact rates whose categories are `currencies` (compact_rates / load_history).
+        dates (list): 'YYYYMMDD' row dates, oldest first.
+        currencies (list): Column order (the frame's categories).
+
+    Returns:
+        np.ndarray: Rates at the published precision; NaN where a (date, currency) is not in `df`.
+    """
+    values = np.full((len(dates), len(currencies)), np.nan)
+    if not len(dates) or df.empty:
+        return values
+
+    day_numbers = to_day_numbers(dates)
+    rows = np.searchsorted(day_numbers, df['Day'].to_numpy())
+    columns = df['Currency Code'].cat.codes.to_numpy()
+    inside = (rows < len(day_numbers)) & (columns >= 0)
+    inside[inside] = day_numbers[rows[inside]] == df['Day'].to_numpy()[inside]
+
+    rates = df['Currency'].to_numpy(dtype=np.float64).round(RATE_DECIMALS)
+    values[rows[inside], columns[inside]] = rates[inside]
+    return values
@@ -0,0 +1,265 @@
+import os
+import sys
+import glob
+import json
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+
+# Add project root path so the shared utils resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.file_utils import file_lock
+from src.api.rate_schema import compact_rates
+
+# --- 1. Settings and Constants Definition ---
+STORE_FILE = 'rates.sqlite3'
+LEGACY_FILE_PREFIX = 'exchange_data_'
+COLUMNS = ['Currency Code', 'Date', 'Currency']  # Same column names as the legacy CSV files
+COMPACT_THRESHOLD = 500  # Pending rows tolerated before compaction is triggered
+BUSY_TIMEOUT_SECONDS = 30  # How long a writer waits for another process's write transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rates (
+    currency TEXT NOT NULL,
+    date     TEXT NOT NULL,      -- 'YYYYMMDD'
+    rate     REAL NOT NULL,
+    PRIMARY KEY (currency, date)
+) WITHOUT ROWID;
+
+-- Append-only log of new rows (plain rowid heap, no secondary index).
+-- The latest rowid wins for a (currency, date) pair until compact() folds it into `rates`.
+CREATE TABLE IF NOT EXISTS rates_pending (
+    currency TEXT NOT NULL,
+    date     TEXT NOT NULL,
+    rate     REAL NOT NULL
+);
+
+-- Persisted state of the streaming window calculations (JSON), per currency and window length
+CREATE TABLE IF NOT EXISTS window_state (
+    currency TEXT NOT NULL,
+    window_size INTEGER NOT NULL,
+    state    TEXT NOT NULL,
+    PRIMARY KEY (currency, window_size)
+) WITHOUT ROWID;
+"""
+
+
+class RateStore:
+    """
+    Single indexed store holding every currency's rate history (SQLite).
+
+    Rows are clustered on the (currency, date) primary key, so reading the latest
+    window of a currency is an index range scan whose cost does not grow with the
+    length of the history.
+
+    Writes only append to `rates_pending`, so a daily update costs O(new rows).
+    Reads merge the pending rows over the compacted table, and compact() dedupes
+    and sorts them into `rates` offline.
+
+    Safe to share between processes: the database runs in WAL mode, so every read
+    is a single statement over one consistent snapshot, even while a writer is
+    active, and writers queue on SQLite's lock for up to BUSY_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+
+    def append(self, rows):
+        """Appends (currency, date, rate) rows; a later row replaces the same day's rate on read."""
+        rows = list(rows)
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO rates_pending (currency, date, rate) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def pending_count(self):
+        """Number of appended rows not compacted yet."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM rates_pending").fetchone()[0]
+
+    def compact(self):
+        """
+        Folds the pending rows into the sorted `rates` table (latest row per day wins)
+        and clears the log, in one transaction. Returns the number of rows folded.
+        """
+        with closing(self._connect()) as conn, conn:
+            folded = conn.execute(
+                "INSERT OR REPLACE INTO rates (currency, date, rate) "
+                "SELECT currency, date, rate FROM rates_pending ORDER BY rowid"
+            ).rowcount
+            conn.execute("DELETE FROM rates_pending")
+        return folded
+
+    def compact_if_needed(self, threshold=COMPACT_THRESHOLD, background=True):
+        """
+        Compacts once more than `threshold` rows are pending.
+        Runs on a background thread by default and returns it (None if nothing to do).
+        """
+        if self.pending_count() <= threshold:
+            return None
+        if not background:
+            self.compact()
+            return None
+
+        thread = threading.Thread(target=self.compact, name="rate-store-compaction")
+        thread.start()
+        return thread
+
+    def counts(self, currencies):
+        """Returns {currency_code: number of stored days}."""
+        return {currency_code: len(dates) for currency_code, dates in self.date_sets(currencies).items()}
+
+    def date_sets(self, currencies):
+        """Returns {currency_code: set of stored 'YYYYMMDD' dates}."""
+        date_sets = {currency_code: set() for currency_code in currencies}
+        if not currencies:
+            return date_sets
+
+        # One statement over both tables, so a concurrent compaction can never hide rows
+        placeholders = ",".join("?" * len(currencies))
+        query = (f"SELECT currency, date FROM rates WHERE currency IN ({placeholders}) "
+                 f"UNION ALL SELECT currency, date FROM rates_pending WHERE currency IN ({placeholders})")
+        with closing(self._connect()) as conn:
+            for currency_code, date in conn.execute(query, list(currencies) * 2):
+                date_sets[currency_code].add(date)
+        return date_sets
+
+    def load_latest(self, currencies, days):
+        """
+        Loads the latest `days` rows of every currency in ONE query, oldest first per currency.
+        Each branch is a LIMIT-ed range scan on the primary key; pending rows are merged on top.
+        """
+        if not currencies:
+            return pd.DataFrame(columns=COLUMNS)
+
+        # The merged latest window is always inside (compacted latest window + pending rows)
+        branch = ("SELECT * FROM (SELECT currency, date, rate, 0 FROM rates "
+                  "WHERE currency = ? ORDER BY date DESC LIMIT ?)")
+        pending = (f"SELECT currency, date, rate, rowid FROM rates_pending "
+                   f"WHERE currency IN ({','.join('?' * len(currencies))})")
+        query = " UNION ALL ".join([branch] * len(currencies) + [pending])
+        params = [value for currency_code in currencies for value in (currency_code, days)] + list(currencies)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return _merge_rows(rows).groupby('Currency Code', sort=False).tail(days).reset_index(drop=True)
+
+    def load_after(self, last_dates):
+        """
+        Loads the rows dated after each currency's own last date, in ONE query.
+
+        Args:
+            last_dates (dict): {currency_code: 'YYYYMMDD'}
+
+        Returns:
+            pd.DataFrame: New rows, ordered by currency and date.
+        """
+        if not last_dates:
+            return pd.DataFrame(columns=COLUMNS)
+
+        branch = ("SELECT currency, date, rate, 0 FROM rates WHERE currency = ? AND date > ? "
+                  "UNION ALL SELECT currency, date, rate, rowid FROM rates_pending WHERE currency = ? AND date > ?")
+        query = " UNION ALL ".join([branch] * len(last_dates))
+        params = [value for currency_code, date in last_dates.items() for value in (currency_code, date) * 2]
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return _merge_rows(rows)
+
+    def load_window_states(self, currencies, window):
+        """Returns {currency_code: state dict} of the saved window calculations (missing ones omitted)."""
+        if not currencies:
+            return {}
+        placeholders = ",".join("?" * len(currencies))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT currency, state FROM window_state WHERE window_size = ? AND currency IN ({placeholders})",
+                [window, *currencies],
+            ).fetchall()
+        return {currency_code: json.loads(state) for currency_code, state in rows}
+
+    def save_window_states(self, states, window):
+        """Saves {currency_code: state dict} for the given window length."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO window_state (currency, window_size, state) VALUES (?, ?, ?)",
+                [(currency_code, window, json.dumps(state)) for currency_code, state in states.items()],
+            )
+
+    def load_history(self, currencies=None, start=None, compact=False):
+        """
+        Loads full histories (optionally from `start` 'YYYYMMDD'), ordered by currency and date.
+        `compact=True` returns the rate_schema layout (categorical codes, int32 days, float32 rates).
+        """
+        where = "WHERE 1 = 1"
+        params = []
+        if currencies is not None:
+            where += f" AND currency IN ({','.join('?' * len(currencies))})"
+            params += list(currencies)
+        if start is not None:
+            where += " AND date >= ?"
+            params.append(start)
+
+        query = (f"SELECT currency, date, rate, 0 FROM rates {where} "
+                 f"UNION ALL SELECT currency, date, rate, rowid FROM rates_pending {where}")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params * 2).fetchall()
+        history = _merge_rows(rows)
+        return compact_rates(history, currencies) if compact else history
+
+    def migrate_csvs(self, csv_dir, prefix=LEGACY_FILE_PREFIX):
+        """
+        Imports legacy `exchange_data_<code>.csv` files for currencies not yet in the store.
+        Returns the list of migrated currency codes.
+        """
+        csv_files = glob.glob(os.path.join(csv_dir, f"{prefix}*.csv"))
+        codes = {os.path.basename(path)[len(prefix):-len(".csv")]: path for path in csv_files}
+        if not codes:
+            return []
+
+        # Check-then-import under the store lock so two processes never migrate the same file
+        with file_lock(self.lock_path):
+            return self._migrate_missing(codes)
+
+    def _migrate_missing(self, codes):
+        stored = self.counts(list(codes))
+        migrated = []
+        for currency_code, path in sorted(codes.items()):
+            if stored[currency_code]:
+                continue
+            try:
+                df = pd.read_csv(path, usecols=['Date', 'Currency'], dtype={'Date': str})
+            except (OSError, ValueError) as e:
+                print(f" Skipping migration of {os.path.basename(path)}: {e}")
+                continue
+
+            df = df.dropna()
+            self.append((currency_code, date, float(rate)) for date, rate in zip(df['Date'], df['Currency']))
+            migrated.append(currency_code)
+            print(f" Migrated {os.path.basename(path)} into the rate store ({len(df)} days).")
+
+        if migrated:
+            self.compact()
+        return migrated
+
+
+def _merge_rows(rows):
+    """
+    Builds a DataFrame from (currency, date, rate, priority) rows, keeping the highest
+    priority row per day (pending rowids > 0 beat compacted rows), sorted by currency and date.
+    """
+    df = pd.DataFrame(rows, columns=COLUMNS + ['priority'])
+    df = df.sort_values('priority').drop_duplicates(subset=['Currency Code', 'Date'], keep='last')
+    return df.sort_values(['Currency Code', 'Date']).drop(columns='priority').reset_index(drop=True)
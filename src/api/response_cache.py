@@ -0,0 +1,101 @@
+import os
+import sys
+import gzip
+import json
+import time
+from datetime import datetime
+
+# Add project root path so the shared api modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api import http_client, business_calendar
+from src.utils.file_utils import atomic_write
+
+# --- 1. Settings and Constants Definition ---
+CACHE_DIR = os.path.join(os.path.dirname(__file__), 'cache')
+TODAY_TTL_SECONDS = 60 * 60                # Today's rates can still change during the day
+TODAY_NEGATIVE_TTL_SECONDS = 10 * 60       # Today may simply not be published yet
+PAST_NEGATIVE_TTL_SECONDS = 24 * 60 * 60   # EXIM sometimes answers [] transiently for a business day
+PAST_TTL_SECONDS = None                    # Past dates are final (None = never expires)
+
+
+def _cache_path(search_date, service_code):
+    """Returns the compressed cache file path for one searchdate."""
+    return os.path.join(CACHE_DIR, service_code, f"{search_date}.json.gz")
+
+
+def _ttl_for(search_date, is_negative, now):
+    """
+    Picks the TTL: short for today (shorter still for empty answers), none for past dates.
+    An empty answer for a past business day is retried after PAST_NEGATIVE_TTL_SECONDS;
+    only weekends and holidays are permanent negatives.
+    """
+    if search_date >= now.strftime("%Y%m%d"):
+        return TODAY_NEGATIVE_TTL_SECONDS if is_negative else TODAY_TTL_SECONDS
+    if is_negative and business_calendar.is_business_day(search_date):
+        return PAST_NEGATIVE_TTL_SECONDS
+    return PAST_TTL_SECONDS
+
+
+def load_response(search_date, service_code, now=None):
+    """
+    Returns the cached raw response for a searchdate.
+    An empty list is a negative entry (the date had no data); None means a cache miss.
+    """
+    file_path = _cache_path(search_date, service_code)
+    if not os.path.exists(file_path):
+        return None
+
+    try:
+        with gzip.open(file_path, "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        # Broken entry: treat as a miss, it will be overwritten by the next fetch
+        return None
+
+    now = now or datetime.now()
+    ttl = _ttl_for(search_date, not entry["data"], now)
+    if ttl is not None and time.time() - entry["fetched_at"] > ttl:
+        return None
+    return entry["data"]
+
+
+def save_response(search_date, service_code, data):
+    """Stores a raw response (an empty list is stored as a negative entry)."""
+    file_path = _cache_path(search_date, service_code)
+
+    entry = {"searchdate": search_date, "fetched_at": time.time(), "data": data}
+    # Write to a temp file first so concurrent readers never see a half-written entry
+    with atomic_write(file_path) as tmp_path:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+
+
+def fetch_day_response(api_key, search_date, base_url, service_code, timeout=10, rate_limiter=None,
+                       quota=None):
+    """
+    Returns the raw API response for a searchdate, served from the cache when possible.
+    Only real API calls are charged to the daily quota and go through the rate limiter,
+    once per HTTP attempt so retries are counted too (QuotaExceededError is raised
+    before an attempt when the quota is used up).
+    Result 4 answers are never cached.
+    """
+    day_data = load_response(search_date, service_code)
+    if day_data is not None:
+        return day_data
+
+    def before_attempt():
+        if quota is not None:
+            quota.acquire()
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+    params = {"authkey": api_key, "searchdate": search_date, "data": service_code}
+    response = http_client.get(base_url, params=params, timeout=timeout, before_attempt=before_attempt)
+    day_data = response.json() or []
+
+    if not (day_data and day_data[0].get('result') == 4):
+        save_response(search_date, service_code, day_data)
+    return day_data
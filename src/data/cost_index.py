@@ -0,0 +1,170 @@
+import os
+import sys
+import math
+from typing import Dict, Iterable, List, Optional
+
+# Add project root path so the shared modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import cost_snapshot
+from src.data.registry import REGISTRY
+
+# --- 1. Settings and Constants Definition ---
+# Regions available without define_region(): the registry's currency zones (e.g. "Euro area")
+DEFAULT_REGIONS = dict(REGISTRY.zones)
+
+_loaded = {}  # source hash -> CostIndex, so repeated pipeline runs skip the rebuild
+
+
+def _key(name):
+    """Lookup key: case and surrounding spaces are ignored ("Japan " == "japan")."""
+    return str(name).strip().casefold()
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return math.fsum(values) / len(values) if values else None
+
+
+class CostIndex:
+    """
+    In-memory cost index keyed by country and city.
+
+    Built once from the city records of export_json.build_city_data. Country and region
+    aggregates are computed at build time (or when a region is defined), so every
+    lookup is a single dict access.
+
+    Country aggregates match export_json.build_cost_data: the hotel and Starbucks
+    prices are the averages over the cities that list them. City lookups fill a
+    price the city lacks (e.g. no Starbucks entry for Fukuoka) with its country average.
+    """
+
+    def __init__(self, cities: Iterable[dict], regions: Optional[Dict[str, Iterable[str]]] = None):
+        self._cities: Dict[tuple, dict] = {}
+        self._countries: Dict[str, dict] = {}
+        self._regions: Dict[str, dict] = {}
+        self._city_names: Dict[str, List[str]] = {}
+
+        by_country: Dict[str, List[dict]] = {}
+        for record in cities:
+            by_country.setdefault(_key(record["country"]), []).append(record)
+
+        # 1. Country aggregates
+        for key, records in by_country.items():
+            starbucks = _mean(record["starbucks"] for record in records)
+            hotel = _mean(record["avg_hotel_krw"] for record in records)
+            self._countries[key] = {
+                "country": records[0]["country"],
+                "currency": records[0]["currency"],
+                "big_mac": records[0]["big_mac"],
+                "starbucks": None if starbucks is None else round(starbucks, 2),
+                "avg_hotel_krw": None if hotel is None else int(hotel),
+                "cities": len(records),
+            }
+            self._city_names[key] = [record["city"] for record in records]
+
+        # 2. City entries (missing prices filled from the country aggregate)
+        for key, records in by_country.items():
+            country = self._countries[key]
+            for record in records:
+                entry = dict(record)
+                for field in ("starbucks", "avg_hotel_krw"):
+                    if entry[field] is None:
+                        entry[field] = country[field]
+                self._cities[(key, _key(record["city"]))] = entry
+
+        for name, members in (DEFAULT_REGIONS if regions is None else regions).items():
+            self.define_region(name, members)
+
+    # --- Lookups (O(1)) ---
+
+    def city(self, country: str, city: str) -> Optional[dict]:
+        """Costs of one city, or None if it is not indexed."""
+        return self._cities.get((_key(country), _key(city)))
+
+    def country(self, country: str) -> Optional[dict]:
+        """Precomputed country aggregate, or None if the country is not indexed."""
+        return self._countries.get(_key(country))
+
+    def region(self, name: str) -> Optional[dict]:
+        """Precomputed aggregate of a region defined with define_region(), or None."""
+        return self._regions.get(_key(name))
+
+    def cities_in(self, country: str) -> List[str]:
+        """City names of a country (empty if the country is not indexed)."""
+        return list(self._city_names.get(_key(country), []))
+
+    @property
+    def countries(self) -> List[str]:
+        return [aggregate["country"] for aggregate in self._countries.values()]
+
+    def iter_cities(self) -> Iterable[dict]:
+        """Every city entry (missing prices already filled)."""
+        return iter(self._cities.values())
+
+    def to_cost_dict(self) -> Dict[str, dict]:
+        """Country aggregates in the cost dictionary layout of export_json.build_cost_data."""
+        return {
+            aggregate["country"]: {
+                "currency": aggregate["currency"],
+                "big_mac": aggregate["big_mac"],
+                "starbucks": aggregate["starbucks"],
+                "avg_hotel_krw": aggregate["avg_hotel_krw"],
+            }
+            for aggregate in self._countries.values()
+        }
+
+    # --- Regions ---
+
+    def define_region(self, name: str, countries: Iterable[str]) -> dict:
+        """
+        Defines (or replaces) a custom region and precomputes its aggregate.
+
+        Hotel prices (KRW) are averaged over every city of the member countries. Local
+        prices (Big Mac, Starbucks) are only comparable inside one currency, so they are
+        averaged over the member countries only when all of them share a currency
+        (e.g. the Euro area) and are None otherwise. Unknown countries are ignored.
+
+        Returns:
+            dict: The region aggregate (as returned by region()).
+        """
+        members = [self._countries[_key(c)] for c in countries if _key(c) in self._countries]
+        member_keys = {_key(member["country"]) for member in members}
+        cities = [entry for (country, _), entry in self._cities.items() if country in member_keys]
+        currencies = {member["currency"] for member in members}
+        single_currency = len(currencies) == 1
+
+        hotel = _mean(entry["avg_hotel_krw"] for entry in cities)
+        big_mac = _mean(member["big_mac"] for member in members) if single_currency else None
+        starbucks = _mean(member["starbucks"] for member in members) if single_currency else None
+        aggregate = {
+            "region": name,
+            "countries": [member["country"] for member in members],
+            "currency": currencies.pop() if single_currency else None,
+            "big_mac": None if big_mac is None else round(big_mac, 2),
+            "starbucks": None if starbucks is None else round(starbucks, 2),
+            "avg_hotel_krw": None if hotel is None else int(hotel),
+            "cities": len(cities),
+        }
+        self._regions[_key(name)] = aggregate
+        return aggregate
+
+
+def load_cost_index(data_dir=None, snapshot_dir=None) -> CostIndex:
+    """
+    Returns the CostIndex of the current source CSVs.
+
+    The city records come from the compiled cost snapshot (the CSVs are only re-read
+    when their bytes change) and the built index is kept in memory per source hash.
+    """
+    key = (cost_snapshot.source_hash(data_dir), data_dir, snapshot_dir)
+    if key in _loaded:
+        return _loaded[key]
+
+    index = CostIndex(cost_snapshot.load_city_data(data_dir, snapshot_dir))
+    if index.countries:  # Do not keep the empty index of unreadable sources
+        _loaded.clear()  # Only the index of the current sources is worth keeping
+        _loaded[key] = index
+    return index
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import hashlib
+
+# Add project root path so the shared modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import export_json, pipeline
+from src.data.registry import REGISTRY
+from src.utils.file_utils import atomic_write
+
+# --- 1. Settings and Constants Definition ---
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+SNAPSHOT_FILE = 'cost_snapshot.json'
+SNAPSHOT_VERSION = 2  # Bump when the cost dictionary layout or cleaning rules change
+
+
+def source_hash(data_dir=None):
+    """
+    SHA-256 over the names and bytes of the source price CSVs (pipeline.SOURCES).
+    A missing file hashes as missing, so adding it later changes the key. Editing the
+    country registry changes the key as well.
+    """
+    data_dir = data_dir or export_json.script_dir
+    digest = hashlib.sha256(f"v{SNAPSHOT_VERSION}:{REGISTRY.version}".encode("utf-8"))
+    for name in [source.file for source in pipeline.SOURCES]:
+        digest.update(name.encode("utf-8"))
+        path = os.path.join(data_dir, name)
+        if not os.path.exists(path):
+            digest.update(b"<missing>")
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_snapshot(data_dir=None, snapshot_dir=None):
+    """
+    Returns the compiled snapshot { "source_hash", "costs", "cities" }.
+
+    Served from disk while the source CSVs are unchanged (only their bytes are hashed);
+    otherwise rebuilt with export_json (country and city level) and saved.
+    Returns None if the sources cannot be read.
+    """
+    key = source_hash(data_dir)
+    snapshot_path = os.path.join(snapshot_dir or SNAPSHOT_DIR, SNAPSHOT_FILE)
+
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("source_hash") == key and "costs" in snapshot and "cities" in snapshot:
+            return snapshot
+    except (OSError, ValueError):
+        pass  # Missing or unreadable snapshot: rebuild it
+
+    costs = export_json.build_cost_data(data_dir)
+    if costs is None:
+        return None
+    # Country-level sources without a City column still serve the country costs
+    cities = export_json.build_city_data(data_dir) or []
+
+    snapshot = {"source_hash": key, "costs": costs, "cities": cities}
+    with atomic_write(snapshot_path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=4, ensure_ascii=False)
+    print(f" Cost snapshot rebuilt ({len(costs)} countries, {len(cities)} cities).")
+    return snapshot
+
+
+def load_cost_data(data_dir=None, snapshot_dir=None):
+    """
+    Returns the cost dictionary ({ "CountryName": { "currency": "CODE", ... } })
+    from the compiled snapshot. Returns an empty dict if the sources cannot be read.
+    """
+    snapshot = load_snapshot(data_dir, snapshot_dir)
+    return snapshot["costs"] if snapshot else {}
+
+
+def load_city_data(data_dir=None, snapshot_dir=None):
+    """
+    Returns the city records of export_json.build_city_data from the compiled snapshot.
+    Returns an empty list if the sources cannot be read or list no cities.
+    """
+    snapshot = load_snapshot(data_dir, snapshot_dir)
+    return snapshot["cities"] if snapshot else []
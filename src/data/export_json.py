@@ -1,42 +1,38 @@
-import pandas as pd
 import json
 import os
+import sys
 
 # Get the folder path where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
+# Add project root path so the registry and the staged pipeline resolve when run as a script
+project_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data.registry import REGISTRY
+
+# Source price files (read from script_dir)
+HOTEL_FILE = "hotel_price_index.csv"
+STARBUCKS_FILE = "starbucks_drink_index.csv"
+BIGMAC_FILE = "big_mac_index.csv"
+SOURCE_FILES = (BIGMAC_FILE, STARBUCKS_FILE, HOTEL_FILE)
+CHUNK_ROWS = 50_000  # Rows parsed at once when streaming a price CSV
+
+# Country names, currencies and zones come from the shared registry (src/data/registry.py).
+# These module-level views are kept for existing callers.
+
 # 1. Country Name Standardization
 # (This unifies different names like "Britain" and "UK" into one standard name)
-name_map = {
-    "Britain": "UK",
-    "United Kingdom": "UK",
-    "United States": "USA",
-    "Hongkong": "Hong Kong",
-    "Hong Kong": "Hong Kong",
-    "United Arab Emirates": "UAE"
-}
+name_map = dict(REGISTRY.aliases)
 
 # 2. Country Map (Renamed from currency_map)
 # (Only countries listed here will be included in the final result)
-country_map = {
-    "Japan": "JPY(100)",
-    "United States": "USD",
-    "Italy": "EUR",
-    "Spain": "EUR",
-    "Indonesia": "IDR(100)",
-    "Britain": "GBP",
-    "UK": "GBP",
-    "France": "EUR",
-    "Singapore": "SGD",
-    "Thailand": "THB",
-    "Hong Kong": "HKD",
-    "Hongkong": "HKD",
-    "United Arab Emirates": "AED",
-}
+country_map = REGISTRY.country_currencies()
 
 # 3. Euro Zone Countries
 # (We need this because the Big Mac index groups these under "Euro area")
-euro_countries = ["France", "Italy", "Spain", "Austria", "Germany"]
+euro_countries = list(REGISTRY.zone("Euro area"))
 
 def clean_number(value):
     """
@@ -51,89 +47,180 @@ def clean_number(value):
         # If it fails (e.g., text is not a number), return 0
         return 0
 
-def main():
-    # Load the CSV files
-    try:
-        hotel = pd.read_csv(os.path.join(script_dir, "hotel_price_index.csv"))
-        starbucks = pd.read_csv(os.path.join(script_dir, "starbucks_drink_index.csv"))
-        bigmac = pd.read_csv(os.path.join(script_dir, "big_mac_index.csv"))
-    except:
-        # If files are missing, print an empty object and exit
-        print("{}")
-        return
+def clean_number_series(series):
+    """
+    Vectorized clean_number for a whole column.
+    Example: ["1,000", " 12.5 ", "abc", None] -> [1000.0, 12.5, 0.0, NaN]
+    Text that is not a number becomes 0 (like clean_number); empty cells stay NaN.
+    """
+    import pandas as pd
+
+    text = series.astype("string").str.replace(",", "", regex=False).str.strip()
+    numbers = pd.to_numeric(text, errors="coerce")
+    invalid = numbers.isna() & text.notna() & (text.str.lower() != "nan")
+    return numbers.mask(invalid, 0.0).astype("float64")
+
+def clean_chunk(chunk, price_column):
+    """
+    Cleans one parsed chunk of a price CSV in place of the old row-by-row loop.
 
-    # --- Start Data Cleaning ---
+    Returns:
+        tuple: (standardized country names as a pd.Index, float prices as a pd.Series)
+    """
+    import pandas as pd
 
-    # 1. Clean Column Names
     # .strip() removes spaces from the beginning and end of column names
-    hotel.columns = hotel.columns.str.strip()
-    starbucks.columns = starbucks.columns.str.strip()
-    bigmac.columns = bigmac.columns.str.strip()
-
-    # Rename columns to be consistent
-    hotel = hotel.rename(columns={"Avg_price": "avg_hotel_krw"})
-    starbucks = starbucks.rename(columns={"Avg_price": "starbucks_price"})
-    bigmac = bigmac.rename(columns={"local_price": "bigmac_price"})
-
-    # 2. Convert Text to Numbers
-    # Apply the 'clean_number' function to every row in the price columns
-    hotel["avg_hotel_krw"] = hotel["avg_hotel_krw"].apply(clean_number)
-    starbucks["starbucks_price"] = starbucks["starbucks_price"].apply(clean_number)
-    bigmac["bigmac_price"] = bigmac["bigmac_price"].apply(clean_number)
-
-    # 3. Clean Country Names
-    for df in [hotel, starbucks, bigmac]:
-        if "Country" in df.columns:
-            # Remove spaces and standardize names (e.g., Britain -> UK)
-            df["Country"] = df["Country"].astype(str).str.strip()
-            df["Country"] = df["Country"].replace(name_map)
-
-    # 4. Calculate Averages
-    # Group by Country (handles multiple cities like Tokyo/Osaka -> Japan Avg)
-    hotel = hotel.groupby("Country")["avg_hotel_krw"].mean().reset_index()
-    starbucks = starbucks.groupby("Country")["starbucks_price"].mean().reset_index()
-    bigmac = bigmac.groupby("Country")["bigmac_price"].mean().reset_index()
-
-    # 5. Handle 'Euro area'
-    # Copy 'Euro area' Big Mac price to individual countries like France/Italy
+    chunk.columns = chunk.columns.str.strip()
+
+    # The parser already reads "1,000"-style numbers; only a chunk with stray text needs cleaning
+    prices = chunk[price_column]
+    if not pd.api.types.is_numeric_dtype(prices):
+        prices = clean_number_series(prices)
+
+    # Remove spaces and standardize names (e.g., Britain -> UK), once per distinct name
+    codes, names = pd.factorize(chunk["Country"].astype(str))
+    country = pd.Index(names).map(REGISTRY.canonical)[codes]
+    return country, prices.astype("float64")
+
+def read_price_groups(path, price_column, by_city=False, chunksize=CHUNK_ROWS):
+    """
+    Streams a price CSV in chunks of `chunksize` rows and sums the prices per country
+    (per country and city with by_city=True; rows or files without a city keep City = NaN).
+
+    Only the key columns and the price column are read (extra and trailing empty columns
+    are skipped). Per-chunk sums and counts are combined, so memory depends on the
+    number of groups, not on the number of rows.
+
+    Returns:
+        pd.DataFrame: Columns 'Country' (and 'City'), 'sum' and 'count' (valid prices).
+    """
+    import pandas as pd
+
+    keys = ["Country", "City"] if by_city else ["Country"]
+    sums, counts = [], []
+    reader = pd.read_csv(
+        path, usecols=used_columns(price_column, keys[1:]), thousands=",", dtype={"Country": str}, chunksize=chunksize,
+    )
+    for chunk in reader:
+        country, prices = clean_chunk(chunk, price_column)
+        groups = [country]
+        if by_city:
+            # A file without a 'City' column counts as country-level (every City = NaN)
+            city = chunk["City"] if "City" in chunk.columns else pd.Series(pd.NA, index=chunk.index)
+            groups.append(pd.Index(city.astype("string").str.strip()))
+        grouped = prices.groupby(groups, dropna=False)
+        sums.append(grouped.sum())
+        counts.append(grouped.count())
+
+    if not sums:
+        return pd.DataFrame(columns=keys + ["sum", "count"])
+
+    levels = list(range(len(keys)))
+    total = pd.concat(sums).groupby(level=levels, dropna=False).sum()
+    count = pd.concat(counts).groupby(level=levels, dropna=False).sum()
+    return pd.DataFrame({"sum": total, "count": count}).rename_axis(keys).reset_index()
+
+def average_groups(groups, keys, output_column):
+    """
+    Collapses read_price_groups sums and counts to the average price per `keys`
+    (NaN where a group has no valid price).
+
+    Returns:
+        pd.DataFrame: Columns `keys` and `output_column`.
+    """
+    if groups.empty:
+        return groups.reindex(columns=keys + [output_column])
+    grouped = groups.groupby(keys, dropna=False)[["sum", "count"]].sum()
+    average = grouped["sum"] / grouped["count"].where(grouped["count"] > 0)
+    return average.rename(output_column).reset_index()
+
+def read_country_averages(path, price_column, output_column, chunksize=CHUNK_ROWS):
+    """
+    Streams a price CSV and returns the average price per country (see read_price_groups).
+
+    Returns:
+        pd.DataFrame: Columns 'Country' and `output_column`.
+    """
+    groups = read_price_groups(path, price_column, chunksize=chunksize)
+    return average_groups(groups, ["Country"], output_column)
+
+def read_city_prices(path, price_column, output_column, chunksize=CHUNK_ROWS):
+    """
+    Streams a city-level price CSV and returns one price per (country, city).
+
+    Cleaning is the same as read_country_averages; city names are stripped, rows
+    without a city are dropped and repeated cities are averaged.
+
+    Returns:
+        pd.DataFrame: Columns 'Country', 'City' and `output_column`.
+    """
+    groups = read_price_groups(path, price_column, by_city=True, chunksize=chunksize)
+    return average_groups(groups[groups["City"].notna()], ["Country", "City"], output_column)
+
+def used_columns(price_column, extra=()):
+    """
+    Builds a read_csv `usecols` filter keeping only 'Country', the price column and `extra`.
+    Header names are compared after strip() because the CSV headers contain stray spaces.
+    """
+    wanted = {"Country", price_column, *extra}
+    return lambda column: column.strip() in wanted
+
+def add_euro_countries(bigmac, column="bigmac_price"):
+    """
+    Copies the 'Euro area' Big Mac price to individual countries like France/Italy
+    (only those missing from the Big Mac data).
+    """
+    import pandas as pd
+
     euro_row = bigmac[bigmac["Country"] == "Euro area"]
-    
-    if not euro_row.empty:
-        price = euro_row.iloc[0]["bigmac_price"]
-        
-        # Check each Euro country and add it if missing from Big Mac data
-        new_data = []
-        for country in euro_countries:
-            if country not in bigmac["Country"].values:
-                new_data.append({"Country": country, "bigmac_price": price})
-        
-        # Add the new rows to the existing Big Mac data
-        if new_data:
-            bigmac = pd.concat([bigmac, pd.DataFrame(new_data)], ignore_index=True)
-
-    # 6. Merge Data
-    # Combine all three datasets (keep only countries present in ALL three)
-    merged = bigmac.merge(starbucks, on="Country", how="inner")
-    merged = merged.merge(hotel, on="Country", how="inner")
-    merged = merged.fillna(0) # Fill any missing values with 0
-
-    # 7. Create Result Dictionary
-    result = {}
-    
-    # Loop through each row and add to dictionary
-    for i, row in merged.iterrows():
-        country = row["Country"]
-        
-        # [UPDATED] Check against country_map instead of currency_map
-        if country in country_map:
-            code = country_map[country]
-            
-            result[country] = {
-                "currency": code,
-                "big_mac": round(row["bigmac_price"], 2),     # Round to 2 decimals
-                "starbucks": round(row["starbucks_price"], 2),
-                "avg_hotel_krw": int(row["avg_hotel_krw"])    # Hotel price as integer
-            }
+    if euro_row.empty:
+        return bigmac
+
+    price = euro_row.iloc[0][column]
+
+    # Check each Euro country and add it if missing from Big Mac data
+    new_data = []
+    for country in euro_countries:
+        if country not in bigmac["Country"].values:
+            new_data.append({"Country": country, column: price})
+
+    # Add the new rows to the existing Big Mac data
+    if new_data:
+        bigmac = pd.concat([bigmac, pd.DataFrame(new_data)], ignore_index=True)
+    return bigmac
+
+def build_cost_data(data_dir=None):
+    """
+    Reads, cleans and merges the three price CSVs into the cost dictionary.
+    Runs the staged ingestion pipeline (see pipeline.py), so stages whose
+    source CSV did not change are served from the stage cache.
+    Returns None if a file is missing or unreadable.
+    """
+    from src.data import pipeline
+
+    output = pipeline.run(data_dir or script_dir)
+    return None if output is None else output["costs"]
+
+def build_city_data(data_dir=None):
+    """
+    City-level counterpart of build_cost_data: one record per city of a country
+    that build_cost_data keeps (mapped currency, present in all three files).
+
+    Record: { "country", "city", "currency", "big_mac", "starbucks", "avg_hotel_krw" }
+    Big Mac prices only exist per country. A price the CSVs lack for a city is None.
+    Returns None if a file is missing or unreadable.
+    """
+    from src.data import pipeline
+
+    output = pipeline.run(data_dir or script_dir)
+    return None if output is None else output["cities"]
+
+def main():
+    result = build_cost_data()
+    if result is None:
+        # If files are missing, print an empty object and exit
+        print("{}")
+        return
 
     # Print Result to Console (JSON format)
     print(json.dumps(result, indent=4, ensure_ascii=False))
@@ -0,0 +1,268 @@
+import os
+import sys
+import glob
+import pickle
+import hashlib
+import argparse
+
+# Add project root path so the shared modules resolve when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import export_json
+from src.data.registry import REGISTRY
+from src.utils.file_utils import atomic_write
+
+# --- 1. Settings and Constants Definition ---
+STAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'stages')
+STAGE_VERSION = 1  # Bump when a stage's output layout or cleaning rules change
+
+
+class Source:
+    """
+    One price feed of the ingestion pipeline.
+
+    Args:
+        name (str): Stage prefix (e.g. "hotel" -> stages "load.hotel" and "country.hotel").
+        file (str): CSV file name inside the data directory.
+        price_column (str): Price header in the CSV (compared after strip()).
+        field (str): Key of the price in the cost dictionary and the city records.
+        city_level (bool): The CSV lists cities (a 'City' column); otherwise prices are per country.
+        integer (bool): Output the price as an int (else rounded to 2 decimals).
+        transform (callable, optional): transform(country_table, field) -> country_table,
+                                        applied after averaging per country.
+    """
+
+    def __init__(self, name, file, price_column, field, city_level=True, integer=False, transform=None):
+        self.name = name
+        self.file = file
+        self.price_column = price_column
+        self.field = field
+        self.city_level = city_level
+        self.integer = integer
+        self.transform = transform
+
+    def spec(self):
+        """Settings that change the source's stage outputs (part of its fingerprints)."""
+        transform = getattr(self.transform, "__name__", None)
+        return f"{self.file}|{self.price_column}|{self.field}|{self.city_level}|{self.integer}|{transform}"
+
+    def finish(self, value):
+        """Output format of a price (int or rounded to 2 decimals)."""
+        return int(value) if self.integer else round(float(value), 2)
+
+
+# Merge order = column order of the outputs (Big Mac first keeps the cost dictionary layout)
+SOURCES = [
+    Source("bigmac", export_json.BIGMAC_FILE, "local_price", "big_mac",
+           city_level=False, transform=export_json.add_euro_countries),
+    Source("starbucks", export_json.STARBUCKS_FILE, "Avg_price", "starbucks"),
+    Source("hotel", export_json.HOTEL_FILE, "Avg_price", "avg_hotel_krw", integer=True),
+]
+
+
+def register_source(source):
+    """Adds a price feed to the default pipeline (replacing a source of the same name)."""
+    SOURCES[:] = [existing for existing in SOURCES if existing.name != source.name] + [source]
+
+
+def fingerprint(*parts):
+    """SHA-256 over the stage version and the given parts."""
+    digest = hashlib.sha256(f"v{STAGE_VERSION}".encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0" + str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    On-disk cache of stage outputs, one pickle per stage named '<stage>-<fingerprint>.pkl'.
+
+    A stage is rebuilt only when its fingerprint (its inputs) changed; the file of the
+    previous fingerprint is then removed. directory=None disables caching.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.built = []   # Stages rebuilt by this run
+        self.cached = []  # Stages served from disk
+
+    def _path(self, stage, key):
+        return os.path.join(self.directory, f"{stage}-{key[:16]}.pkl")
+
+    def get_or_build(self, stage, key, build):
+        if self.directory is not None:
+            try:
+                with open(self._path(stage, key), "rb") as f:
+                    value = pickle.load(f)
+                self.cached.append(stage)
+                return value
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                pass  # Missing or unreadable: rebuild
+
+        value = build()
+        self.built.append(stage)
+        if self.directory is not None:
+            path = self._path(stage, key)
+            for stale in glob.glob(os.path.join(self.directory, f"{glob.escape(stage)}-*.pkl")):
+                if stale != path:
+                    os.remove(stale)
+            with atomic_write(path) as tmp_path:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return value
+
+
+# --- 2. Stages ---
+
+def load_stage(source, path):
+    """load.<source>: cleaned price sums and counts per country (and city)."""
+    return export_json.read_price_groups(path, source.price_column, by_city=source.city_level)
+
+
+def country_stage(source, groups):
+    """country.<source>: average price per country, then the source's transform."""
+    table = export_json.average_groups(groups, ["Country"], source.field)
+    if source.transform is not None:
+        table = source.transform(table, source.field)
+    return table
+
+
+def costs_stage(sources, country_tables):
+    """
+    costs: country tables merged into the cost dictionary.
+    Keeps only countries present in ALL sources and listed in the registry.
+    """
+    merged = None
+    for source in sources:
+        table = country_tables[source.name]
+        merged = table if merged is None else merged.merge(table, on="Country", how="inner")
+    merged = merged.fillna(0)  # Fill any missing values with 0
+
+    result = {}
+    for row in merged.to_dict("records"):
+        country = row["Country"]
+        currency = REGISTRY.currency_of(country)
+        if currency is not None:
+            result[country] = {"currency": currency}
+            for source in sources:
+                result[country][source.field] = source.finish(row[source.field])
+    return result
+
+
+def cities_stage(sources, load_tables, costs):
+    """
+    cities: one record per city of a country kept by the costs stage.
+    Country-level prices (e.g. Big Mac) are copied from the country; a price a
+    city-level source lacks for a city is None.
+    """
+    import pandas as pd
+
+    cities = None
+    for source in sources:
+        if not source.city_level:
+            continue
+        groups = load_tables[source.name]
+        table = export_json.average_groups(groups[groups["City"].notna()], ["Country", "City"], source.field)
+        cities = table if cities is None else cities.merge(table, on=["Country", "City"], how="outer")
+    if cities is None:
+        return []
+
+    cities = cities[cities["Country"].isin(list(costs))].sort_values(["Country", "City"])
+    records = []
+    for row in cities.to_dict("records"):
+        country = costs[row["Country"]]
+        record = {"country": row["Country"], "city": str(row["City"]), "currency": country["currency"]}
+        for source in sources:
+            if not source.city_level:
+                record[source.field] = country[source.field]
+            elif pd.isna(row[source.field]):
+                record[source.field] = None
+            else:
+                record[source.field] = source.finish(row[source.field])
+        records.append(record)
+    return records
+
+
+def run(data_dir=None, sources=None, cache=None):
+    """
+    Runs the staged ingestion pipeline:
+
+        load.<source> -> country.<source>   (one chain per source)
+        all country tables -> costs -> cities (+ the load tables of city-level sources)
+
+    Each stage output is cached on disk under a fingerprint of its inputs (the source
+    CSV bytes for load stages, the upstream fingerprints for the others), so changing
+    one CSV rebuilds only that source's chain and the merge stages.
+
+    Args:
+        data_dir (str, optional): Folder of the source CSVs (default: next to export_json).
+        sources (list, optional): Price feeds (default: SOURCES).
+        cache (StageCache, optional): Stage cache (default: StageCache(STAGE_DIR));
+                                      StageCache(None) rebuilds every stage.
+
+    Returns:
+        dict: { "costs": cost dictionary, "cities": city records }, or None if a
+              source is missing or unreadable.
+    """
+    data_dir = data_dir or export_json.script_dir
+    sources = SOURCES if sources is None else sources
+    cache = cache or StageCache(STAGE_DIR)
+
+    load_tables, country_tables, country_keys = {}, {}, []
+    try:
+        for source in sources:
+            path = os.path.join(data_dir, source.file)
+            content = file_hash(path)
+            if content is None:
+                return None
+
+            load_key = fingerprint("load", source.spec(), content, REGISTRY.version)
+            groups = cache.get_or_build(f"load.{source.name}", load_key, lambda: load_stage(source, path))
+            country_key = fingerprint("country", source.spec(), load_key)
+            table = cache.get_or_build(f"country.{source.name}", country_key, lambda: country_stage(source, groups))
+
+            load_tables[source.name] = groups
+            country_tables[source.name] = table
+            country_keys.append(country_key)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    costs_key = fingerprint("costs", *country_keys, REGISTRY.version)
+    costs = cache.get_or_build("costs", costs_key, lambda: costs_stage(sources, country_tables))
+    cities = cache.get_or_build("cities", fingerprint("cities", costs_key),
+                                lambda: cities_stage(sources, load_tables, costs))
+    return {"costs": costs, "cities": cities}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the staged price ingestion pipeline.")
+    parser.add_argument("--data-dir", default=export_json.script_dir, help="Folder of the source CSVs")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild every stage without the stage cache")
+    args = parser.parse_args()
+
+    cache = StageCache(None if args.no_cache else STAGE_DIR)
+    output = run(args.data_dir, cache=cache)
+    if output is None:
+        print(" A source CSV is missing or unreadable.")
+        return
+
+    print(f" Built:  {', '.join(cache.built) or '-'}")
+    print(f" Cached: {', '.join(cache.cached) or '-'}")
+    print(f" {len(output['costs'])} countries, {len(output['cities'])} cities.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import re
+import sys
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# --- 1. Settings and Constants Definition ---
+# Canonical country -> EXIM currency code (cur_unit)
+# (Only countries listed here are included in the cost data)
+COUNTRIES = {
+    "Japan": "JPY(100)",
+    "USA": "USD",
+    "Italy": "EUR",
+    "Spain": "EUR",
+    "Indonesia": "IDR(100)",
+    "UK": "GBP",
+    "France": "EUR",
+    "Singapore": "SGD",
+    "Thailand": "THB",
+    "Hong Kong": "HKD",
+    "UAE": "AED",
+}
+
+# Other spellings found in the price CSVs -> canonical country
+ALIASES = {
+    "Britain": "UK",
+    "United Kingdom": "UK",
+    "United States": "USA",
+    "Hongkong": "Hong Kong",
+    "United Arab Emirates": "UAE",
+}
+
+# Currency zones listed as one row by some sources (the Big Mac index has a single "Euro area")
+ZONES = {
+    "Euro area": ("France", "Italy", "Spain", "Austria", "Germany"),
+}
+
+# Every cur_unit of the EXIM AP01 response (quoted per `unit` when the code ends in "(unit)")
+EXIM_CURRENCIES = (
+    "AED", "AUD", "BHD", "BND", "CAD", "CHF", "CNH", "DKK", "EUR", "GBP", "HKD", "IDR(100)",
+    "JPY(100)", "KRW", "KWD", "MYR", "NOK", "NZD", "SAR", "SEK", "SGD", "THB", "USD",
+)
+
+_UNIT_SUFFIX = re.compile(r"^(?P<base>[A-Z]{3})\((?P<unit>\d+)\)$")
+
+
+def _key(name):
+    """Lookup key: case and surrounding spaces are ignored ("Japan " == "japan")."""
+    return str(name).strip().casefold()
+
+
+def parse_unit(code: str) -> Tuple[str, int]:
+    """
+    Splits an EXIM currency code into its ISO code and quote unit.
+    Example: "JPY(100)" -> ("JPY", 100), "USD" -> ("USD", 1)
+    """
+    match = _UNIT_SUFFIX.match(code)
+    if match is None:
+        return code, 1
+    return match.group("base"), int(match.group("unit"))
+
+
+class Registry:
+    """
+    Country and currency registry, built once and looked up by integer id.
+
+    Countries and currencies are interned and numbered at build time: every alias
+    (and canonical name) maps to a country id, every country id to a currency id,
+    and every currency id to its quote unit. Scoring code resolves a code to an id
+    once and then indexes plain tuples instead of doing string work per destination.
+    """
+
+    def __init__(self, countries: Dict[str, str], aliases: Dict[str, str],
+                 zones: Dict[str, Iterable[str]], currencies: Iterable[str] = ()):
+        # 1. Currencies (country currencies first, then the remaining EXIM codes)
+        codes = list(dict.fromkeys(list(countries.values()) + list(currencies)))
+        self.currencies: Tuple[str, ...] = tuple(sys.intern(code) for code in codes)
+        self.units: Tuple[int, ...] = tuple(parse_unit(code)[1] for code in self.currencies)
+        self._currency_ids: Dict[str, int] = {}
+        for currency_id, code in enumerate(self.currencies):
+            self._currency_ids[code] = currency_id
+            self._currency_ids.setdefault(parse_unit(code)[0], currency_id)  # "JPY" -> "JPY(100)"
+
+        # 2. Countries and their aliases
+        self.countries: Tuple[str, ...] = tuple(sys.intern(name) for name in countries)
+        self.country_currency: Tuple[int, ...] = tuple(
+            self._currency_ids[countries[name]] for name in self.countries
+        )
+        self._country_ids: Dict[str, int] = {_key(name): i for i, name in enumerate(self.countries)}
+        self.aliases: Dict[str, str] = {}
+        for alias, canonical in aliases.items():
+            if _key(canonical) not in self._country_ids:
+                raise ValueError(f"Alias '{alias}' points to unknown country '{canonical}'")
+            self._country_ids[_key(alias)] = self._country_ids[_key(canonical)]
+            self.aliases[alias] = self.countries[self._country_ids[_key(canonical)]]
+
+        # 3. Zones
+        self.zones: Dict[str, Tuple[str, ...]] = {
+            sys.intern(zone): tuple(self.canonical(member) for member in members)
+            for zone, members in zones.items()
+        }
+        self._zone_keys: Dict[str, str] = {_key(zone): zone for zone in self.zones}
+
+        digest = hashlib.sha256(repr((sorted(countries.items()), sorted(aliases.items()),
+                                      sorted(self.zones.items()), self.currencies)).encode("utf-8"))
+        self.version = digest.hexdigest()  # Changes whenever the registry data changes
+
+    # --- Countries ---
+
+    def country_id(self, name: str) -> Optional[int]:
+        """Id of a country (canonical name or alias), or None if it is not registered."""
+        return self._country_ids.get(_key(name))
+
+    def canonical(self, name: str) -> str:
+        """
+        Canonical spelling of a country (e.g. "Britain" -> "UK").
+        Unregistered names are returned stripped (e.g. "Vietnam ", "Euro area").
+        """
+        country_id = self._country_ids.get(_key(name))
+        return self.countries[country_id] if country_id is not None else str(name).strip()
+
+    def currency_of(self, name: str) -> Optional[str]:
+        """Currency code of a country (canonical name or alias), or None."""
+        country_id = self.country_id(name)
+        return None if country_id is None else self.currencies[self.country_currency[country_id]]
+
+    def country_currencies(self) -> Dict[str, str]:
+        """{canonical country: currency code}"""
+        return {name: self.currencies[self.country_currency[i]] for i, name in enumerate(self.countries)}
+
+    # --- Currencies ---
+
+    def currency_id(self, code: str) -> Optional[int]:
+        """Id of a currency code ("JPY(100)" or its ISO code "JPY"), or None."""
+        return self._currency_ids.get(code)
+
+    def unit(self, code: str) -> int:
+        """Quote unit of a currency (100 for "JPY(100)"); 1 for unregistered codes."""
+        currency_id = self._currency_ids.get(code)
+        return 1 if currency_id is None else self.units[currency_id]
+
+    def target_currencies(self) -> List[str]:
+        """Unique currency codes of the registered countries."""
+        return [self.currencies[i] for i in sorted(set(self.country_currency))]
+
+    # --- Zones ---
+
+    def zone(self, name: str) -> Tuple[str, ...]:
+        """Member countries of a currency zone (empty if unknown)."""
+        zone = self._zone_keys.get(_key(name))
+        return self.zones[zone] if zone is not None else ()
+
+
+# Loaded once per process; every module shares this instance
+REGISTRY = Registry(COUNTRIES, ALIASES, ZONES, EXIM_CURRENCIES)
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def calculate_lsb(
     meal_cost: float,
     drink_cost: float,
@@ -21,3 +24,28 @@ def calculate_lsb(
 
     total_cost = (3 * meal_cost) + (2 * drink_cost) + (1 * accommodation_cost)
     return float(total_cost)
+
+
+def calculate_lsb_batch(
+    meal_cost: np.ndarray,
+    drink_cost: np.ndarray,
+    accommodation_cost: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized calculate_lsb for many destinations or scenarios at once.
+
+    Args:
+        meal_cost (np.ndarray): Costs of a single meal (arrays broadcast together).
+        drink_cost (np.ndarray): Costs of a single drink.
+        accommodation_cost (np.ndarray): Costs of one night's accommodation.
+
+    Returns:
+        np.ndarray: Total daily survival costs (float64). 0.0 where any input is negative.
+    """
+    meal_cost = np.asarray(meal_cost, dtype=np.float64)
+    drink_cost = np.asarray(drink_cost, dtype=np.float64)
+    accommodation_cost = np.asarray(accommodation_cost, dtype=np.float64)
+
+    total_cost = (3 * meal_cost) + (2 * drink_cost) + (1 * accommodation_cost)
+    negative = (meal_cost < 0) | (drink_cost < 0) | (accommodation_cost < 0)
+    return np.where(negative, 0.0, total_cost)
@@ -1,3 +1,8 @@
+from typing import Dict
+
+import numpy as np
+
+
 def calculate_trend_factor(current_rate: float, ma_rate: float) -> float:
     """
     Calculate the exchange rate trend factor (deviation from moving average).
@@ -69,3 +74,78 @@ def calculate_tei(
         "is_undervalued": trend_r < 0,
         "adjusted_rate": round(adjusted_rate, 2)
     }
+
+
+def round_half_even(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """
+    Element-wise round(value, ndigits) with the exact result of Python's round().
+
+    np.round scales by 10**ndigits first, which can break ties differently than
+    round() (e.g. 2.675 -> 2.68 instead of 2.67). The rare values that land near a
+    tie after scaling are re-rounded with round(); all others keep np.round's result.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    with np.errstate(invalid="ignore"):
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(value), ndigits) for value in values[near_tie]]
+    return rounded
+
+
+def calculate_tei_batch(
+    budget,
+    duration,
+    local_daily_cost: np.ndarray,
+    current_rate: np.ndarray,
+    ma_rate: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_tei: scores many destinations or scenarios in one call.
+
+    Every argument may be a scalar or an array; they are broadcast together (e.g. one
+    budget against every destination, or a grid of budgets x destinations). Results
+    are rounded like calculate_tei.
+
+    Args:
+        budget: Total travel budget(s) in KRW.
+        duration: Travel duration(s) in days.
+        local_daily_cost (np.ndarray): Local daily survival costs in local currency.
+        current_rate (np.ndarray): Current exchange rates (KRW per unit).
+        ma_rate (np.ndarray): Moving average exchange rates.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays shaped like the broadcast inputs:
+            "tei_score", "trend_impact", "adjusted_rate" (float64),
+            "is_undervalued" and "error" (bool). Where "error" is True (the scalar
+            version returns an "error" key: duration <= 0, cost <= 0 or a non-positive
+            converted cost) the score and the other metrics are 0 / False.
+    """
+    budget, duration, local_daily_cost, current_rate, ma_rate = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (budget, duration, local_daily_cost, current_rate, ma_rate))
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 1. Calculate daily budget in KRW
+        my_daily_budget_krw = budget / duration
+
+        # 2. Calculate exchange rate trend factor (r); 0 where the MA is 0
+        trend_r = np.where(ma_rate == 0, 0.0, (current_rate - ma_rate) / ma_rate)
+
+        # 3-4. Adjusted rate and local cost in KRW
+        adjusted_rate = current_rate * (1 + trend_r)
+        local_cost_krw = local_daily_cost * adjusted_rate
+
+        # 5. Purchasing Power Index, invalid inputs flagged instead of returned early
+        error = (duration <= 0) | (local_daily_cost <= 0) | (local_cost_krw <= 0)
+        purchasing_power = my_daily_budget_krw / local_cost_krw
+
+    valid = ~error
+    return {
+        "tei_score": np.where(valid, round_half_even(purchasing_power), 0.0),
+        "trend_impact": np.where(valid, round_half_even(trend_r * 100), 0.0),
+        "is_undervalued": valid & (trend_r < 0),
+        "adjusted_rate": np.where(valid, round_half_even(adjusted_rate), 0.0),
+        "error": error,
+    }
@@ -0,0 +1,171 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_WINDOWS = (20, 50, 120, 252)  # ~1 month, the classic 50 days, ~6 months, ~1 year (business days)
+KINDS = ("sma", "ema")
+
+
+def rolling_sma(values: np.ndarray, windows: Iterable[int],
+                min_periods: Optional[int] = None) -> Dict[int, np.ndarray]:
+    """
+    Simple moving averages of several windows over a (date x currency) array, in one pass.
+
+    Matches pandas `rolling(window, min_periods).mean()`: each cell averages the valid
+    rates of its trailing window (clipped at the first row).
+
+    Args:
+        values (np.ndarray): 2-D array, oldest date first; NaN marks a missing rate.
+        windows (Iterable[int]): Window lengths in rows (business days).
+        min_periods (int, optional): Valid rates needed in a window (default: the window length).
+
+    Returns:
+        Dict[int, np.ndarray]: {window: array shaped like `values`}. A cell is NaN until
+                               its window holds `min_periods` valid rates.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+
+    # Prefix sums with a leading zero row: sum(rows i-w+1..i) = c[i+1] - c[i+1-w]
+    zero_row = np.zeros((1, values.shape[1]))
+    sums = np.concatenate([zero_row, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.concatenate([zero_row, np.cumsum(valid, axis=0)])
+    ends = np.arange(1, values.shape[0] + 1)
+
+    result = {}
+    for window in windows:
+        starts = np.maximum(ends - window, 0)
+        window_sums = sums[ends] - sums[starts]
+        window_counts = counts[ends] - counts[starts]
+        needed = max(window if min_periods is None else min_periods, 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[window] = np.where(window_counts >= needed, window_sums / window_counts, np.nan)
+    return result
+
+
+def ema(values: np.ndarray, windows: Iterable[int], min_periods: Optional[int] = None) -> Dict[int, np.ndarray]:
+    """
+    Exponential moving averages (span = window, alpha = 2 / (window + 1)) of several windows.
+
+    Matches pandas `ewm(span=window, adjust=False, min_periods=window, ignore_na=True)`:
+    the recursion is seeded with each currency's first rate, missing rates keep the
+    previous average, and a cell is NaN until `window` valid rates were seen. One loop
+    over dates updates every window and currency at once.
+
+    Args:
+        values (np.ndarray): 2-D (date x currency) array, oldest date first.
+        windows (Iterable[int]): Spans in rows (business days).
+        min_periods (int, optional): Valid rates needed before a value is output (default: the span).
+
+    Returns:
+        Dict[int, np.ndarray]: {window: array shaped like `values`}.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = list(windows)
+    spans = np.array(windows, dtype=np.float64)[:, None]       # (windows x 1) for broadcasting
+    alpha = 2.0 / (spans + 1.0)
+    needed = spans if min_periods is None else np.full_like(spans, min_periods)
+
+    state = np.full((len(windows), values.shape[1]), np.nan)
+    seen = np.zeros(values.shape[1])
+    out = np.full((len(windows),) + values.shape, np.nan)
+
+    for row in range(values.shape[0]):
+        current = values[row]
+        valid = ~np.isnan(current)
+        seen += valid
+        updated = np.where(np.isnan(state), current, state + alpha * (current - state))
+        state = np.where(valid, updated, state)
+        out[:, row] = np.where(seen >= needed, state, np.nan)
+
+    return {window: out[i] for i, window in enumerate(windows)}
+
+
+def bounded_ffill(values: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Forward-fills missing rates, but at most `limit` rows after the last observed one.
+
+    Args:
+        values (np.ndarray): 2-D (date x currency) array on a business-day grid, oldest first.
+        limit (int): Maximum number of consecutive missing days filled.
+
+    Returns:
+        np.ndarray: Filled copy; longer gaps (and leading gaps) stay NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rows = np.arange(values.shape[0])[:, None]
+    observed = ~np.isnan(values)
+
+    # Row of the last observation at or before each row (-1 if none yet)
+    last_row = np.maximum.accumulate(np.where(observed, rows, -1), axis=0)
+    source = np.take_along_axis(values, np.maximum(last_row, 0), axis=0)
+    fillable = (last_row >= 0) & (rows - last_row <= limit)
+    return np.where(fillable, source, np.nan)
+
+
+def window_coverage(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Share of each trailing `window`-row window (clipped at the first row) that holds an
+    observed rate. Filled-in days do not count as observed.
+    """
+    observed = ~np.isnan(np.asarray(values, dtype=np.float64))
+    counts = np.concatenate([np.zeros((1, observed.shape[1])), np.cumsum(observed, axis=0)])
+    ends = np.arange(1, observed.shape[0] + 1)
+    starts = np.maximum(ends - window, 0)
+    return (counts[ends] - counts[starts]) / window
+
+
+def compute_indicators(values: np.ndarray, windows: Iterable[int] = DEFAULT_WINDOWS,
+                       kinds: Iterable[str] = KINDS,
+                       min_periods: Optional[int] = None) -> Dict[Tuple[str, int], np.ndarray]:
+    """
+    Computes every requested (kind, window) moving average over a (date x currency) array.
+
+    Args:
+        min_periods (int, optional): Valid rates needed for a value (default: the window length).
+
+    Returns:
+        Dict[Tuple[str, int], np.ndarray]: {("sma" | "ema", window): array shaped like `values`}
+    """
+    windows = list(windows)
+    result = {}
+    for kind in kinds:
+        if kind == "sma":
+            averages = rolling_sma(values, windows, min_periods)
+        elif kind == "ema":
+            averages = ema(values, windows, min_periods)
+        else:
+            raise ValueError(f"Unknown moving average kind '{kind}'. Choose one of {KINDS}.")
+        result.update({(kind, window): average for window, average in averages.items()})
+    return result
+
+
+def gap_aware_indicators(values: np.ndarray, windows: Iterable[int], kinds: Iterable[str], max_fill: int,
+                         min_coverage: float) -> Tuple[Dict[Tuple[str, int], np.ndarray], Dict[int, np.ndarray]]:
+    """
+    compute_indicators over a business-day grid with explicit gap handling.
+
+    Every window covers the last `window` business days (not the last `window` rows that
+    happen to exist). Gaps up to `max_fill` days carry the previous rate; the average is
+    taken over the days that hold a rate after filling, and is only reported when at
+    least `min_coverage` of the window was actually observed.
+
+    Args:
+        values (np.ndarray): 2-D (business day x currency) array, oldest first; NaN = not stored.
+        windows (Iterable[int]): Window lengths in business days.
+        kinds (Iterable[str]): Moving average kinds (see KINDS).
+        max_fill (int): Longest gap (in days) bridged with the previous rate.
+        min_coverage (float): Minimum observed share of the window (0-1).
+
+    Returns:
+        tuple: ({(kind, window): average}, {window: coverage}), every array shaped like `values`.
+    """
+    windows = list(windows)
+    filled = bounded_ffill(values, max_fill)
+    coverage = {window: window_coverage(values, window) for window in windows}
+    averages = compute_indicators(filled, windows, kinds, min_periods=1)
+    masked = {
+        (kind, window): np.where(coverage[window] >= min_coverage, average, np.nan)
+        for (kind, window), average in averages.items()
+    }
+    return masked, coverage
@@ -0,0 +1,102 @@
+import math
+from typing import Optional, List
+
+
+class StreamingMovingAverage:
+    """
+    Simple moving average over the last `window` observations, updated in O(1).
+
+    Keeps a ring buffer of the window and its running sum. To stop floating point
+    drift from piling up, the sum is recomputed exactly (math.fsum) once every
+    `window` updates, which keeps the amortized cost per update constant.
+    """
+
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.values: List[float] = []   # Ring buffer of rates
+        self.dates: List[str] = []      # Matching 'YYYYMMDD' dates
+        self.head = 0                   # Index of the oldest entry once the buffer is full
+        self.running_sum = 0.0
+        self.updates_since_resync = 0
+        self.last_date: Optional[str] = None
+
+    def update(self, date: str, value: float) -> bool:
+        """
+        Adds the observation of a newer date.
+
+        Args:
+            date (str): Observation date 'YYYYMMDD'; must be after `last_date`.
+            value (float): Observed rate.
+
+        Returns:
+            bool: False (and nothing changes) if the date is not newer than the last one.
+        """
+        if self.last_date is not None and date <= self.last_date:
+            return False
+
+        if len(self.values) < self.window:
+            self.values.append(value)
+            self.dates.append(date)
+            self.running_sum += value
+        else:
+            self.running_sum += value - self.values[self.head]
+            self.values[self.head] = value
+            self.dates[self.head] = date
+            self.head = (self.head + 1) % self.window
+
+        self.last_date = date
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= self.window:
+            self.running_sum = math.fsum(self.values)
+            self.updates_since_resync = 0
+        return True
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    @property
+    def ready(self) -> bool:
+        """True once the window is full."""
+        return len(self.values) == self.window
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Average of the current window, or None until it is full."""
+        return self.running_sum / self.window if self.ready else None
+
+    @property
+    def latest(self) -> Optional[float]:
+        """Most recent observation."""
+        return self.values[self.head - 1] if self.values else None
+
+    @property
+    def first_date(self) -> Optional[str]:
+        """Date of the oldest observation in the window."""
+        return self.dates[self.head % len(self.dates)] if self.dates else None
+
+    def to_state(self) -> dict:
+        """Serializable snapshot of the engine (JSON-compatible)."""
+        return {
+            "window": self.window,
+            "values": self.values,
+            "dates": self.dates,
+            "head": self.head,
+            "running_sum": self.running_sum,
+            "updates_since_resync": self.updates_since_resync,
+            "last_date": self.last_date,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "StreamingMovingAverage":
+        """Restores an engine saved with to_state()."""
+        engine = cls(state["window"])
+        engine.values = list(state["values"])
+        engine.dates = list(state["dates"])
+        engine.head = state["head"]
+        engine.running_sum = state["running_sum"]
+        engine.updates_since_resync = state["updates_since_resync"]
+        engine.last_date = state["last_date"]
+        return engine
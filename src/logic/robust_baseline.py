@@ -0,0 +1,261 @@
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_TRIM = 0.1  # Share of the window dropped at EACH end by the trimmed mean
+
+
+class StreamingMedian:
+    """
+    Rolling median over the last `window` observations, O(log N) per update.
+
+    Two heaps hold the lower and upper halves of the window; values leaving the
+    window are deleted lazily (counted in `delayed` and dropped once they reach a
+    heap top). NaN observations occupy a slot in the window but are not ranked.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.order = deque()            # Window in arrival order (NaN included)
+        self.low = []                   # Max-heap (negated) of the lower half
+        self.high = []                  # Min-heap of the upper half
+        self.delayed = Counter()
+        self.low_size = 0
+        self.high_size = 0
+
+    def update(self, value: float) -> Optional[float]:
+        """
+        Adds an observation (evicting the oldest one once the window is full).
+
+        Args:
+            value (float): Observed rate, or NaN for a missing day.
+
+        Returns:
+            Optional[float]: The current median, or None below `min_periods` valid values.
+        """
+        self.order.append(value)
+        if not math.isnan(value):
+            self._add(value)
+        if len(self.order) > self.window:
+            oldest = self.order.popleft()
+            if not math.isnan(oldest):
+                self._remove(oldest)
+        return self.median
+
+    @property
+    def count(self) -> int:
+        """Number of valid values in the window."""
+        return self.low_size + self.high_size
+
+    @property
+    def median(self) -> Optional[float]:
+        if self.count == 0 or self.count < self.min_periods:
+            return None
+        if self.count % 2:
+            return -self.low[0]
+        return (-self.low[0] + self.high[0]) / 2
+
+    def _add(self, value):
+        if not self.low or value <= -self.low[0]:
+            heapq.heappush(self.low, -value)
+            self.low_size += 1
+        else:
+            heapq.heappush(self.high, value)
+            self.high_size += 1
+        self._rebalance()
+
+    def _remove(self, value):
+        self.delayed[value] += 1
+        if value <= -self.low[0]:
+            self.low_size -= 1
+            if value == -self.low[0]:
+                self._prune(self.low, negated=True)
+        else:
+            self.high_size -= 1
+            if self.high and value == self.high[0]:
+                self._prune(self.high, negated=False)
+        self._rebalance()
+
+    def _prune(self, heap, negated):
+        """Pops heap tops that were already deleted."""
+        while heap:
+            top = -heap[0] if negated else heap[0]
+            if not self.delayed[top]:
+                break
+            self.delayed[top] -= 1
+            heapq.heappop(heap)
+
+    def _rebalance(self):
+        # Keep low_size == high_size or low_size == high_size + 1
+        if self.low_size > self.high_size + 1:
+            heapq.heappush(self.high, -heapq.heappop(self.low))
+            self.low_size -= 1
+            self.high_size += 1
+            self._prune(self.low, negated=True)
+        elif self.low_size < self.high_size:
+            heapq.heappush(self.low, -heapq.heappop(self.high))
+            self.high_size -= 1
+            self.low_size += 1
+            self._prune(self.high, negated=False)
+
+
+class StreamingTrimmedMean:
+    """
+    Rolling trimmed mean over the last `window` observations, kept in a sorted window.
+
+    Insertion and removal locate their slot by binary search (O(log N)) but shift the
+    list behind it (O(N), one memmove: cheap for windows of a few hundred days). The sums
+    of the `trim` share of values at each end are kept up to date on every insert and
+    eviction, so reading the mean is O(1) and an update never re-sorts or re-sums the window.
+    NaN observations occupy a slot in the window but are not ranked.
+    """
+
+    def __init__(self, window: int, trim: float = DEFAULT_TRIM, min_periods: Optional[int] = None):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if not 0 <= trim < 0.5:
+            raise ValueError("trim must be in [0, 0.5)")
+        self.window = window
+        self.trim = trim
+        self.min_periods = window if min_periods is None else min_periods
+        self.order = deque()
+        self.sorted_values = []
+        self.total = 0.0
+        self.cut = 0              # Values trimmed at each end (int(count * trim))
+        self.low_sum = 0.0        # Sum of the `cut` smallest values
+        self.high_sum = 0.0       # Sum of the `cut` largest values
+        self.updates_since_resync = 0
+
+    def update(self, value: float) -> Optional[float]:
+        """
+        Adds an observation (evicting the oldest one once the window is full).
+
+        Args:
+            value (float): Observed rate, or NaN for a missing day.
+
+        Returns:
+            Optional[float]: The current trimmed mean, or None below `min_periods` valid values.
+        """
+        self.order.append(value)
+        if not math.isnan(value):
+            self._insert(value)
+        if len(self.order) > self.window:
+            oldest = self.order.popleft()
+            if not math.isnan(oldest):
+                self._remove(oldest)
+
+        # Recompute the running sums exactly once per window to stop float drift
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= self.window:
+            self._resync()
+            self.updates_since_resync = 0
+        return self.mean
+
+    @property
+    def count(self) -> int:
+        return len(self.sorted_values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        n = self.count
+        if n == 0 or n < self.min_periods:
+            return None
+        return (self.total - self.low_sum - self.high_sum) / (n - 2 * self.cut)
+
+    def _insert(self, value):
+        values, cut = self.sorted_values, self.cut
+        i = bisect_right(values, value)
+        values.insert(i, value)
+        self.total += value
+        n = len(values)
+
+        # The new value enters a tail and pushes that tail's innermost value out
+        if i < cut:
+            self.low_sum += value - values[cut]
+        elif i >= n - cut:
+            self.high_sum += value - values[n - cut - 1]
+
+        # One more value may widen both tails by one
+        new_cut = int(n * self.trim)
+        if new_cut > cut:
+            self.low_sum += values[cut]
+            self.high_sum += values[n - new_cut]
+            self.cut = new_cut
+
+    def _remove(self, value):
+        values, cut = self.sorted_values, self.cut
+        n = len(values)
+        i = bisect_left(values, value)
+        del values[i]
+        self.total -= value
+
+        # A value leaving a tail is replaced by the next value inward
+        if i < cut:
+            self.low_sum += values[cut - 1] - value
+        elif i >= n - cut:
+            self.high_sum += values[n - cut - 1] - value
+
+        # One value fewer may narrow both tails by one
+        new_cut = int((n - 1) * self.trim)
+        if new_cut < cut:
+            self.low_sum -= values[cut - 1]
+            self.high_sum -= values[n - 1 - cut]
+            self.cut = new_cut
+
+    def _resync(self):
+        values, cut = self.sorted_values, self.cut
+        self.total = math.fsum(values)
+        self.low_sum = math.fsum(values[:cut])
+        self.high_sum = math.fsum(values[len(values) - cut:]) if cut else 0.0
+
+
+def _rolling(engine_factory, values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    columns = values.reshape(values.shape[0], -1)
+    out = np.full(columns.shape, np.nan)
+    for j in range(columns.shape[1]):
+        engine = engine_factory()
+        for i, value in enumerate(columns[:, j]):
+            result = engine.update(float(value))
+            if result is not None:
+                out[i, j] = result
+    return out.reshape(values.shape)
+
+
+def rolling_median(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Batch rolling median of a 1-D series or of each column of a (date x currency) array.
+
+    Args:
+        values (np.ndarray): Oldest first; NaN marks a missing day.
+        window (int): Window length in rows.
+        min_periods (int, optional): Valid values needed for an output (default: window).
+
+    Returns:
+        np.ndarray: Same shape as `values`, NaN where the window has too few values.
+    """
+    return _rolling(lambda: StreamingMedian(window, min_periods), values)
+
+
+def rolling_trimmed_mean(values: np.ndarray, window: int, trim: float = DEFAULT_TRIM,
+                         min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Batch rolling trimmed mean (dropping `trim` of the window at each end).
+
+    Args:
+        values (np.ndarray): 1-D series or (date x currency) array, oldest first.
+        window (int): Window length in rows.
+        trim (float): Share trimmed at each end, in [0, 0.5).
+        min_periods (int, optional): Valid values needed for an output (default: window).
+
+    Returns:
+        np.ndarray: Same shape as `values`, NaN where the window has too few values.
+    """
+    return _rolling(lambda: StreamingTrimmedMean(window, trim, min_periods), values)
@@ -1,8 +1,36 @@
 import argparse
 import sys
 from typing import List, Dict, Any
-# Import the core service module
-from services.travel_service import run_analysis_pipeline 
+
+from utils.config import TREND_KINDS  # Lightweight: shared with moveAvgDay.get_trend_data
+
+
+DEFAULT_TREND_WINDOW = 50  # Business days of the moving average behind the trend factor
+LEVELS = ("country", "city")  # Ranking granularity (city level uses data.cost_index)
+
+
+def run_analysis_pipeline(total_budget: float, days: int, trend_window: int = DEFAULT_TREND_WINDOW,
+                          trend_kind: str = "sma", level: str = "country"):
+    """
+    Runs the core service pipeline.
+    The service (pandas, requests, ...) is imported here, so --help and input errors return immediately.
+    """
+    from services.travel_service import run_analysis_pipeline as _run_analysis_pipeline
+    return _run_analysis_pipeline(total_budget, days, trend_window, trend_kind, level)
+
+
+def run_scenario_sweep(budgets: List[float], days: List[int], trend_window: int = DEFAULT_TREND_WINDOW,
+                       trend_kind: str = "sma", level: str = "country"):
+    """
+    Runs the budget x days sweep (data loaded once, every scenario scored in one pass).
+    Returns (table, status_message); table is a DataFrame (see travel_service.sweep_table) or None.
+    """
+    from services.travel_service import run_scenario_sweep as _run_scenario_sweep, sweep_table
+    sweep, status_message = _run_scenario_sweep(budgets, days, trend_window, trend_kind, level)
+    if status_message != "Success":
+        return None, status_message
+    return sweep_table(sweep), status_message
+
 
 # --- [Output Helper Functions] ---
 
@@ -26,17 +54,23 @@ def display_rankings(results: List[Dict[str, Any]], total_budget: float, days: i
     sorted_results = sorted(results, key=lambda x: x.get('ppi_score', 0), reverse=True)
     
     daily_budget = total_budget / days
+
+    # City rankings label each row "City (Country)"; widen the column to fit
+    labels = [
+        f"{item['city']} ({item.get('country_code', '---')})" if item.get('city') else item.get('country_code', '---')
+        for item in sorted_results
+    ]
+    width = max([10] + [len(label) for label in labels])
     
     print("\n" + "═" * 70)
     print("      Purchasing Power Index (PPI) Travel Recommendation")
     print(f"      Reference Daily Budget: {daily_budget:,.0f} KRW/day")
     print("═" * 70)
-    print(f"{'Rank':<4} {'Code':<10} | {'PPI Score':<10} | Status")
+    print(f"{'Rank':<4} {'Code':<{width}} | {'PPI Score':<10} | Status")
     print("-" * 70)
     
     # Iterate through ALL results
-    for rank, item in enumerate(sorted_results, 1): 
-        code = item.get('country_code', '---')
+    for rank, (item, code) in enumerate(zip(sorted_results, labels), 1): 
         score = item.get('ppi_score', 0)
         
         # Determine status based on PPI score (Threshold: 1.0)
@@ -49,33 +83,85 @@ def display_rankings(results: List[Dict[str, Any]], total_budget: float, days: i
         else:
             status = "❌ SHORT (Budget Insufficient)"
         
+        # Flag trends computed from a history with gaps
+        coverage = item.get('trend_coverage', 1.0)
+        if coverage < 1.0:
+            status += f" (trend: {coverage:.0%} data)"
+
         print(
-            f"{rank: <4}. {code:<10} | {score: 7.2f}    | {status}"
+            f"{rank: <4}. {code:<{width}} | {score: 7.2f}    | {status}"
         )
     
     print("-" * 70)
     print("NOTE: PPI > 1.0 means your budget covers the local survival costs.")
 
 
+def display_sweep(table, output_path: str = None):
+    """
+    Prints the scenario sweep: one row per (budget, days), one PPI column per destination.
+    With `output_path` the full table is also written as CSV.
+    """
+    print("\n" + "═" * 70)
+    print("      PPI Scenario Sweep (budget x days x destination)")
+    print("═" * 70)
+    print(table.to_string(index=False, float_format=lambda value: f"{value:.2f}",
+                          formatters={"budget": lambda value: f"{value:,.0f}"}))
+    print("-" * 70)
+    print("NOTE: PPI > 1.0 means your budget covers the local survival costs.")
+
+    if output_path:
+        table.to_csv(output_path, index=False)
+        print(f"Saved {len(table)} scenarios to {output_path}")
+
+
 def main():
     # 1. Argument Parsing
     parser = argparse.ArgumentParser(description="Cost Effective Travel - PPI Calculator.")
-    parser.add_argument("--budget", type=float, required=True, help="Total travel budget (e.g., 2000000)")
-    parser.add_argument("--days", type=int, required=True, help="Travel duration (e.g., 10 days)")
+    parser.add_argument("--budget", type=float, nargs="+", required=True,
+                        help="Total travel budget (e.g., 2000000); several values run a scenario sweep")
+    parser.add_argument("--days", type=int, nargs="+", required=True,
+                        help="Travel duration (e.g., 10 days); several values run a scenario sweep")
+    parser.add_argument("--trend-window", type=int, default=DEFAULT_TREND_WINDOW,
+                        help="Moving average window for the trend factor, in business days (e.g., 20, 50, 120, 252)")
+    parser.add_argument("--trend-kind", choices=TREND_KINDS, default="sma",
+                        help="Trend baseline: moving average (sma/ema) or robust (median/trimmed mean)")
+    parser.add_argument("--level", choices=LEVELS, default="country",
+                        help="Rank countries (default) or individual cities")
+    parser.add_argument("--output", help="Scenario sweep only: also save the table as CSV")
     args = parser.parse_args()
+    sweep = len(args.budget) > 1 or len(args.days) > 1
+    if args.output and not sweep:
+        parser.error("--output needs a scenario sweep (several --budget and/or --days values)")
 
     # 2. Input Validation
-    if args.budget <= 0 or args.days <= 0:
+    if min(args.budget) <= 0 or min(args.days) <= 0:
         display_error("Budget and days must be positive values (> 0).")
         sys.exit(1)
+    if args.trend_window <= 1:
+        display_error("Trend window must be at least 2 business days.")
+        sys.exit(1)
+
+    # 3. Scenario Sweep: several budgets and/or durations, data loaded once
+    if sweep:
+        table, status_message = run_scenario_sweep(
+            args.budget, args.days, args.trend_window, args.trend_kind, args.level
+        )
+        if status_message == "Success":
+            display_sweep(table, args.output)
+        else:
+            display_error(status_message)
+        return
 
-    # 3. Execute Service and Receive Results
+    # 4. Execute Service and Receive Results
     # Service function returns a tuple: (results_list, status_message)
-    results, status_message = run_analysis_pipeline(args.budget, args.days)
+    budget, days = args.budget[0], args.days[0]
+    results, status_message = run_analysis_pipeline(
+        budget, days, args.trend_window, args.trend_kind, args.level
+    )
 
-    # 4. Output Based on Status
+    # 5. Output Based on Status
     if status_message == "Success":
-        display_rankings(results, args.budget, args.days)
+        display_rankings(results, budget, days)
     else:
         # Display error message returned by the Service layer
         display_error(status_message)
@@ -1,100 +1,180 @@
 from typing import Dict, Any, List, Tuple
-import pandas as pd
 import json
 
+import numpy as np
+
 # --- Internal Module Imports ---
 from api import country_loader, api_loader, moveAvgDay
-from data import export_json
+from data import export_json, cost_snapshot, cost_index
+from data.registry import REGISTRY
 from logic import calculator, basket
 
-def run_analysis_pipeline(total_budget: float, days: int) -> Tuple[List[Dict[str, Any]], str]:
+def unit_rates(rate_row: Dict[str, Any], unit: int) -> Dict[str, Any]:
     """
-    Runs full pipeline: Fetch -> Merge -> Calculate -> Export.
+    Converts a rate row quoted per `unit` (e.g. JPY(100): KRW per 100 yen) to KRW per single unit.
+    """
+    return {
+        'Currency': rate_row.get('Currency', 0) / unit,
+        'MA': rate_row.get('MA', 0) / unit,
+        'Coverage': rate_row.get('Coverage', 1.0),
+    }
+
+def destination_arrays(
+    costs: List[Dict[str, Any]],
+    rates: List[Dict[str, Any]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    LSB (local currency), current rate and MA rate of every destination, as arrays.
+    `rates[i]` is the rate row of `costs[i]`'s currency, already per single unit (see unit_rates).
+    """
+    current_rate = np.array([rate['Currency'] for rate in rates], dtype=float)
+    ma_rate = np.array([rate['MA'] for rate in rates], dtype=float)
+
+    # Fix: Convert Hotel(KRW) -> Local Currency for basket calc
+    hotel_krw = np.array([cost.get('avg_hotel_krw', 0) for cost in costs], dtype=float)
+    hotel_local = np.divide(hotel_krw, current_rate, out=np.zeros_like(hotel_krw), where=current_rate > 0)
+
+    # Calc LSB (Local Survival Budget)
+    lsb_cost = basket.calculate_lsb_batch(
+        meal_cost=np.array([cost.get('big_mac', 0) for cost in costs], dtype=float),
+        drink_cost=np.array([cost.get('starbucks', 0) for cost in costs], dtype=float),
+        accommodation_cost=hotel_local
+    )
+    return lsb_cost, current_rate, ma_rate
+
+def score_destinations(
+    costs: List[Dict[str, Any]],
+    rates: List[Dict[str, Any]],
+    total_budget: float,
+    days: int
+) -> List[Dict[str, Any]]:
+    """
+    Scores every destination (country or city) in one vectorized pass.
+    `rates[i]` is the rate row of `costs[i]`'s currency, already per single unit (see unit_rates).
+    """
+    if not costs:
+        return []
+
+    lsb_cost, current_rate, ma_rate = destination_arrays(costs, rates)
+
+    # Calc TEI (Purchasing Power)
+    tei_result = calculator.calculate_tei_batch(
+        budget=total_budget,
+        duration=days,
+        local_daily_cost=lsb_cost,
+        current_rate=current_rate,
+        ma_rate=ma_rate
+    )
+
+    return [
+        {
+            'currency_code': cost.get('currency'),
+            'ppi_score': float(tei_result['tei_score'][i]),
+            'trend_factor': float(tei_result['trend_impact'][i]),
+            'lsb_cost_local': round(float(lsb_cost[i]), 2),
+            'exchange_rate': rate['Currency'],
+            # Share of the trend window backed by stored rates (< 1.0: history has gaps)
+            'trend_coverage': rate.get('Coverage', 1.0)
+        }
+        for i, (cost, rate) in enumerate(zip(costs, rates))
+    ]
+
+def load_destinations(
+    trend_window: int = 50,
+    trend_kind: str = "sma",
+    level: str = "country"
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], str]:
+    """
+    Steps 1-3 of the pipeline: target currencies, rates with their trend baseline and cost data,
+    paired per destination (country or city; see `level`).
+
+    Returns:
+        Tuple: (labels, costs, rates, status). labels[i] holds 'country_code' (and 'city'),
+               costs[i] its cost record and rates[i] its currency's rates per single unit.
+               status is "Success" or an error message (then the lists are empty).
     """
-    print("\n[Service Log] Starting Full PPI Analysis Pipeline...")
-    
     # 1. Get Target Currencies
     print("  - 1. Fetching target currency codes...")
     target_currencies = country_loader.get_target_currencies() 
     if not target_currencies:
-        return [], "Error: No target currencies loaded."
+        return [], [], [], "Error: No target currencies loaded."
         
     # 2. Fetch Exchange Rate & MA Data
-    print("  - 2. Fetching MA data...")
+    print(f"  - 2. Fetching MA data ({trend_window}-day {trend_kind.upper()})...")
     try:
         api_key, _, _ = api_loader.load_api_key()
-        ma_data_df = moveAvgDay.get_50day_ma_data(api_key)
+        ma_data_df = moveAvgDay.get_trend_data(api_key, window=trend_window, kind=trend_kind)
     except Exception as e:
-        return [], f"Error: API/DB failed: {e}"
+        return [], [], [], f"Error: API/DB failed: {e}"
         
     if ma_data_df.empty:
-        return [], "Error: No exchange rate data retrieved."
+        return [], [], [], "Error: No exchange rate data retrieved."
         
-    # 3. Load Cost Data (from export_json)
-    print("  - 3. Loading cost data...")
+    # 3. Load Cost Data (compiled snapshot, rebuilt by export_json only when a source CSV changes)
+    print(f"  - 3. Loading cost data ({level} level)...")
     try:
-        # Returns dict: { "CountryName": { "currency": "CODE", ... } }
-        cost_dict = export_json.main()
-        if not cost_dict:
-            return [], "Error: Cost data is empty."
+        if level == "city":
+            # City entries from the in-memory cost index: [(country, city, costs), ...]
+            destinations = [
+                (entry['country'], entry['city'], entry)
+                for entry in cost_index.load_cost_index().iter_cities()
+            ]
+        else:
+            # Returns dict: { "CountryName": { "currency": "CODE", ... } }
+            cost_dict = cost_snapshot.load_cost_data()
+            destinations = [(country, None, costs) for country, costs in cost_dict.items()]
+        if not destinations:
+            return [], [], [], "Error: Cost data is empty."
     except Exception as e:
-        return [], f"Error: Cost data load failed: {e}"
+        return [], [], [], f"Error: Cost data load failed: {e}"
 
-    # 4. Calculate Scores
-    print("  - 4. Calculating final scores...")
-    final_results = []
-    
-    # Map: Currency Code -> Data
-    ma_dict = ma_data_df.set_index('Currency Code').to_dict('index')
+    # Map: Currency id -> rates per single unit (normalized once per currency, not per destination)
+    rates_by_currency = {}
+    for rate_row in ma_data_df.to_dict('records'):
+        currency_id = REGISTRY.currency_id(rate_row['Currency Code'])
+        if currency_id is not None:
+            rates_by_currency[currency_id] = unit_rates(rate_row, REGISTRY.units[currency_id])
     
-    for country_key, cost_data in cost_dict.items(): 
+    labels, costs, rates = [], [], []
+    for country_key, city, cost_data in destinations: 
         # Extract currency code (e.g., "EUR", "JPY(100)")
         currency_code = cost_data.get('currency')
+        currency_id = REGISTRY.currency_id(currency_code)
         
-        if currency_code and currency_code in ma_dict:
-            rate_data = ma_dict[currency_code]
-            
-            raw_curr = rate_data.get('Currency', 0)
-            raw_ma = rate_data.get('50-day_MA', 0)
-
-            # Fix: Normalize 100-unit currencies (e.g., JPY, IDR)
-            if '(100)' in currency_code:
-                current_rate = raw_curr / 100
-                ma_rate = raw_ma / 100
-            else:
-                current_rate = raw_curr
-                ma_rate = raw_ma
-            
-            # Fix: Convert Hotel(KRW) -> Local Currency for basket calc
-            hotel_krw = cost_data.get('avg_hotel_krw', 0)
-            hotel_local = hotel_krw / current_rate if current_rate > 0 else 0
-
-            # Calc LSB (Local Survival Budget)
-            lsb_cost = basket.calculate_lsb(
-                meal_cost=cost_data.get('big_mac', 0),
-                drink_cost=cost_data.get('starbucks', 0),
-                accommodation_cost=hotel_local 
-            )
-            
-            # Calc TEI (Purchasing Power)
-            tei_result = calculator.calculate_tei(
-                budget=total_budget,
-                duration=days,
-                local_daily_cost=lsb_cost,
-                current_rate=current_rate,        
-                ma_rate=ma_rate             
-            )
-            
-            final_results.append({
-                'country_code': country_key,
-                'currency_code': currency_code,
-                'ppi_score': tei_result.get('tei_score', 0.0),
-                'trend_factor': tei_result.get('trend_impact', 0.0),
-                'lsb_cost_local': round(lsb_cost, 2),
-                'exchange_rate': current_rate
-            })
+        if currency_id in rates_by_currency:
+            labels.append({'country_code': country_key} if city is None else {'country_code': country_key, 'city': city})
+            costs.append(cost_data)
+            rates.append(rates_by_currency[currency_id])
         else:
-            print(f"  [WARN] Skip {country_key}: No rate data for {currency_code}")
+            print(f"  [WARN] Skip {city or country_key}: No rate data for {currency_code}")
+
+    return labels, costs, rates, "Success"
+
+def run_analysis_pipeline(
+    total_budget: float,
+    days: int,
+    trend_window: int = 50,
+    trend_kind: str = "sma",
+    level: str = "country"
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Runs full pipeline: Fetch -> Merge -> Calculate -> Export.
+    The trend factor compares the current rate with its `trend_window`-day baseline
+    (SMA, EMA, rolling median or trimmed mean; see `trend_kind`).
+    With level="city" every indexed city is scored on its own prices (see cost_index).
+    """
+    print("\n[Service Log] Starting Full PPI Analysis Pipeline...")
+
+    labels, costs, rates, status = load_destinations(trend_window, trend_kind, level)
+    if status != "Success":
+        return [], status
+
+    # 4. Calculate Scores
+    print("  - 4. Calculating final scores...")
+    final_results = [
+        {**label, **scores}
+        for label, scores in zip(labels, score_destinations(costs, rates, total_budget, days))
+    ]
 
     # 5. Export Results
     print("  - 5. Exporting results...")
@@ -109,4 +189,74 @@ def run_analysis_pipeline(total_budget: float, days: int) -> Tuple[List[Dict[str
         print("  Analysis complete.")
         return final_results, "Success"
     else:
-        return [], "Error: No results generated."
\ No newline at end of file
+        return [], "Error: No results generated."
+
+def run_scenario_sweep(
+    budgets: List[float],
+    days: List[int],
+    trend_window: int = 50,
+    trend_kind: str = "sma",
+    level: str = "country"
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Scores every budget x days x destination combination after loading the data once.
+
+    Rates, costs and each destination's LSB do not depend on the budget or the trip
+    length, so they are computed once; the PPI tensor then comes from a single
+    broadcast calculate_tei_batch call.
+
+    Returns:
+        Tuple[Dict[str, Any], str]: (sweep, status). sweep holds 'budgets', 'days',
+            'destinations' (labels as in run_analysis_pipeline) and 'ppi', an array
+            shaped (len(budgets), len(days), len(destinations)).
+    """
+    print("\n[Service Log] Starting PPI Scenario Sweep...")
+
+    labels, costs, rates, status = load_destinations(trend_window, trend_kind, level)
+    if status != "Success":
+        return {}, status
+    if not labels:
+        return {}, "Error: No results generated."
+
+    print(f"  - 4. Scoring {len(budgets)} budgets x {len(days)} durations x {len(labels)} destinations...")
+    lsb_cost, current_rate, ma_rate = destination_arrays(costs, rates)
+    budget_grid = np.asarray(budgets, dtype=float)[:, None, None]
+    days_grid = np.asarray(days, dtype=float)[None, :, None]
+    tei_result = calculator.calculate_tei_batch(
+        budget=budget_grid,
+        duration=days_grid,
+        local_daily_cost=lsb_cost,
+        current_rate=current_rate,
+        ma_rate=ma_rate
+    )
+
+    sweep = {
+        'budgets': list(budgets),
+        'days': list(days),
+        'destinations': labels,
+        'ppi': tei_result['tei_score'],
+    }
+    return sweep, "Success"
+
+def sweep_table(sweep: Dict[str, Any]):
+    """
+    Flattens a sweep into one row per (budget, days) scenario and one PPI column per
+    destination ('City (Country)' for cities), plus the best destination of each row.
+
+    Returns:
+        pd.DataFrame: Columns 'budget', 'days', <destinations...>, 'best'.
+    """
+    import pandas as pd
+
+    names = [
+        f"{label['city']} ({label['country_code']})" if label.get('city') else label['country_code']
+        for label in sweep['destinations']
+    ]
+    ppi = sweep['ppi']
+    budgets, days = len(sweep['budgets']), len(sweep['days'])
+
+    table = pd.DataFrame(ppi.reshape(budgets * days, len(names)), columns=names)
+    table.insert(0, 'budget', np.repeat(sweep['budgets'], days))
+    table.insert(1, 'days', np.tile(sweep['days'], budgets))
+    table['best'] = [names[i] for i in ppi.reshape(budgets * days, len(names)).argmax(axis=1)]
+    return table
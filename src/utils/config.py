@@ -0,0 +1,47 @@
+import os
+import threading
+
+# --- 1. Settings and Constants Definition ---
+DEFAULT_BASE_URL = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+SERVICE_CODE = "AP01"
+MISSING_KEY_MESSAGE = " API Key is not configured in the .env file. Please check the EXIM_API_KEY variable."
+TREND_KINDS = ("sma", "ema", "median", "trimmed")  # Trend baselines: moving averages and robust (median/trimmed mean)
+
+
+class Settings:
+    """
+    Lazily loaded configuration.
+
+    Nothing happens at import: the .env file is read on first access, and a missing
+    API key only raises when the key is actually needed. Values are read from the
+    environment on every access so tests can change them freely.
+    """
+
+    def __init__(self):
+        self._dotenv_loaded = False
+        self._lock = threading.Lock()
+
+    def _load_dotenv(self):
+        with self._lock:
+            if not self._dotenv_loaded:
+                from dotenv import load_dotenv
+                load_dotenv()
+                self._dotenv_loaded = True
+
+    @property
+    def api_key(self):
+        """EXIM API key. Raises ValueError if it is not configured."""
+        self._load_dotenv()
+        api_key = os.getenv("EXIM_API_KEY")
+        if not api_key:
+            raise ValueError(MISSING_KEY_MESSAGE)
+        return api_key
+
+    @property
+    def base_url(self):
+        """EXIM endpoint; EXIM_BASE_URL points it elsewhere (e.g. the local fake_exim_server)."""
+        self._load_dotenv()
+        return os.environ.get("EXIM_BASE_URL", DEFAULT_BASE_URL)
+
+
+settings = Settings()
@@ -62,17 +62,16 @@ def test_load_api_key_success(mock_env_variables):
     assert url == BASE_URL
     assert code == SERVICE_CODE
 
-def test_module_raises_error_if_api_key_is_missing(mock_missing_env_variables):
-    """Verifies that the module raises ValueError if API_KEY is not set at load time."""
+def test_import_without_api_key_is_lazy(mock_missing_env_variables):
+    """Verifies that importing the module never fails; load_api_key raises ValueError if the key is missing."""
     
-    # This test is fragile due to Python's module caching. 
-    # We attempt to force the initial module logic (where ValueError is raised) to re-run.
+    # Force cache deletion and re-import: the top-level logic must not touch the key
+    if 'src.api.api_loader' in sys.modules:
+        del sys.modules['src.api.api_loader']
+    import src.api.api_loader 
+
     with pytest.raises(ValueError) as excinfo:
-        # Force cache deletion and re-import
-        if 'src.api.api_loader' in sys.modules:
-            del sys.modules['src.api.api_loader']
-        # The re-import attempt will trigger the top-level logic and raise the error
-        import src.api.api_loader 
+        src.api.api_loader.load_api_key()
     
     assert "API Key is not configured in the .env file" in str(excinfo.value)
 
@@ -0,0 +1,76 @@
+import os
+import sys
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import src.api.moveAvgDay
+from src.api import backfill
+from src.api.business_calendar import business_days_since
+from src.api.fake_exim_server import FakeEximServer
+from src.api.quota import QuotaManager
+from src.api.rate_limiter import AdaptiveRateLimiter
+
+TEST_API_KEY = "mock_test_api_key_123"
+END_DATE = "20251031"
+CURRENCIES = ['USD', 'EUR']
+
+
+@pytest.fixture
+def fake_exim(tmp_path, monkeypatch):
+    """Runs the backfill against the local fake EXIM server with a temp DB folder."""
+    monkeypatch.setattr(src.api.moveAvgDay, 'DB_DIR', str(tmp_path / 'database'))
+    with FakeEximServer() as server:
+        monkeypatch.setenv("EXIM_BASE_URL", server.base_url)
+        yield server
+
+
+def run_backfill(tmp_path, daily_limit=1000):
+    quota = QuotaManager(TEST_API_KEY, daily_limit=daily_limit, state_dir=str(tmp_path / 'state'))
+    return backfill.backfill(TEST_API_KEY, years=1, end=END_DATE, currencies=CURRENCIES,
+                             max_workers=4, quota=quota, rate_limiter=AdaptiveRateLimiter(min_interval=0))
+
+
+def history_dates(currency_code):
+    return src.api.moveAvgDay.open_rate_store().date_sets([currency_code])[currency_code]
+
+
+def test_backfill_builds_one_year_for_every_currency(fake_exim, tmp_path):
+    expected = set(business_days_since("20241031", END_DATE))
+
+    summary = run_backfill(tmp_path)
+
+    assert summary == {"fetched": len(expected), "remaining": 0}
+    assert history_dates('USD') == expected
+    assert history_dates('EUR') == expected
+
+
+def test_quota_limited_run_resumes_where_it_stopped(fake_exim, tmp_path):
+    first = run_backfill(tmp_path, daily_limit=30)
+    assert first["fetched"] == 30
+    assert len(history_dates('USD')) == 30
+
+    # Next day: a fresh budget fetches only what is still missing
+    second = run_backfill(tmp_path, daily_limit=1000)
+    assert second["fetched"] == first["remaining"]
+    assert fake_exim.request_count == 30 + second["fetched"]
+
+
+def test_interrupted_run_resumes_from_stored_dates(fake_exim, tmp_path):
+    # Simulate a run killed after checkpointing two dates into the store
+    src.api.moveAvgDay.open_rate_store().append([
+        ('USD', "20251031", 1.0), ('EUR', "20251031", 2.0),
+        ('USD', "20251030", 3.0), ('EUR', "20251030", 4.0),
+    ])
+
+    summary = run_backfill(tmp_path)
+
+    expected = business_days_since("20241031", END_DATE)
+    assert summary["fetched"] == len(expected) - 2
+    assert fake_exim.request_count == len(expected) - 2
+
+    usd = src.api.moveAvgDay.open_rate_store().load_latest(['USD'], 1)
+    assert usd.iloc[0]['Date'] == "20251031"
+    assert usd.iloc[0]['Currency'] == 1.0
@@ -0,0 +1,50 @@
+import os
+import sys
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.business_calendar import (
+    is_business_day, latest_business_day, previous_business_days, business_days_since
+)
+
+
+def test_is_business_day_skips_weekends_and_holidays():
+    assert is_business_day("20251210")        # Wednesday
+    assert not is_business_day("20251213")    # Saturday
+    assert not is_business_day("20251008")    # Chuseok substitute holiday
+    assert not is_business_day("20251225")    # Christmas
+
+
+def test_previous_business_days_walks_over_chuseok():
+    # Oct 3 and Oct 6-9, 2025 are holidays
+    assert previous_business_days(4, end="20251013") == ["20251013", "20251010", "20251002", "20251001"]
+
+
+def test_latest_business_day_respects_publication_hour():
+    # Before publication the previous business day is the latest published one
+    assert latest_business_day(datetime(2025, 12, 10, 9, 0)) == "20251209"
+    assert latest_business_day(datetime(2025, 12, 10, 12, 0)) == "20251210"
+    # Monday morning resolves to the previous Friday
+    assert latest_business_day(datetime(2025, 12, 15, 8, 0)) == "20251212"
+
+
+def test_latest_business_day_uses_korean_time_on_any_host():
+    # 03:00 UTC is 12:00 KST: already published in Seoul
+    assert latest_business_day(datetime(2025, 12, 10, 3, 0, tzinfo=timezone.utc)) == "20251210"
+    # 18:00 in New York on Dec 9 is 08:00 KST on Dec 10: not published yet
+    new_york = ZoneInfo("America/New_York")
+    assert latest_business_day(datetime(2025, 12, 9, 18, 0, tzinfo=new_york)) == "20251209"
+    # 20:00 in New York on Dec 9 is 10:00 KST: still the previous business day
+    assert latest_business_day(datetime(2025, 12, 9, 20, 0, tzinfo=new_york)) == "20251209"
+    # 22:30 in New York on Dec 9 is 12:30 KST on Dec 10
+    assert latest_business_day(datetime(2025, 12, 9, 22, 30, tzinfo=new_york)) == "20251210"
+
+
+def test_business_days_since_is_inclusive_and_newest_first():
+    assert business_days_since("20251001", end="20251013") == [
+        "20251013", "20251010", "20251002", "20251001"
+    ]
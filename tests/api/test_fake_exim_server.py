@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import pytest
+import requests
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.fake_exim_server import FakeEximServer, synthetic_day_data
+
+BUSINESS_DATE = "20251210"   # Wednesday
+WEEKEND_DATE = "20251213"    # Saturday
+
+
+def fetch(server, search_date):
+    params = {"authkey": "key", "searchdate": search_date, "data": "AP01"}
+    return requests.get(server.base_url, params=params, timeout=5)
+
+
+def test_synthetic_data_is_deterministic_and_empty_on_weekends():
+    assert synthetic_day_data(BUSINESS_DATE) == synthetic_day_data(BUSINESS_DATE)
+    assert synthetic_day_data(WEEKEND_DATE) == []
+
+    units = {item["cur_unit"] for item in synthetic_day_data(BUSINESS_DATE)}
+    assert {"USD", "JPY(100)", "EUR"} <= units
+
+
+def test_serves_synthetic_ap01_responses():
+    with FakeEximServer() as server:
+        response = fetch(server, BUSINESS_DATE)
+
+    assert response.status_code == 200
+    assert response.json() == synthetic_day_data(BUSINESS_DATE)
+
+
+def test_injects_result_4_after_quota_and_http_errors():
+    with FakeEximServer(quota_limit=1) as server:
+        assert fetch(server, BUSINESS_DATE).json()[0]["result"] == 1
+        assert fetch(server, BUSINESS_DATE).json() == [{"result": 4}]
+
+    with FakeEximServer(error_rate=1.0) as server:
+        assert fetch(server, BUSINESS_DATE).status_code == 500
+
+
+def test_record_then_replay(tmp_path):
+    record_dir = str(tmp_path / "recorded")
+
+    # Record through a proxy whose "real" upstream is another fake server
+    with FakeEximServer() as upstream:
+        with FakeEximServer(mode="record", record_dir=record_dir, upstream_url=upstream.base_url) as recorder:
+            recorded = fetch(recorder, BUSINESS_DATE).json()
+
+    with open(os.path.join(record_dir, f"{BUSINESS_DATE}.json"), encoding="utf-8") as f:
+        assert json.load(f) == recorded
+
+    with FakeEximServer(mode="replay", record_dir=record_dir) as replayer:
+        assert fetch(replayer, BUSINESS_DATE).json() == recorded
+        assert fetch(replayer, "20251211").json() == []
+
+
+@pytest.mark.parametrize("search_date", ["../../etc/passwd", "2025121", "20251210/../x", "2025-12-10"])
+def test_rejects_malformed_searchdate_before_touching_record_dir(tmp_path, search_date):
+    record_dir = tmp_path / "recorded"
+    with FakeEximServer(mode="replay", record_dir=str(record_dir)) as replayer:
+        response = fetch(replayer, search_date)
+
+    assert response.status_code == 400
+    assert replayer.request_count == 0
+
+
+def test_replay_mode_requires_record_dir():
+    with pytest.raises(ValueError):
+        FakeEximServer(mode="replay")
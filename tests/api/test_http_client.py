@@ -0,0 +1,66 @@
+import os
+import sys
+import pytest
+import requests
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import src.api.http_client as http_client
+
+TEST_URL = "https://example.test/exchangeJSON"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    """Records backoff waits instead of sleeping."""
+    sleeps = []
+    monkeypatch.setattr(http_client.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_get_session_is_shared():
+    assert http_client.get_session() is http_client.get_session()
+
+
+def test_get_retries_transient_errors_then_succeeds(requests_mock, no_backoff_sleep):
+    requests_mock.get(TEST_URL, [
+        {'exc': requests.exceptions.ConnectTimeout},
+        {'status_code': 503},
+        {'json': [{"result": 1}], 'status_code': 200},
+    ])
+
+    response = http_client.get(TEST_URL, params={"searchdate": "20251210"})
+
+    assert response.json() == [{"result": 1}]
+    assert requests_mock.call_count == 3
+    # Exponential backoff between the attempts
+    assert no_backoff_sleep == [0.2, 0.4]
+
+
+def test_get_gives_up_after_max_retries(requests_mock):
+    requests_mock.get(TEST_URL, exc=requests.exceptions.ConnectionError)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_client.get(TEST_URL, retries=2)
+
+    assert requests_mock.call_count == 3
+
+
+def test_get_does_not_retry_client_errors(requests_mock):
+    requests_mock.get(TEST_URL, status_code=404)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        http_client.get(TEST_URL)
+
+    assert requests_mock.call_count == 1
+
+
+def test_get_stops_when_budget_cannot_cover_backoff(requests_mock):
+    requests_mock.get(TEST_URL, status_code=500)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        http_client.get(TEST_URL, retries=5, budget=0.1)
+
+    assert requests_mock.call_count == 1
@@ -1,9 +1,9 @@
 import os
 import sys
+import shutil
 import pytest
 import requests_mock
 import pandas as pd
-from datetime import datetime, timedelta
 
 # --- Setup for Relative Imports ---
 # Assumes the test file is in src/tests/api and the target is src/api/moveAvgDay.py
@@ -15,8 +15,9 @@ if project_root not in sys.path:
 # Import the module under test and required functions/constants
 from src.api.moveAvgDay import (
     DAYS_TO_FETCH, MIN_PERIODS, DB_DIR, DB_FILE_PREFIX, 
-    setup_database, load_db_data, save_db_data, get_50day_ma_data
+    setup_database, load_db_data, save_db_data, get_50day_ma_data, open_rate_store
 )
+from src.api.business_calendar import previous_business_days
 # Note: get_target_currencies is imported from country_loader in the original file,
 # but we mock its behavior directly in the test using the moveAvgDay import path.
 
@@ -50,11 +51,9 @@ def setup_teardown_db():
     yield 
 
     # --- TEARDOWN ---
-    # Clean up the test environment after the test suite finishes
-    if os.path.exists(TEST_FILE_PATH):
-        os.remove(TEST_FILE_PATH)
+    # Clean up the test environment (CSV files and the rate store) after the test suite finishes
     if os.path.exists(TEST_DB_DIR):
-        os.rmdir(TEST_DB_DIR)
+        shutil.rmtree(TEST_DB_DIR)
 
 # FIX 2: New function-scoped fixture to handle DB_DIR patching (resolves ScopeMismatch)
 @pytest.fixture(autouse=True) # Defaults to function scope
@@ -126,14 +125,13 @@ def test_get_50day_ma_data_full_process(requests_mock, mock_target_currencies, p
     existing_days = 45
     needed_new_days = DAYS_TO_FETCH - existing_days # Should be 5
 
-    # Generate 45 days of historical data (Date in YYYYMMDD string format)
+    # Generate 45 business days of historical data (Date in YYYYMMDD string format),
+    # ending just before the 5 most recent business days
     base_rate = 1400.0
-    base_date = datetime.now() - timedelta(days=70) # Set a baseline far enough in the past
+    existing_dates = previous_business_days(DAYS_TO_FETCH)[needed_new_days:][::-1]
     existing_data = []
 
-    for i in range(1, existing_days + 1):
-        # We need realistic date strings for comparison
-        date_str = (base_date + timedelta(days=i)).strftime('%Y%m%d')
+    for i, date_str in enumerate(existing_dates, 1):
         existing_data.append({
             'Date': date_str,
             'Currency Code': TEST_CURRENCY,
@@ -147,14 +145,16 @@ def test_get_50day_ma_data_full_process(requests_mock, mock_target_currencies, p
     latest_rate_base = 1500.0
     api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
 
+    # Any other date is answered as an empty (non-business) day
+    requests_mock.get(api_base_url, json=[], status_code=200)
+
     mock_dates = []
     fetched_count = 0
-    # Search backwards for a reasonable amount of time (e.g., 10 days) to find the 5 business days
+    # Search backwards for a reasonable amount of time (e.g., 10 business days)
     MAX_SEARCH_DAYS = 10 
 
-    for i in range(1, MAX_SEARCH_DAYS + 1):
-        # FIX: The search date must follow the logic in fetch_optimized_data (1, 2, 3... days back)
-        search_date_str = (datetime.now() - timedelta(days=i)).strftime('%Y%m%d')
+    for search_date_str in previous_business_days(MAX_SEARCH_DAYS):
+        # The planner walks business days back from the latest published one
         
         # Only mock a response if the date is not already in the DB AND we still need data
         if search_date_str not in df_existing['Date'].values and fetched_count < needed_new_days:
@@ -192,11 +192,320 @@ def test_get_50day_ma_data_full_process(requests_mock, mock_target_currencies, p
     
     # - Verify MA calculation (check if it's a valid number)
     assert not pd.isna(result_row['50-day_MA'])
+    # - The window holds every one of the last 50 business days
+    assert result_row['Coverage'] == 1.0
+    assert not result_row['Partial']
 
-    # 5. Verify the DB file now has 50 days
-    final_df = load_db_data(TEST_FILE_PATH)
-    assert len(final_df) == DAYS_TO_FETCH
+    # 5. Verify the rate store (migrated from the 45-day CSV) now has 50 days
+    store = open_rate_store()
+    assert store.counts([TEST_CURRENCY])[TEST_CURRENCY] == DAYS_TO_FETCH
     
-    # Verify the newest date in the saved DB is the newest mocked date
-    # (load_db_data sorts by date descending)
-    assert final_df.iloc[0]['Date'] == newest_mocked_date
\ No newline at end of file
+    # Verify the newest date in the store is the newest mocked date
+    final_df = store.load_latest([TEST_CURRENCY], 1)
+    assert final_df.iloc[0]['Date'] == newest_mocked_date
+
+def test_collect_missing_data_shares_one_request_per_date(requests_mock):
+    """Verifies that one AP01 response per date is fanned out to every currency that needs it."""
+    api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+    search_dates = previous_business_days(3)
+    requests_mock.get(api_base_url, json=[], status_code=200)
+
+    for i, date_str in enumerate(search_dates):
+        requests_mock.get(
+            f"{api_base_url}?authkey={TEST_API_KEY}&searchdate={date_str}&data=AP01",
+            json=create_mock_api_response('USD', date_str, 1400.0 + i)
+            + create_mock_api_response('EUR', date_str, 1600.0 + i),
+            status_code=200
+        )
+
+    from src.api.moveAvgDay import collect_missing_data
+    # USD needs 3 days; EUR already has the newest date and needs 2 more
+    new_frames = collect_missing_data(TEST_API_KEY, {
+        'USD': (set(), 3),
+        'EUR': ({search_dates[0]}, 2),
+    }, max_workers=1)
+
+    # 3 dates -> 3 requests in total (not 5)
+    assert requests_mock.call_count == 3
+    assert sorted(new_frames['USD']['Date'], reverse=True) == search_dates
+    assert list(new_frames['EUR']['Date']) == search_dates[1:]
+    assert list(new_frames['EUR']['Currency']) == [1601.0, 1602.0]
+
+
+def test_collect_missing_data_concurrent_merge_is_ordered_and_stops_on_limit(requests_mock):
+    """Verifies concurrent fetching merges newest-first, keeps the batch's other answers and stops at a result 4."""
+    api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+    search_dates = previous_business_days(6)
+
+    for i, date_str in enumerate(search_dates):
+        # The 4th date answers with the daily-limit error code
+        response = [{"result": 4}] if i == 3 else create_mock_api_response(TEST_CURRENCY, date_str, 1400.0 + i)
+        requests_mock.get(
+            f"{api_base_url}?authkey={TEST_API_KEY}&searchdate={date_str}&data=AP01",
+            json=response,
+            status_code=200
+        )
+
+    from src.api.moveAvgDay import collect_missing_data
+    new_frames = collect_missing_data(TEST_API_KEY, {TEST_CURRENCY: (set(), 6)}, max_workers=3)
+
+    # The limited date is skipped, the answers already received in its batch are kept,
+    # and no further batch is planned
+    assert requests_mock.call_count == 6
+    assert list(new_frames[TEST_CURRENCY]['Date']) == search_dates[:3] + search_dates[4:]
+    assert list(new_frames[TEST_CURRENCY]['Currency']) == [1400.0, 1401.0, 1402.0, 1404.0, 1405.0]
+
+
+def test_plan_missing_dates_picks_exactly_the_needed_dates():
+    """Verifies the planner picks each currency's newest missing business dates, nothing more."""
+    from src.api.moveAvgDay import plan_missing_dates
+    candidates = ['20251211', '20251210', '20251209', '20251208', '20251205']
+
+    plan = plan_missing_dates(
+        {'USD': ({'20251210'}, 2), 'EUR': (set(), 1)},
+        {'USD': 2, 'EUR': 1},
+        candidates,
+    )
+
+    assert plan == {'20251211': ['USD', 'EUR'], '20251209': ['USD']}
+
+
+def test_rank_missing_dates_prefers_currencies_closest_to_min_periods():
+    """Verifies dates serving the nearly-complete currency are fetched first, newest first."""
+    from src.api.moveAvgDay import rank_missing_dates
+    plan = {
+        '20251211': ['USD'],
+        '20251210': ['USD', 'EUR'],
+        '20251209': ['EUR'],
+    }
+
+    # EUR needs 2 more rows, USD needs 30
+    assert rank_missing_dates(plan, {'USD': 30, 'EUR': 2}) == ['20251210', '20251209', '20251211']
+
+
+def test_collect_missing_data_defers_dates_beyond_quota(requests_mock, tmp_path):
+    """Verifies no request is sent once the persisted daily quota is used up."""
+    from src.api.moveAvgDay import collect_missing_data
+    from src.api.quota import QuotaManager
+
+    api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+    search_dates = previous_business_days(5)
+    for i, date_str in enumerate(search_dates):
+        requests_mock.get(
+            f"{api_base_url}?authkey={TEST_API_KEY}&searchdate={date_str}&data=AP01",
+            json=create_mock_api_response(TEST_CURRENCY, date_str, 1400.0 + i),
+            status_code=200
+        )
+
+    quota = QuotaManager(TEST_API_KEY, daily_limit=2, state_dir=str(tmp_path))
+    new_frames = collect_missing_data(TEST_API_KEY, {TEST_CURRENCY: (set(), 5)}, max_workers=1, quota=quota)
+
+    assert requests_mock.call_count == 2
+    assert list(new_frames[TEST_CURRENCY]['Date']) == search_dates[:2]
+    assert quota.remaining() == 0
+
+
+def test_limited_quota_first_completes_the_currency_nearest_to_usable(requests_mock, tmp_path):
+    """A long but stale history does not outrank a currency missing a single window date."""
+    from src.api.moveAvgDay import collect_missing_data
+    from src.api.quota import QuotaManager
+
+    api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+    window_dates = previous_business_days(10)
+    for i, date_str in enumerate(window_dates):
+        requests_mock.get(
+            f"{api_base_url}?authkey={TEST_API_KEY}&searchdate={date_str}&data=AP01",
+            json=create_mock_api_response('USD', date_str, 1400.0 + i)
+            + create_mock_api_response('EUR', date_str, 1600.0 + i),
+            status_code=200
+        )
+
+    stale_usd = set(previous_business_days(360)[10:])        # 350 rows, none in the window
+    eur_missing = window_dates[7]
+    eur_stored = set(window_dates) - {eur_missing}
+
+    quota = QuotaManager(TEST_API_KEY, daily_limit=1, state_dir=str(tmp_path))
+    new_frames = collect_missing_data(TEST_API_KEY, {
+        'USD': (stale_usd, 10),
+        'EUR': (eur_stored, 1),
+    }, max_workers=1, quota=quota, lookback_days=10)
+
+    assert requests_mock.call_count == 1
+    assert list(new_frames['EUR']['Date']) == [eur_missing]
+
+
+def test_collect_missing_data_keeps_answers_of_a_partly_deferred_batch(requests_mock, tmp_path):
+    """A date deferred by the quota does not drop the other answers fetched in the same batch."""
+    from src.api.moveAvgDay import collect_missing_data
+    from src.api.quota import QuotaManager
+
+    api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+    search_dates = previous_business_days(3)
+    for i, date_str in enumerate(search_dates):
+        requests_mock.get(
+            f"{api_base_url}?authkey={TEST_API_KEY}&searchdate={date_str}&data=AP01",
+            json=create_mock_api_response(TEST_CURRENCY, date_str, 1400.0 + i),
+            status_code=200
+        )
+
+    quota = QuotaManager(TEST_API_KEY, daily_limit=2, state_dir=str(tmp_path))
+    new_frames = collect_missing_data(TEST_API_KEY, {TEST_CURRENCY: (set(), 3)}, max_workers=3, quota=quota)
+
+    # Whichever date of the batch was deferred, both fetched answers are kept
+    assert requests_mock.call_count == 2
+    assert len(new_frames[TEST_CURRENCY]) == 2
+    assert set(new_frames[TEST_CURRENCY]['Date']) < set(search_dates)
+
+
+def test_moving_average_state_is_reused_and_matches_pandas(tmp_path):
+    """The persisted window only applies new days, and stays equal to the pandas rolling mean."""
+    from src.api.rate_store import RateStore
+    from src.api.moveAvgDay import update_moving_averages
+
+    store = RateStore(str(tmp_path / "rates.sqlite3"))
+    dates = previous_business_days(80)[::-1]
+    rates = {date: 1300.0 + (i * 37 % 11) * 1.25 for i, date in enumerate(dates)}
+    gap = dates[65]
+    store.append((TEST_CURRENCY, date, rates[date]) for date in dates[:60])
+
+    def run():
+        date_sets = store.date_sets([TEST_CURRENCY])
+        return update_moving_averages(store, [TEST_CURRENCY], date_sets)[TEST_CURRENCY]
+
+    def pandas_ma():
+        history = store.load_history([TEST_CURRENCY])
+        return history['Currency'].rolling(window=DAYS_TO_FETCH).mean().iloc[-1]
+
+    rebuilt_for = []
+    load_latest = store.load_latest
+    store.load_latest = lambda currencies, days: rebuilt_for.append(list(currencies)) or load_latest(currencies, days)
+
+    first = run()
+    assert first.mean == pytest.approx(pandas_ma())
+    assert rebuilt_for == [[TEST_CURRENCY]]      # No saved state yet: built from the store
+
+    # New days (with one missing) are applied to the saved window
+    store.append((TEST_CURRENCY, date, rates[date]) for date in dates[60:] if date != gap)
+    second = run()
+    assert rebuilt_for[-1] == []                 # Saved window reused
+    assert second.mean == pytest.approx(pandas_ma())
+    assert second.last_date == dates[-1]
+    assert second.latest == rates[dates[-1]]
+
+    # A day filled inside the saved window (e.g. by a backfill) forces a rebuild from the store
+    store.append([(TEST_CURRENCY, gap, 9999.0)])
+    rebuilt = run()
+    assert rebuilt_for[-1] == [TEST_CURRENCY]
+    assert rebuilt.mean == pytest.approx(pandas_ma())
+    assert rebuilt.first_date == dates[30]
+
+
+def test_get_trend_data_uses_vectorized_engine_for_other_windows(monkeypatch, tmp_path, mock_target_currencies):
+    """A 120-day SMA / EMA is computed from the store without any API call when history suffices."""
+    import src.api.moveAvgDay
+    from src.api.moveAvgDay import get_trend_data
+
+    monkeypatch.setattr(src.api.moveAvgDay, 'DB_DIR', str(tmp_path))
+    dates = previous_business_days(260)[::-1]
+    rates = pd.Series([1300.0 + (i % 17) * 2.5 for i in range(260)])
+    open_rate_store().append((TEST_CURRENCY, date, rate) for date, rate in zip(dates, rates))
+
+    sma = get_trend_data(TEST_API_KEY, window=120, kind='sma')
+    ema = get_trend_data(TEST_API_KEY, window=120, kind='ema')
+
+    assert list(sma.columns) == ['Currency Code', 'Date', 'Currency', 'MA', 'Coverage', 'Partial']
+    assert sma.iloc[0]['Date'] == dates[-1]
+    assert sma.iloc[0]['Currency'] == rates.iloc[-1]
+    assert sma.iloc[0]['MA'] == pytest.approx(rates.iloc[-120:].mean())
+    # EMA runs over 2 windows of history (plus the forward-fill seed days)
+    expected_ema = rates.iloc[-243:].ewm(span=120, adjust=False).mean().iloc[-1]
+    assert ema.iloc[0]['MA'] == pytest.approx(expected_ema)
+
+
+def test_gapped_history_yields_flagged_partial_trend(monkeypatch, tmp_path, requests_mock, mock_target_currencies):
+    """A history with a missing week asks for that week; if it stays missing the MA is flagged as partial."""
+    import src.api.moveAvgDay
+    monkeypatch.setattr(src.api.moveAvgDay, 'DB_DIR', str(tmp_path))
+    requests_mock.get("https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON", json=[])
+
+    window_dates = previous_business_days(DAYS_TO_FETCH)[::-1]
+    older_dates = previous_business_days(DAYS_TO_FETCH + 10)[::-1][:10]
+    missing_week = set(window_dates[20:25])
+    stored = [date for date in older_dates + window_dates if date not in missing_week]
+    rates = {date: 1300.0 + i for i, date in enumerate(stored)}
+    open_rate_store().append((TEST_CURRENCY, date, rate) for date, rate in rates.items())
+
+    result_df = get_50day_ma_data(TEST_API_KEY)
+
+    # 55 stored days, but the missing week is still requested (the API has nothing for it),
+    # and nothing older than the window is asked for instead
+    requested = {request.qs['searchdate'][0] for request in requests_mock.request_history}
+    assert requested == missing_week
+    row = result_df.iloc[0]
+    assert row['Partial']
+    assert row['Coverage'] == pytest.approx(45 / 50)
+    assert row['Date'] == window_dates[-1]
+    # The 3 days after the gap start carry the last rate before it; the other 2 are skipped
+    last_before_gap = rates[window_dates[19]]
+    window_rates = [rates[date] for date in window_dates if date not in missing_week] + [last_before_gap] * 3
+    assert row['50-day_MA'] == pytest.approx(sum(window_rates) / len(window_rates))
+
+
+def test_stale_history_fetches_the_current_window(monkeypatch, tmp_path, requests_mock, mock_target_currencies):
+    """50 stored days that all predate the window do not count: the window is fetched and its MA computed."""
+    import src.api.moveAvgDay
+    monkeypatch.setattr(src.api.moveAvgDay, 'DB_DIR', str(tmp_path))
+    api_base_url = "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
+
+    window_dates = previous_business_days(DAYS_TO_FETCH)[::-1]
+    stale_dates = previous_business_days(2 * DAYS_TO_FETCH)[DAYS_TO_FETCH:]
+    open_rate_store().append((TEST_CURRENCY, date, 1200.0) for date in stale_dates)
+    for i, date_str in enumerate(window_dates):
+        requests_mock.get(
+            f"{api_base_url}?authkey={TEST_API_KEY}&searchdate={date_str}&data=AP01",
+            json=create_mock_api_response(TEST_CURRENCY, date_str, 1400.0 + i),
+            status_code=200
+        )
+
+    result_df = get_50day_ma_data(TEST_API_KEY)
+
+    assert requests_mock.call_count == DAYS_TO_FETCH
+    row = result_df.iloc[0]
+    assert row['Date'] == window_dates[-1]
+    assert row['Coverage'] == 1.0
+    assert row['50-day_MA'] == pytest.approx(1400.0 + (DAYS_TO_FETCH - 1) / 2)
+
+
+def test_too_sparse_history_is_not_reported(monkeypatch, tmp_path, requests_mock, mock_target_currencies):
+    """Below MIN_COVERAGE the currency is skipped instead of mixing stale rates."""
+    import src.api.moveAvgDay
+    monkeypatch.setattr(src.api.moveAvgDay, 'DB_DIR', str(tmp_path))
+    requests_mock.get("https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON", json=[])
+
+    # 60 stored days, but the last 20 business days are missing
+    stale_dates = previous_business_days(80)[20:]
+    open_rate_store().append((TEST_CURRENCY, date, 1300.0) for date in stale_dates)
+
+    assert get_50day_ma_data(TEST_API_KEY).empty
+    # Only the 20 missing window dates were requested, none before the window
+    assert requests_mock.call_count == 20
+
+
+def test_robust_baselines_ignore_a_shock_day(monkeypatch, tmp_path, mock_target_currencies):
+    """The rolling median / trimmed mean baselines are barely moved by one extreme rate."""
+    import src.api.moveAvgDay
+    from src.api.moveAvgDay import get_trend_data
+    monkeypatch.setattr(src.api.moveAvgDay, 'DB_DIR', str(tmp_path))
+
+    dates = previous_business_days(60)[::-1]
+    rates = [1300.0 + (i % 5) for i in range(60)]
+    rates[-10] = 3000.0
+    open_rate_store().append((TEST_CURRENCY, date, rate) for date, rate in zip(dates, rates))
+
+    sma = get_trend_data(TEST_API_KEY, window=40, kind='sma').iloc[0]['MA']
+    median = get_trend_data(TEST_API_KEY, window=40, kind='median').iloc[0]['MA']
+    trimmed = get_trend_data(TEST_API_KEY, window=40, kind='trimmed').iloc[0]['MA']
+
+    assert sma > 1340
+    assert median == 1302.0
+    assert 1300 <= trimmed <= 1304
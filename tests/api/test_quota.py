@@ -0,0 +1,49 @@
+import os
+import sys
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.quota import QuotaManager, QuotaExceededError
+
+TEST_KEY = "mock_test_api_key_123"
+
+
+def test_try_acquire_refuses_before_limit_is_exceeded(tmp_path):
+    quota = QuotaManager(TEST_KEY, daily_limit=3, state_dir=str(tmp_path))
+
+    assert quota.try_acquire(2)
+    assert not quota.try_acquire(2)   # Would exceed: nothing is reserved
+    assert quota.try_acquire(1)
+    assert quota.remaining() == 0
+
+    with pytest.raises(QuotaExceededError):
+        quota.acquire()
+
+
+def test_ledger_is_shared_across_instances_and_keys_are_separate(tmp_path):
+    first_run = QuotaManager(TEST_KEY, daily_limit=10, state_dir=str(tmp_path))
+    second_run = QuotaManager(TEST_KEY, daily_limit=10, state_dir=str(tmp_path))
+    other_key = QuotaManager("another_key", daily_limit=10, state_dir=str(tmp_path))
+
+    first_run.acquire(4)
+
+    assert second_run.used() == 4
+    assert other_key.used() == 0
+
+
+def test_ledger_never_stores_the_raw_key(tmp_path):
+    QuotaManager(TEST_KEY, state_dir=str(tmp_path)).acquire()
+
+    with open(os.path.join(tmp_path, "quota_ledger.json"), encoding="utf-8") as f:
+        assert TEST_KEY not in f.read()
+
+
+def test_mark_exhausted_blocks_the_rest_of_the_day(tmp_path):
+    quota = QuotaManager(TEST_KEY, daily_limit=10, state_dir=str(tmp_path))
+    quota.mark_exhausted()
+
+    assert quota.remaining() == 0
+    assert not quota.try_acquire()
@@ -0,0 +1,44 @@
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.rate_limiter import AdaptiveRateLimiter
+
+
+def test_failure_backs_off_multiplicatively_up_to_max():
+    limiter = AdaptiveRateLimiter(min_interval=0.1, max_interval=0.5, backoff_factor=2.0)
+
+    limiter.record_failure()
+    assert limiter.interval == 0.2
+    limiter.record_failure()
+    limiter.record_failure()
+    assert limiter.interval == 0.5  # Capped at max_interval
+
+
+def test_success_recovers_additively_down_to_min():
+    limiter = AdaptiveRateLimiter(min_interval=0.1, max_interval=1.0, recovery_step=0.05)
+    limiter.interval = 0.2
+
+    limiter.record_success()
+    assert abs(limiter.interval - 0.15) < 1e-9
+    for _ in range(10):
+        limiter.record_success()
+    assert limiter.interval == 0.1  # Never faster than min_interval
+
+
+def test_acquire_spaces_out_consecutive_slots(monkeypatch):
+    import src.api.rate_limiter
+    clock = {"now": 100.0}
+    sleeps = []
+    monkeypatch.setattr(src.api.rate_limiter.time, 'monotonic', lambda: clock["now"])
+    monkeypatch.setattr(src.api.rate_limiter.time, 'sleep', sleeps.append)
+
+    limiter = AdaptiveRateLimiter(min_interval=0.25)
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+
+    assert sleeps == [0.25, 0.5]
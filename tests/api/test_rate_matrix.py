@@ -0,0 +1,62 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.rate_store import RateStore
+from src.api.rate_matrix import build_rate_matrix, RateMatrix
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RateStore(str(tmp_path / "rates.sqlite3"))
+    # 20251205 (Fri) ~ 20251210 (Wed); EUR misses 20251209
+    store.append([
+        ('USD', '20251205', 1.0), ('USD', '20251208', 2.0), ('USD', '20251209', 3.0), ('USD', '20251210', 4.0),
+        ('EUR', '20251205', 5.0), ('EUR', '20251208', 6.0), ('EUR', '20251210', 8.0),
+    ])
+    return store
+
+
+def test_matrix_is_indexed_by_business_date_and_currency(store, tmp_path):
+    build_rate_matrix(store, directory=str(tmp_path))
+    matrix = RateMatrix(str(tmp_path))
+
+    assert matrix.dates == ['20251205', '20251208', '20251209', '20251210']  # Weekend skipped
+    assert matrix.currencies == ['EUR', 'USD']
+    assert isinstance(matrix.values, np.memmap)
+    assert matrix.values.dtype == np.float64
+    assert list(matrix.column('USD')) == [1.0, 2.0, 3.0, 4.0]
+    assert np.isnan(matrix.column('EUR')[2])
+
+
+def test_window_is_a_view_ending_at_date(store, tmp_path):
+    build_rate_matrix(store, directory=str(tmp_path))
+    matrix = RateMatrix(str(tmp_path))
+
+    window = matrix.window(2, end_date='20251209')
+    assert window.shape == (2, 2)
+    assert np.shares_memory(window, matrix.values)
+    assert list(window[:, 1]) == [2.0, 3.0]
+
+
+def test_rebuild_swaps_matrix_and_keeps_open_maps_valid(store, tmp_path):
+    build_rate_matrix(store, directory=str(tmp_path))
+    old = RateMatrix(str(tmp_path))
+
+    store.append([('USD', '20251211', 9.0), ('EUR', '20251211', 10.0)])
+    build_rate_matrix(store, directory=str(tmp_path))
+    new = RateMatrix(str(tmp_path))
+
+    assert new.dates[-1] == '20251211'
+    assert len(old.dates) == old.values.shape[0] == 4
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.npy')]) == 1
+
+
+def test_missing_matrix_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RateMatrix(str(tmp_path))
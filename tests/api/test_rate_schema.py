@@ -0,0 +1,57 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.rate_schema import compact_rates, expand_rates, to_day_numbers, to_date_strings, rate_array
+from src.api.rate_store import RateStore
+
+
+def sample_history(days=250, currencies=('USD', 'EUR', 'JPY(100)')):
+    dates = pd.bdate_range("2024-01-01", periods=days).strftime("%Y%m%d")
+    return pd.DataFrame({
+        'Currency Code': [code for code in currencies for _ in dates],
+        'Date': list(dates) * len(currencies),
+        'Currency': np.round(np.linspace(900, 1600, days * len(currencies)), 2),
+    })
+
+
+def test_day_numbers_round_trip():
+    days = to_day_numbers(['19700101', '20251210'])
+    assert days.dtype == np.int32
+    assert list(days) == [0, 20432]
+    assert to_date_strings(days) == ['19700101', '20251210']
+
+
+def test_compact_layout_round_trips_and_shrinks_memory():
+    history = sample_history()
+    compact = compact_rates(history)
+
+    assert dict(compact.dtypes.astype(str)) == {'Currency Code': 'category', 'Day': 'int32', 'Currency': 'float32'}
+    assert expand_rates(compact).equals(history)
+    assert compact.memory_usage(deep=True).sum() * 5 < history.memory_usage(deep=True).sum()
+
+
+def test_store_loads_compact_history(tmp_path):
+    store = RateStore(str(tmp_path / "rates.sqlite3"))
+    store.append([('USD', '20251209', 1400.5), ('EUR', '20251210', 1600.25)])
+
+    compact = store.load_history(['USD', 'EUR'], compact=True)
+    assert list(compact['Currency Code'].cat.categories) == ['USD', 'EUR']
+    assert list(compact['Day']) == list(to_day_numbers(['20251210', '20251209']))
+
+
+def test_rate_array_matches_a_pivot_of_the_full_layout():
+    history = sample_history(days=30).iloc[::3]                # Every third row: plenty of holes
+    dates = list(pd.bdate_range("2023-12-25", periods=40).strftime("%Y%m%d"))   # Starts before the history
+    currencies = ['USD', 'EUR', 'JPY(100)', 'GBP']              # GBP has no rows
+
+    values = rate_array(compact_rates(history, currencies), dates, currencies)
+
+    pivot = history.pivot(index='Date', columns='Currency Code', values='Currency')
+    expected = pivot.reindex(index=dates, columns=currencies).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(values, expected)
@@ -0,0 +1,106 @@
+import os
+import sys
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.api.rate_store import RateStore
+
+
+def make_store(tmp_path):
+    return RateStore(str(tmp_path / "rates.sqlite3"))
+
+
+def test_later_append_replaces_same_day_and_counts(tmp_path):
+    store = make_store(tmp_path)
+    store.append([('USD', '20251209', 1400.0), ('USD', '20251210', 1401.0)])
+    store.append([('USD', '20251210', 1402.0), ('EUR', '20251210', 1600.0)])
+
+    assert store.counts(['USD', 'EUR', 'GBP']) == {'USD': 2, 'EUR': 1, 'GBP': 0}
+    assert store.date_sets(['USD'])['USD'] == {'20251209', '20251210'}
+    assert list(store.load_latest(['USD'], 1)['Currency']) == [1402.0]
+
+
+def test_compact_folds_pending_rows_without_changing_reads(tmp_path):
+    store = make_store(tmp_path)
+    store.append([('USD', '20251210', 1401.0), ('USD', '20251209', 1400.0)])
+    store.compact()
+    store.append([('USD', '20251210', 1402.0), ('USD', '20251211', 1403.0)])
+    before = store.load_history(['USD'])
+
+    assert store.pending_count() == 2
+    assert store.compact() == 2
+    assert store.pending_count() == 0
+    assert store.load_history(['USD']).equals(before)
+    assert list(before['Currency']) == [1400.0, 1402.0, 1403.0]
+
+
+def test_compact_if_needed_runs_in_background_over_threshold(tmp_path):
+    store = make_store(tmp_path)
+    store.append([('USD', '20251210', 1401.0)])
+    assert store.compact_if_needed(threshold=1) is None      # Nothing to do yet
+
+    store.append([('USD', '20251211', 1402.0)])
+    thread = store.compact_if_needed(threshold=1)
+    thread.join()
+    assert store.pending_count() == 0
+    assert store.counts(['USD']) == {'USD': 2}
+
+
+def test_load_latest_returns_last_window_of_every_currency(tmp_path):
+    store = make_store(tmp_path)
+    dates = [f"202512{day:02d}" for day in range(1, 11)]
+    store.append(('USD', date, 1400.0 + i) for i, date in enumerate(dates))
+    store.append(('EUR', date, 1600.0 + i) for i, date in enumerate(dates[:3]))
+
+    latest = store.load_latest(['USD', 'EUR'], 4)
+
+    usd = latest[latest['Currency Code'] == 'USD']
+    assert list(usd['Date']) == dates[-4:]          # Oldest first within the window
+    assert list(usd['Currency']) == [1406.0, 1407.0, 1408.0, 1409.0]
+    assert len(latest[latest['Currency Code'] == 'EUR']) == 3
+
+
+def test_migrate_csvs_imports_legacy_files_once(tmp_path):
+    csv_dir = tmp_path / "database"
+    csv_dir.mkdir()
+    pd.DataFrame({
+        'Date': ['20251209', '20251210'],
+        'Currency Code': ['JPY(100)', 'JPY(100)'],
+        'Currency': [935.5, 936.0],
+        '50-day_MA': [None, None],
+    }).to_csv(csv_dir / "exchange_data_JPY(100).csv")
+
+    store = make_store(tmp_path)
+    assert store.migrate_csvs(str(csv_dir)) == ['JPY(100)']
+    assert store.migrate_csvs(str(csv_dir)) == []    # Already in the store
+
+    history = store.load_history(['JPY(100)'])
+    assert list(history['Date']) == ['20251209', '20251210']
+    assert list(history['Currency']) == [935.5, 936.0]
+
+
+def append_and_compact(path, currency_code):
+    store = RateStore(path)
+    for day in range(1, 21):
+        store.append([(currency_code, f"202512{day:02d}", float(day))])
+        if day % 5 == 0:
+            store.compact()
+    return store.counts([currency_code])[currency_code]
+
+
+def test_parallel_processes_write_without_losing_rows(tmp_path):
+    path = str(tmp_path / "rates.sqlite3")
+    RateStore(path)
+    currencies = ['USD', 'EUR', 'JPY(100)', 'GBP']
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(append_and_compact, [path] * 4, currencies))
+
+    assert results == [20] * 4
+    store = RateStore(path)
+    store.compact()
+    assert store.counts(currencies) == {currency_code: 20 for currency_code in currencies}
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import pytest
+from datetime import datetime
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import src.api.response_cache as response_cache
+
+TEST_URL = "https://example.test/exchangeJSON"
+TEST_KEY = "mock_test_api_key_123"
+PAST_DATE = "20251209"
+DAY_DATA = [{"result": 1, "cur_unit": "USD", "deal_bas_r": "1,350.50"}]
+
+
+def test_load_response_miss_returns_none():
+    assert response_cache.load_response(PAST_DATE, "AP01") is None
+
+
+def test_save_and_load_round_trip_is_compressed():
+    response_cache.save_response(PAST_DATE, "AP01", DAY_DATA)
+
+    assert response_cache.load_response(PAST_DATE, "AP01") == DAY_DATA
+    assert os.path.exists(os.path.join(response_cache.CACHE_DIR, "AP01", f"{PAST_DATE}.json.gz"))
+
+
+def test_negative_entry_is_an_empty_list():
+    response_cache.save_response(PAST_DATE, "AP01", [])
+    assert response_cache.load_response(PAST_DATE, "AP01") == []
+
+
+def test_today_entries_expire_but_past_entries_do_not(monkeypatch):
+    today = datetime.now().strftime("%Y%m%d")
+    response_cache.save_response(today, "AP01", DAY_DATA)
+    response_cache.save_response(PAST_DATE, "AP01", DAY_DATA)
+
+    # Jump past today's TTL
+    real_time = time.time
+    monkeypatch.setattr(response_cache.time, 'time', lambda: real_time() + response_cache.TODAY_TTL_SECONDS + 1)
+
+    assert response_cache.load_response(today, "AP01") is None
+    assert response_cache.load_response(PAST_DATE, "AP01") == DAY_DATA
+
+
+def test_past_negative_entries_expire_only_on_business_days(monkeypatch):
+    """An empty answer for a past business day may be transient; a weekend's is final."""
+    saturday = "20251213"
+    response_cache.save_response(PAST_DATE, "AP01", [])
+    response_cache.save_response(saturday, "AP01", [])
+
+    real_time = time.time
+    monkeypatch.setattr(response_cache.time, 'time',
+                        lambda: real_time() + response_cache.PAST_NEGATIVE_TTL_SECONDS + 1)
+
+    assert response_cache.load_response(PAST_DATE, "AP01") is None
+    assert response_cache.load_response(saturday, "AP01") == []
+
+
+def test_fetch_day_response_hits_api_once(requests_mock):
+    requests_mock.get(TEST_URL, json=[])
+
+    first = response_cache.fetch_day_response(TEST_KEY, PAST_DATE, TEST_URL, "AP01")
+    second = response_cache.fetch_day_response(TEST_KEY, PAST_DATE, TEST_URL, "AP01")
+
+    # The empty (holiday) answer is negatively cached
+    assert first == second == []
+    assert requests_mock.call_count == 1
+
+
+def test_fetch_day_response_never_caches_result_4(requests_mock):
+    requests_mock.get(TEST_URL, json=[{"result": 4}])
+
+    response_cache.fetch_day_response(TEST_KEY, PAST_DATE, TEST_URL, "AP01")
+    response_cache.fetch_day_response(TEST_KEY, PAST_DATE, TEST_URL, "AP01")
+
+    assert requests_mock.call_count == 2
+
+
+def test_fetch_day_response_charges_the_quota_per_attempt(requests_mock, monkeypatch, tmp_path):
+    """Retries are real EXIM calls too: each attempt is charged to the daily quota."""
+    from src.api import http_client
+    from src.api.quota import QuotaManager
+    monkeypatch.setattr(http_client.time, 'sleep', lambda seconds: None)
+    requests_mock.get(TEST_URL, [{"status_code": 503}, {"status_code": 503}, {"json": DAY_DATA}])
+
+    quota = QuotaManager(TEST_KEY, daily_limit=10, state_dir=str(tmp_path))
+    assert response_cache.fetch_day_response(TEST_KEY, PAST_DATE, TEST_URL, "AP01", quota=quota) == DAY_DATA
+
+    assert requests_mock.call_count == 3
+    assert quota.used() == 3
@@ -3,3 +3,14 @@ import pytest
 
 
 os.environ["EXIM_API_KEY"] = "dummy_test_key"
+
+
+@pytest.fixture(autouse=True)
+def isolated_local_state(tmp_path, monkeypatch):
+    """Points the raw EXIM response cache, the quota ledger and the ingestion stage cache at a per-test temp folder."""
+    import src.api.response_cache
+    import src.api.quota
+    import src.data.pipeline
+    monkeypatch.setattr(src.api.response_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(src.api.quota, 'STATE_DIR', str(tmp_path / 'state'))
+    monkeypatch.setattr(src.data.pipeline, 'STAGE_DIR', str(tmp_path / 'stages'))
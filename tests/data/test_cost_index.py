@@ -0,0 +1,79 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import cost_index, export_json
+from src.data.cost_index import CostIndex
+
+
+CITIES = [
+    {"country": "Japan", "city": "Tokyo", "currency": "JPY(100)", "big_mac": 480.0, "starbucks": 490.0, "avg_hotel_krw": 255000},
+    {"country": "Japan", "city": "Fukuoka", "currency": "JPY(100)", "big_mac": 480.0, "starbucks": None, "avg_hotel_krw": 192000},
+    {"country": "France", "city": "Paris", "currency": "EUR", "big_mac": 5.67, "starbucks": 3.75, "avg_hotel_krw": 400000},
+    {"country": "Italy", "city": "Roma", "currency": "EUR", "big_mac": 5.67, "starbucks": 4.75, "avg_hotel_krw": 340000},
+]
+
+
+def test_country_aggregates_and_city_lookup():
+    index = CostIndex(CITIES)
+
+    assert index.country("Japan")["avg_hotel_krw"] == 223500
+    assert index.country(" japan ")["starbucks"] == 490.0
+    assert index.cities_in("Japan") == ["Tokyo", "Fukuoka"]
+    # Fukuoka has no Starbucks price: the country average fills it
+    assert index.city("Japan", "fukuoka")["starbucks"] == 490.0
+    assert index.city("Japan", "Fukuoka")["avg_hotel_krw"] == 192000
+    assert index.city("Japan", "Osaka") is None
+
+
+def test_regions_share_local_prices_only_within_one_currency():
+    index = CostIndex(CITIES)
+
+    euro = index.region("Euro area")
+    assert euro["countries"] == ["France", "Italy"]
+    assert euro["currency"] == "EUR"
+    assert euro["starbucks"] == 4.25
+    assert euro["avg_hotel_krw"] == 370000
+
+    mixed = index.define_region("Trip", ["Japan", "France", "Atlantis"])
+    assert index.region("trip") is mixed
+    assert mixed["countries"] == ["Japan", "France"]
+    assert mixed["currency"] is None and mixed["big_mac"] is None
+    assert mixed["cities"] == 3
+    assert mixed["avg_hotel_krw"] == 282333
+
+
+def test_country_aggregates_match_country_level_export():
+    """The index built from city records reproduces build_cost_data on the bundled CSVs"""
+    index = CostIndex(export_json.build_city_data())
+
+    assert index.to_cost_dict() == export_json.build_cost_data()
+
+
+def test_load_cost_index_reuses_index_until_sources_change(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    pd.DataFrame({"Country": ["Japan", "Japan"], "City": ["Tokyo", "Osaka"], "Avg_price": ["250,000", "200,000"]}) \
+        .to_csv(data_dir / "hotel_price_index.csv", index=False)
+    pd.DataFrame({"Country": ["Japan"], "City": ["Tokyo"], "Avg_price": ["490"]}) \
+        .to_csv(data_dir / "starbucks_drink_index.csv", index=False)
+    pd.DataFrame({"Country": ["Japan"], "local_price": ["480"]}).to_csv(data_dir / "big_mac_index.csv", index=False)
+
+    first = cost_index.load_cost_index(str(data_dir), str(tmp_path / "cache"))
+    assert cost_index.load_cost_index(str(data_dir), str(tmp_path / "cache")) is first
+    assert first.city("Japan", "Osaka") == {
+        "country": "Japan", "city": "Osaka", "currency": "JPY(100)",
+        "big_mac": 480.0, "starbucks": 490.0, "avg_hotel_krw": 200000,
+    }
+
+    pd.DataFrame({"Country": ["Japan"], "City": ["Tokyo"], "Avg_price": ["300,000"]}) \
+        .to_csv(data_dir / "hotel_price_index.csv", index=False)
+    second = cost_index.load_cost_index(str(data_dir), str(tmp_path / "cache"))
+
+    assert second is not first
+    assert second.cities_in("Japan") == ["Tokyo"]
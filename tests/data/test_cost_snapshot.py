@@ -0,0 +1,51 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import cost_snapshot, export_json
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    pd.DataFrame({"Country": ["Japan"], "Avg_price": ["10,000"]}).to_csv(data_dir / "hotel_price_index.csv", index=False)
+    pd.DataFrame({"Country": ["Japan"], "Avg_price": ["5"]}).to_csv(data_dir / "starbucks_drink_index.csv", index=False)
+    pd.DataFrame({"Country": ["Japan"], "local_price": ["4.2"]}).to_csv(data_dir / "big_mac_index.csv", index=False)
+    return data_dir
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    calls = []
+    build = export_json.build_cost_data
+    monkeypatch.setattr(export_json, "build_cost_data", lambda data_dir=None: calls.append(data_dir) or build(data_dir))
+    return calls
+
+
+def test_snapshot_is_built_once_and_reused(data_dir, tmp_path, build_calls):
+    first = cost_snapshot.load_cost_data(str(data_dir), str(tmp_path / "cache"))
+    second = cost_snapshot.load_cost_data(str(data_dir), str(tmp_path / "cache"))
+
+    assert first == second == {"Japan": {"currency": "JPY(100)", "big_mac": 4.2, "starbucks": 5.0, "avg_hotel_krw": 10000}}
+    assert len(build_calls) == 1
+
+
+def test_changed_source_file_rebuilds_snapshot(data_dir, tmp_path, build_calls):
+    cost_snapshot.load_cost_data(str(data_dir), str(tmp_path / "cache"))
+    pd.DataFrame({"Country": ["Japan"], "Avg_price": ["12,000"]}).to_csv(data_dir / "hotel_price_index.csv", index=False)
+
+    costs = cost_snapshot.load_cost_data(str(data_dir), str(tmp_path / "cache"))
+
+    assert costs["Japan"]["avg_hotel_krw"] == 12000
+    assert len(build_calls) == 2
+
+
+def test_missing_sources_return_empty_without_snapshot(tmp_path):
+    assert cost_snapshot.load_cost_data(str(tmp_path), str(tmp_path / "cache")) == {}
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,71 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data import pipeline
+from src.data.pipeline import Source, StageCache
+
+SOURCE_STAGES = ["load.bigmac", "country.bigmac", "load.starbucks", "country.starbucks", "load.hotel", "country.hotel"]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    pd.DataFrame({"Country": ["Japan", "Japan ", "France"], "City ": ["Tokyo", "Osaka", "Paris"],
+                  "Avg_price": ["10,000", "20,000", "80,000"]}).to_csv(data_dir / "hotel_price_index.csv", index=False)
+    pd.DataFrame({"Country": ["Japan", "France"], "City ": ["Tokyo", "Paris"], "Avg_price": ["5", "45"]}) \
+        .to_csv(data_dir / "starbucks_drink_index.csv", index=False)
+    pd.DataFrame({"Country": ["Japan", "Euro area"], "local_price": ["4.2", "4.0"]}) \
+        .to_csv(data_dir / "big_mac_index.csv", index=False)
+    return data_dir
+
+
+def test_run_builds_costs_and_cities(data_dir, tmp_path):
+    cache = StageCache(str(tmp_path / "stages"))
+    output = pipeline.run(str(data_dir), cache=cache)
+
+    assert output["costs"] == {
+        "Japan": {"currency": "JPY(100)", "big_mac": 4.2, "starbucks": 5.0, "avg_hotel_krw": 15000},
+        "France": {"currency": "EUR", "big_mac": 4.0, "starbucks": 45.0, "avg_hotel_krw": 80000},
+    }
+    assert [(c["country"], c["city"], c["starbucks"]) for c in output["cities"]] == [
+        ("France", "Paris", 45.0), ("Japan", "Osaka", None), ("Japan", "Tokyo", 5.0),
+    ]
+    assert cache.built == SOURCE_STAGES + ["costs", "cities"]
+
+
+def test_changed_source_rebuilds_only_downstream_stages(data_dir, tmp_path):
+    pipeline.run(str(data_dir), cache=StageCache(str(tmp_path / "stages")))
+    pd.DataFrame({"Country": ["Japan", "France"], "City ": ["Tokyo", "Paris"], "Avg_price": ["30,000", "80,000"]}) \
+        .to_csv(data_dir / "hotel_price_index.csv", index=False)
+
+    cache = StageCache(str(tmp_path / "stages"))
+    output = pipeline.run(str(data_dir), cache=cache)
+
+    assert output["costs"]["Japan"]["avg_hotel_krw"] == 30000
+    assert cache.built == ["load.hotel", "country.hotel", "costs", "cities"]
+    assert cache.cached == ["load.bigmac", "country.bigmac", "load.starbucks", "country.starbucks"]
+    # The stage file of the old hotel CSV was replaced, not kept next to the new one
+    assert len(list((tmp_path / "stages").glob("load.hotel-*.pkl"))) == 1
+
+
+def test_extra_source_is_merged_into_every_output(data_dir, tmp_path):
+    pd.DataFrame({"Country": ["Japan", "France"], "fare": ["420", "1.9"]}).to_csv(data_dir / "metro.csv", index=False)
+    sources = pipeline.SOURCES + [Source("metro", "metro.csv", "fare", "metro_fare", city_level=False)]
+
+    output = pipeline.run(str(data_dir), sources=sources, cache=StageCache(None))
+
+    assert output["costs"]["Japan"]["metro_fare"] == 420.0
+    assert output["cities"][0]["metro_fare"] == 1.9
+
+
+def test_missing_source_returns_none(data_dir):
+    os.remove(data_dir / "big_mac_index.csv")
+
+    assert pipeline.run(str(data_dir), cache=StageCache(None)) is None
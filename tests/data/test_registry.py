@@ -0,0 +1,51 @@
+import os
+import sys
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.data.registry import REGISTRY, Registry, parse_unit
+
+
+def test_aliases_resolve_to_one_canonical_country():
+    assert REGISTRY.canonical("Britain") == REGISTRY.canonical(" united kingdom ") == "UK"
+    assert REGISTRY.canonical("United States") == "USA"
+    assert REGISTRY.country_id("Hongkong") == REGISTRY.country_id("Hong Kong")
+    # Unregistered names pass through stripped (e.g. the Big Mac "Euro area" row)
+    assert REGISTRY.canonical("Vietnam ") == "Vietnam"
+    assert REGISTRY.country_id("Vietnam") is None
+
+
+def test_currencies_and_units_are_integer_indexed():
+    japan = REGISTRY.country_id("Japan")
+    currency_id = REGISTRY.country_currency[japan]
+
+    assert REGISTRY.currencies[currency_id] == "JPY(100)"
+    assert REGISTRY.units[currency_id] == 100
+    assert REGISTRY.currency_id("JPY") == currency_id
+    assert REGISTRY.unit("USD") == 1
+    assert REGISTRY.unit("XYZ") == 1
+    assert REGISTRY.currency_of("United Arab Emirates") == "AED"
+    assert parse_unit("IDR(100)") == ("IDR", 100)
+
+
+def test_zones_and_target_currencies():
+    assert REGISTRY.zone("euro area") == ("France", "Italy", "Spain", "Austria", "Germany")
+    assert REGISTRY.zone("Nowhere") == ()
+    targets = REGISTRY.target_currencies()
+    assert len(targets) == len(set(targets))
+    assert set(targets) == set(REGISTRY.country_currencies().values())
+
+
+def test_alias_to_unknown_country_is_rejected():
+    with pytest.raises(ValueError):
+        Registry({"Japan": "JPY(100)"}, {"Nippon": "Japon"}, {})
+
+
+def test_version_changes_with_registry_data():
+    base = Registry({"Japan": "JPY(100)"}, {}, {})
+
+    assert base.version == Registry({"Japan": "JPY(100)"}, {}, {}).version
+    assert base.version != Registry({"Japan": "JPY(100)", "USA": "USD"}, {}, {}).version
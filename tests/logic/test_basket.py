@@ -19,3 +19,13 @@ def test_calculate_lsb_negative():
 
 def test_calculate_lsb_zero():
     assert calculate_lsb(0, 0, 0) == 0.0
+
+
+def test_calculate_lsb_batch_matches_scalar():
+    import numpy as np
+    from src.logic.basket import calculate_lsb_batch
+
+    meals, drinks, hotels = [5000, -100, 0, 4.5], [4000, 4000, 0, 3.2], [50000, 50000, 0, 120.0]
+    result = calculate_lsb_batch(np.array(meals), np.array(drinks), np.array(hotels))
+
+    assert list(result) == [calculate_lsb(m, d, h) for m, d, h in zip(meals, drinks, hotels)]
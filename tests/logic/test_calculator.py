@@ -34,3 +34,47 @@ def test_calculate_tei_trend():
 def test_calculate_tei_invalid():
     result = calculate_tei(1000000, 0, 100, 1000, 1000)
     assert result["tei_score"] == 0.0
+
+
+def test_calculate_tei_batch_matches_scalar():
+    import numpy as np
+    from src.logic.calculator import calculate_tei_batch
+
+    cases = [
+        (1000000, 5, 100, 1000, 1000),   # No trend
+        (1000000, 5, 100, 900, 1000),    # Undervalued
+        (1000000, 5, 100, 1100, 0),      # MA missing -> r = 0
+        (1000000, 0, 100, 1000, 1000),   # Invalid duration
+        (1000000, 5, 0, 1000, 1000),     # Invalid cost
+        (1000000, 5, 100, -10, 1000),    # Non-positive converted cost
+    ]
+    result = calculate_tei_batch(*(np.array(column, dtype=float) for column in zip(*cases)))
+
+    for i, case in enumerate(cases):
+        expected = calculate_tei(*case)
+        assert bool(result["error"][i]) == ("error" in expected)
+        assert result["tei_score"][i] == expected["tei_score"]
+        if "error" not in expected:
+            assert result["trend_impact"][i] == expected["trend_impact"]
+            assert result["adjusted_rate"][i] == expected["adjusted_rate"]
+            assert bool(result["is_undervalued"][i]) == expected["is_undervalued"]
+
+
+def test_calculate_tei_batch_broadcasts_scenarios():
+    import numpy as np
+    from src.logic.calculator import calculate_tei_batch
+
+    # 2 budgets x 3 destinations in one call
+    budgets = np.array([[1000000], [2000000]])
+    result = calculate_tei_batch(budgets, 5, np.array([100, 200, 50]), np.array([1000, 1000, 900]), 1000)
+
+    assert result["tei_score"].shape == (2, 3)
+    assert result["tei_score"][1, 0] == calculate_tei(2000000, 5, 100, 1000, 1000)["tei_score"]
+
+
+def test_round_half_even_matches_python_round():
+    import numpy as np
+    from src.logic.calculator import round_half_even
+
+    values = [2.675, 0.125, 1.005, 3.14159, -2.675, 1234.5650]
+    assert list(round_half_even(np.array(values))) == [round(v, 2) for v in values]
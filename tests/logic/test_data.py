@@ -91,4 +91,32 @@ def test_main_creates_correct_result_json(tmp_path, monkeypatch):
     assert fr["currency"] == "EUR"
     assert fr["avg_hotel_krw"] == 80000
     assert fr["starbucks"] == 45.0
-    assert fr["big_mac"] == 4.0
\ No newline at end of file
+    assert fr["big_mac"] == 4.0
+
+def test_clean_number_series_matches_clean_number():
+    """The vectorized cleaner gives the same numbers as clean_number (empty cells stay NaN)."""
+    raw = pd.Series(["1,000", " 123 ", "abc", "4.75 ", "192,000", None])
+    cleaned = export_json.clean_number_series(raw)
+
+    assert list(cleaned[:5]) == [export_json.clean_number(value) for value in raw[:5]]
+    assert pd.isna(cleaned[5])
+
+
+def test_read_country_averages_streams_chunks(tmp_path):
+    """Chunked reading gives the same per-country averages as one read, with the trailing empty column skipped."""
+    path = tmp_path / "hotel.csv"
+    path.write_text(
+        "Country,City ,Avg_price,\n"
+        "Japan ,Tokyo,\"10,000\",\n"
+        "Japan,Osaka,\"20,000\",\n"
+        "Britain,London,\"30,000\",\n"
+        "UK,Leeds,,\n"
+        "France,Paris,abc,\n",
+        encoding="utf-8",
+    )
+
+    averages = export_json.read_country_averages(str(path), "Avg_price", "avg_hotel_krw", chunksize=2)
+    result = dict(zip(averages["Country"], averages["avg_hotel_krw"]))
+
+    assert list(averages.columns) == ["Country", "avg_hotel_krw"]
+    assert result == {"Japan": 15000.0, "UK": 30000.0, "France": 0.0}
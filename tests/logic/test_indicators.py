@@ -0,0 +1,90 @@
+import sys
+import os
+# tests/logic/test_foo.py -> tests/logic -> tests -> root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.logic.indicators import rolling_sma, ema, compute_indicators, bounded_ffill, gap_aware_indicators, KINDS
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(3)
+    values = 1000 + np.cumsum(rng.normal(0, 5, size=(300, 4)), axis=0)
+    values[10, 1] = np.nan        # One missing rate
+    values[:40, 3] = np.nan       # A currency with a shorter history
+    return values
+
+
+def test_sma_matches_pandas_for_every_window(values):
+    result = rolling_sma(values, [20, 50, 252])
+    frame = pd.DataFrame(values)
+
+    for window in (20, 50, 252):
+        expected = frame.rolling(window=window).mean().to_numpy()
+        np.testing.assert_allclose(result[window], expected, rtol=1e-10, equal_nan=True)
+
+
+def test_ema_matches_pandas_for_every_window(values):
+    result = ema(values, [20, 120])
+    frame = pd.DataFrame(values)
+
+    for window in (20, 120):
+        expected = frame.ewm(span=window, adjust=False, min_periods=window, ignore_na=True).mean().to_numpy()
+        np.testing.assert_allclose(result[window], expected, rtol=1e-10, equal_nan=True)
+
+
+def test_sma_min_periods_matches_pandas(values):
+    result = rolling_sma(values, [20, 50], min_periods=15)
+    frame = pd.DataFrame(values)
+
+    for window in (20, 50):
+        expected = frame.rolling(window=window, min_periods=15).mean().to_numpy()
+        np.testing.assert_allclose(result[window], expected, rtol=1e-10, equal_nan=True)
+
+
+def test_window_longer_than_history_is_all_nan(values):
+    assert np.isnan(rolling_sma(values[:30], [50])[50]).all()
+    assert np.isnan(ema(values[:30], [50])[50]).all()
+
+
+def test_compute_indicators_keys_and_unknown_kind(values):
+    result = compute_indicators(values, windows=[20, 50])
+    assert set(result) == {("sma", 20), ("sma", 50), ("ema", 20), ("ema", 50)}
+
+    with pytest.raises(ValueError):
+        compute_indicators(values, kinds=["wma"])
+
+
+def test_bounded_ffill_only_bridges_short_gaps():
+    values = np.array([[1.0], [np.nan], [np.nan], [4.0], [np.nan], [np.nan], [np.nan], [np.nan]])
+    filled = bounded_ffill(values, 2)
+    np.testing.assert_array_equal(filled[:, 0], [1, 1, 1, 4, 4, 4, np.nan, np.nan])
+
+
+def test_gap_aware_indicators_match_pandas_on_full_history(values):
+    averages, coverage = gap_aware_indicators(values[:, :1], [20, 50], KINDS, max_fill=3, min_coverage=0.8)
+    frame = pd.DataFrame(values[:, :1]).ffill(limit=3)
+
+    # Column 0 has no gap, so the time-based windows equal the row-based ones
+    for window in (20, 50):
+        expected_sma = frame.rolling(window, min_periods=1).mean().to_numpy()
+        expected_ema = frame.ewm(span=window, adjust=False, ignore_na=True).mean().to_numpy()
+        np.testing.assert_allclose(averages[("sma", window)][window:], expected_sma[window:], rtol=1e-10)
+        np.testing.assert_allclose(averages[("ema", window)][window:], expected_ema[window:], rtol=1e-10)
+        assert coverage[window][-1, 0] == 1.0
+
+
+def test_gap_aware_indicators_flag_partial_windows_and_enforce_coverage():
+    series = np.arange(1.0, 11.0)[:, None]     # 10 business days
+    series[6:8] = np.nan                       # 2-day gap, filled from day 6
+    averages, coverage = gap_aware_indicators(series, [5], ["sma"], max_fill=1, min_coverage=0.6)
+
+    assert coverage[5][-1, 0] == pytest.approx(3 / 5)
+    assert averages[("sma", 5)][-1, 0] == pytest.approx(np.mean([6.0, 6.0, 9.0, 10.0]))   # Day 8 stays empty
+
+    strict, _ = gap_aware_indicators(series, [5], ["sma"], max_fill=1, min_coverage=0.8)
+    assert np.isnan(strict[("sma", 5)][-1, 0])
@@ -0,0 +1,59 @@
+import sys
+import os
+# tests/logic/test_foo.py -> tests/logic -> tests -> root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import random
+import pandas as pd
+import pytest
+
+from src.logic.moving_average import StreamingMovingAverage
+
+
+def make_dates(count):
+    return [f"{20000000 + i}" for i in range(count)]
+
+
+def test_matches_pandas_rolling_mean():
+    rng = random.Random(7)
+    values = [1000 + rng.uniform(-50, 50) for _ in range(500)]
+    expected = pd.Series(values).rolling(window=50).mean()
+
+    engine = StreamingMovingAverage(50)
+    for i, (date, value) in enumerate(zip(make_dates(500), values)):
+        engine.update(date, value)
+        if i < 49:
+            assert engine.mean is None
+        else:
+            assert engine.mean == pytest.approx(expected.iloc[i], rel=1e-12)
+
+
+def test_state_round_trip_continues_identically():
+    values = [float(i % 13) for i in range(120)]
+    dates = make_dates(120)
+    engine = StreamingMovingAverage(20)
+    for date, value in zip(dates[:70], values[:70]):
+        engine.update(date, value)
+
+    restored = StreamingMovingAverage.from_state(engine.to_state())
+    for date, value in zip(dates[70:], values[70:]):
+        engine.update(date, value)
+        restored.update(date, value)
+
+    assert restored.mean == engine.mean
+    assert restored.latest == values[-1]
+    assert restored.first_date == dates[100]
+
+
+def test_ignores_dates_not_newer_than_last():
+    engine = StreamingMovingAverage(2)
+    assert engine.update("20251210", 1.0)
+    assert not engine.update("20251210", 5.0)
+    assert not engine.update("20251209", 5.0)
+    assert engine.count == 1
+    assert engine.latest == 1.0
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        StreamingMovingAverage(0)
@@ -0,0 +1,78 @@
+import sys
+import os
+# tests/logic/test_foo.py -> tests/logic -> tests -> root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.logic.robust_baseline import (
+    StreamingMedian, StreamingTrimmedMean, rolling_median, rolling_trimmed_mean
+)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(11)
+    values = np.round(1000 + rng.normal(0, 10, size=400), 0)   # Rounded: many duplicates
+    values[150] = 5000.0                                          # One shock day
+    values[[40, 41, 300]] = np.nan
+    return values
+
+
+def trimmed_mean(window_values, trim):
+    window_values = np.sort(window_values[~np.isnan(window_values)])
+    cut = int(len(window_values) * trim)
+    return window_values[cut:len(window_values) - cut].mean()
+
+
+def test_rolling_median_matches_pandas(series):
+    result = rolling_median(series, 50, min_periods=45)
+    expected = pd.Series(series).rolling(50, min_periods=45).median().to_numpy()
+    np.testing.assert_allclose(result, expected, equal_nan=True)
+
+
+def test_rolling_trimmed_mean_matches_sorted_reference(series):
+    result = rolling_trimmed_mean(series, 50, trim=0.1, min_periods=45)
+    for i in range(49, len(series)):
+        assert result[i] == pytest.approx(trimmed_mean(series[i - 49:i + 1], 0.1))
+
+
+@pytest.mark.parametrize("window, trim", [(7, 0.2), (20, 0.3), (50, 0.1)])
+def test_trimmed_mean_tail_sums_follow_every_update(series, window, trim):
+    """The running tail sums stay exact while the window warms up, slides and shrinks around NaN days."""
+    engine = StreamingTrimmedMean(window, trim, min_periods=1)
+    for i, value in enumerate(series):
+        result = engine.update(float(value))
+        window_values = series[max(0, i - window + 1):i + 1]
+        assert result == pytest.approx(trimmed_mean(window_values, trim))
+
+
+def test_shock_day_does_not_move_robust_baselines(series):
+    window = series[110:160]
+    assert np.nanmedian(window) == rolling_median(series, 50, min_periods=45)[159]
+    assert rolling_trimmed_mean(series, 50, min_periods=45)[159] < np.nanmean(window) - 50
+
+
+def test_batch_works_column_wise_on_2d_arrays(series):
+    values = np.column_stack([series, series * 2])
+    result = rolling_median(values, 20, min_periods=15)
+    np.testing.assert_allclose(result[:, 1], rolling_median(series * 2, 20, min_periods=15), equal_nan=True)
+
+
+def test_incremental_engines_report_none_until_enough_values():
+    median = StreamingMedian(3)
+    trimmed = StreamingTrimmedMean(3, trim=0.0)
+    assert median.update(1.0) is None and trimmed.update(1.0) is None
+    assert median.update(9.0) is None and trimmed.update(9.0) is None
+    assert median.update(2.0) == 2.0
+    assert trimmed.update(2.0) == pytest.approx(4.0)
+    assert median.update(3.0) == 3.0          # Window is now 9, 2, 3
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        StreamingMedian(0)
+    with pytest.raises(ValueError):
+        StreamingTrimmedMean(10, trim=0.5)
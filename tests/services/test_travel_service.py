@@ -2,6 +2,7 @@ import sys
 import os
 import pytest
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
 
 # Add project root to path
@@ -15,7 +16,7 @@ if project_root not in sys.path:
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from src.services.travel_service import run_analysis_pipeline
+from src.services.travel_service import run_analysis_pipeline, run_scenario_sweep, sweep_table
 
 @pytest.fixture
 def mock_dependencies():
@@ -24,35 +25,44 @@ def mock_dependencies():
          patch('src.services.travel_service.api_loader') as mock_api, \
          patch('src.services.travel_service.moveAvgDay') as mock_ma, \
          patch('src.services.travel_service.export_json') as mock_export, \
+         patch('src.services.travel_service.cost_snapshot') as mock_snapshot, \
          patch('src.services.travel_service.basket') as mock_basket, \
          patch('src.services.travel_service.calculator') as mock_calc:
         
-        yield mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc
+        yield mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc, mock_snapshot
+
+def mock_batch_scores(mock_basket, mock_calc, lsb, score, trend):
+    """Makes the batch calculators return the same dummy LSB / score / trend for every destination."""
+    mock_basket.calculate_lsb_batch.side_effect = lambda meal_cost, drink_cost, accommodation_cost: \
+        np.full(len(meal_cost), lsb)
+    mock_calc.calculate_tei_batch.side_effect = lambda budget, duration, local_daily_cost, current_rate, ma_rate: {
+        'tei_score': np.full(len(local_daily_cost), score),
+        'trend_impact': np.full(len(local_daily_cost), trend),
+    }
 
 def test_pipeline_success(mock_dependencies):
     """Test successful execution of the full pipeline"""
-    (mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc) = mock_dependencies
+    (mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc, mock_snapshot) = mock_dependencies
     
     # 1. Mock Data Setup
     mock_country.get_target_currencies.return_value = ['USD', 'JPY(100)']
     mock_api.load_api_key.return_value = ('fake_key', 'code', 'url')
     
     # Mock MA Data (DataFrame)
-    mock_ma.get_50day_ma_data.return_value = pd.DataFrame({
+    mock_ma.get_trend_data.return_value = pd.DataFrame({
         'Currency Code': ['USD', 'JPY(100)'],
         'Currency': [1300.0, 900.0],     # JPY raw: 900 -> 9.0 per yen
-        '50-day_MA': [1200.0, 950.0]     # JPY raw: 950 -> 9.5 per yen
+        'MA': [1200.0, 950.0]            # JPY raw: 950 -> 9.5 per yen
     })
     
     # Mock Cost Data (JSON Dict)
-    mock_export.main.return_value = {
+    mock_snapshot.load_cost_data.return_value = {
         'United States': {'currency': 'USD', 'big_mac': 8.0, 'starbucks': 5.0, 'avg_hotel_krw': 150000},
         'Japan': {'currency': 'JPY(100)', 'big_mac': 500, 'starbucks': 450, 'avg_hotel_krw': 100000}
     }
     
     # Mock Calculation Results
-    mock_basket.calculate_lsb.return_value = 100.0  # Dummy LSB
-    mock_calc.calculate_tei.return_value = {'tei_score': 2.5, 'trend_impact': -0.05}
+    mock_batch_scores(mock_basket, mock_calc, lsb=100.0, score=2.5, trend=-0.05)  # Dummy LSB / TEI
     
     # 2. Run Pipeline
     results, status = run_analysis_pipeline(total_budget=2000000, days=10)
@@ -82,9 +92,128 @@ def test_pipeline_api_error(mock_dependencies):
     (mock_country, mock_api, mock_ma, *_) = mock_dependencies
     mock_country.get_target_currencies.return_value = ['USD']
     mock_api.load_api_key.return_value = ('key', 'code', 'url')
-    mock_ma.get_50day_ma_data.side_effect = Exception("API Timeout")
+    mock_ma.get_trend_data.side_effect = Exception("API Timeout")
     
     results, status = run_analysis_pipeline(1000, 5)
     
     assert results == []
     assert "API/DB failed" in status
+
+def test_pipeline_uses_selected_trend_window(mock_dependencies):
+    """The trend window and kind are passed through to the MA engine"""
+    (mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc, mock_snapshot) = mock_dependencies
+    mock_country.get_target_currencies.return_value = ['USD']
+    mock_api.load_api_key.return_value = ('key', 'code', 'url')
+    mock_ma.get_trend_data.return_value = pd.DataFrame({
+        'Currency Code': ['USD'], 'Currency': [1300.0], 'MA': [1250.0]
+    })
+    mock_snapshot.load_cost_data.return_value = {
+        'United States': {'currency': 'USD', 'big_mac': 8.0, 'starbucks': 5.0, 'avg_hotel_krw': 150000}
+    }
+    mock_batch_scores(mock_basket, mock_calc, lsb=100.0, score=1.2, trend=0.04)
+
+    results, status = run_analysis_pipeline(1000000, 5, trend_window=252, trend_kind="ema")
+
+    assert status == "Success"
+    mock_ma.get_trend_data.assert_called_once_with('key', window=252, kind="ema")
+    assert list(mock_calc.calculate_tei_batch.call_args.kwargs['ma_rate']) == [1250.0]
+
+def test_pipeline_scores_cities_from_cost_index(mock_dependencies):
+    """level='city' scores each indexed city and tags the result with its city name"""
+    (mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc, mock_snapshot) = mock_dependencies
+    mock_country.get_target_currencies.return_value = ['JPY(100)']
+    mock_api.load_api_key.return_value = ('key', 'code', 'url')
+    mock_ma.get_trend_data.return_value = pd.DataFrame({
+        'Currency Code': ['JPY(100)'], 'Currency': [900.0], 'MA': [950.0]
+    })
+    mock_batch_scores(mock_basket, mock_calc, lsb=100.0, score=1.1, trend=-0.05)
+
+    with patch('src.services.travel_service.cost_index') as mock_index:
+        mock_index.load_cost_index.return_value.iter_cities.return_value = [
+            {'country': 'Japan', 'city': 'Tokyo', 'currency': 'JPY(100)', 'big_mac': 480.0, 'starbucks': 490.0, 'avg_hotel_krw': 255000},
+            {'country': 'Japan', 'city': 'Fukuoka', 'currency': 'JPY(100)', 'big_mac': 480.0, 'starbucks': 490.0, 'avg_hotel_krw': 192000},
+        ]
+        results, status = run_analysis_pipeline(1000000, 5, level="city")
+
+    assert status == "Success"
+    assert [(r['country_code'], r['city']) for r in results] == [('Japan', 'Tokyo'), ('Japan', 'Fukuoka')]
+    mock_snapshot.load_cost_data.assert_not_called()
+    # Hotel (KRW) is converted with the per-yen rate (900 / 100) for each city
+    hotels = mock_basket.calculate_lsb_batch.call_args.kwargs['accommodation_cost']
+    assert list(hotels) == [255000 / 9.0, 192000 / 9.0]
+
+def test_pipeline_batch_scores_match_scalar_calculators(mock_dependencies):
+    """With the real calculators, one batch call gives the scores of the per-country scalar functions"""
+    (mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc, mock_snapshot) = mock_dependencies
+    from src.logic import basket, calculator
+    mock_basket.calculate_lsb_batch.side_effect = basket.calculate_lsb_batch
+    mock_calc.calculate_tei_batch.side_effect = calculator.calculate_tei_batch
+    mock_country.get_target_currencies.return_value = ['USD', 'JPY(100)']
+    mock_api.load_api_key.return_value = ('key', 'code', 'url')
+    mock_ma.get_trend_data.return_value = pd.DataFrame({
+        'Currency Code': ['USD', 'JPY(100)'], 'Currency': [1300.0, 900.0], 'MA': [1200.0, 950.0]
+    })
+    mock_snapshot.load_cost_data.return_value = {
+        'USA': {'currency': 'USD', 'big_mac': 5.79, 'starbucks': 4.84, 'avg_hotel_krw': 358500},
+        'Japan': {'currency': 'JPY(100)', 'big_mac': 480.0, 'starbucks': 490.0, 'avg_hotel_krw': 205000},
+        'Nowhere': {'currency': 'USD', 'big_mac': -1.0, 'starbucks': 4.0, 'avg_hotel_krw': 100000},
+    }
+
+    results, status = run_analysis_pipeline(2000000, 10)
+
+    assert status == "Success"
+    for result, (cost, rate, ma) in zip(results, [
+        (mock_snapshot.load_cost_data.return_value['USA'], 1300.0, 1200.0),
+        (mock_snapshot.load_cost_data.return_value['Japan'], 9.0, 9.5),
+        (mock_snapshot.load_cost_data.return_value['Nowhere'], 1300.0, 1200.0),
+    ]):
+        lsb = basket.calculate_lsb(cost['big_mac'], cost['starbucks'], cost['avg_hotel_krw'] / rate)
+        expected = calculator.calculate_tei(2000000, 10, lsb, rate, ma)
+        assert result['lsb_cost_local'] == round(lsb, 2)
+        assert result['ppi_score'] == expected['tei_score']
+        assert result['trend_factor'] == expected.get('trend_impact', 0.0)
+    # Negative meal cost -> LSB 0 -> scored 0 (the scalar version reports an error)
+    assert results[2]['ppi_score'] == 0.0
+
+def test_scenario_sweep_loads_once_and_matches_single_runs(mock_dependencies):
+    """Every (budget, days) cell of the sweep equals the PPI of a single pipeline run"""
+    (mock_country, mock_api, mock_ma, mock_export, mock_basket, mock_calc, mock_snapshot) = mock_dependencies
+    from src.logic import basket, calculator
+    mock_basket.calculate_lsb_batch.side_effect = basket.calculate_lsb_batch
+    mock_calc.calculate_tei_batch.side_effect = calculator.calculate_tei_batch
+    mock_country.get_target_currencies.return_value = ['USD', 'JPY(100)']
+    mock_api.load_api_key.return_value = ('key', 'code', 'url')
+    mock_ma.get_trend_data.return_value = pd.DataFrame({
+        'Currency Code': ['USD', 'JPY(100)'], 'Currency': [1300.0, 900.0], 'MA': [1200.0, 950.0]
+    })
+    mock_snapshot.load_cost_data.return_value = {
+        'USA': {'currency': 'USD', 'big_mac': 5.79, 'starbucks': 4.84, 'avg_hotel_krw': 358500},
+        'Japan': {'currency': 'JPY(100)', 'big_mac': 480.0, 'starbucks': 490.0, 'avg_hotel_krw': 205000},
+    }
+    budgets, days = [1000000, 2500000, 4000000], [3, 7]
+
+    sweep, status = run_scenario_sweep(budgets, days)
+
+    assert status == "Success"
+    assert sweep['ppi'].shape == (3, 2, 2)
+    mock_ma.get_trend_data.assert_called_once()
+    mock_snapshot.load_cost_data.assert_called_once()
+
+    for i, budget in enumerate(budgets):
+        for j, duration in enumerate(days):
+            results, _ = run_analysis_pipeline(budget, duration)
+            assert list(sweep['ppi'][i, j]) == [result['ppi_score'] for result in results]
+
+    table = sweep_table(sweep)
+    assert list(table.columns) == ['budget', 'days', 'USA', 'Japan', 'best']
+    assert list(zip(table['budget'], table['days']))[:3] == [(1000000, 3), (1000000, 7), (2500000, 3)]
+    assert table.loc[1, 'Japan'] == sweep['ppi'][0, 1, 1]
+
+def test_scenario_sweep_reports_pipeline_errors(mock_dependencies):
+    (mock_country, *_) = mock_dependencies
+    mock_country.get_target_currencies.return_value = []
+
+    sweep, status = run_scenario_sweep([1000000, 2000000], [5])
+
+    assert sweep == {}
+    assert "No target currencies" in status
@@ -1,5 +1,6 @@
 import sys
 import os
+import subprocess
 import pytest
 from unittest.mock import patch
 from io import StringIO
@@ -25,7 +26,7 @@ def test_main_success(mock_pipeline, capsys):
     # 1. Setup Mock
     mock_results = [
         {'country_code': 'Japan', 'ppi_score': 1.5, 'currency_code': 'JPY(100)'},
-        {'country_code': 'USA', 'ppi_score': 0.8, 'currency_code': 'USD'}
+        {'country_code': 'USA', 'ppi_score': 0.8, 'currency_code': 'USD', 'trend_coverage': 0.9}
     ]
     mock_pipeline.return_value = (mock_results, "Success")
     
@@ -45,6 +46,7 @@ def test_main_success(mock_pipeline, capsys):
     assert "🤑 PLENTY" in output  # Score 1.5 -> PLENTY
     assert "USA" in output
     assert "⚠️ TIGHT" in output   # Score 0.8 -> TIGHT
+    assert "(trend: 90% data)" in output
 
 @patch('src.main.run_analysis_pipeline')
 def test_main_failure(mock_pipeline, capsys):
@@ -62,6 +64,70 @@ def test_main_failure(mock_pipeline, capsys):
     assert "!!! ANALYSIS FAILED !!!" in captured.out
     assert "Database Connection Failed" in captured.out
 
+@patch('src.main.run_analysis_pipeline')
+def test_main_passes_trend_options(mock_pipeline):
+    """--trend-window / --trend-kind are forwarded to the pipeline"""
+    mock_pipeline.return_value = ([], "Error: skipped")
+
+    test_args = ["main.py", "--budget", "1000000", "--days", "5", "--trend-window", "252", "--trend-kind", "ema"]
+    with patch.object(sys, 'argv', test_args):
+        main()
+
+    mock_pipeline.assert_called_once_with(1000000.0, 5, 252, "ema", "country")
+
+@patch('src.main.run_analysis_pipeline')
+def test_main_city_level_labels_rows_with_city(mock_pipeline, capsys):
+    """--level city is forwarded and city rows are labelled 'City (Country)'"""
+    mock_results = [
+        {'country_code': 'Japan', 'city': 'Fukuoka', 'ppi_score': 1.2, 'currency_code': 'JPY(100)'},
+        {'country_code': 'Japan', 'city': 'Tokyo', 'ppi_score': 0.9, 'currency_code': 'JPY(100)'},
+    ]
+    mock_pipeline.return_value = (mock_results, "Success")
+
+    test_args = ["main.py", "--budget", "1000000", "--days", "5", "--level", "city"]
+    with patch.object(sys, 'argv', test_args):
+        main()
+
+    assert mock_pipeline.call_args.args[-1] == "city"
+    output = capsys.readouterr().out
+    assert "Fukuoka (Japan)" in output
+    assert output.index("Fukuoka (Japan)") < output.index("Tokyo (Japan)")
+
+@patch('src.main.run_analysis_pipeline')
+@patch('src.main.run_scenario_sweep')
+def test_main_sweep_mode_prints_scenario_table(mock_sweep, mock_pipeline, capsys, tmp_path):
+    """Several --budget / --days values run one sweep instead of the single pipeline"""
+    import pandas as pd
+    table = pd.DataFrame({
+        'budget': [1000000.0, 1000000.0, 2000000.0, 2000000.0], 'days': [5, 10, 5, 10],
+        'Japan': [1.2, 0.6, 2.4, 1.2], 'UK': [0.8, 0.4, 1.6, 0.8], 'best': ['Japan'] * 4,
+    })
+    mock_sweep.return_value = (table, "Success")
+    output_path = tmp_path / "sweep.csv"
+
+    test_args = ["main.py", "--budget", "1000000", "2000000", "--days", "5", "10", "--output", str(output_path)]
+    with patch.object(sys, 'argv', test_args):
+        main()
+
+    mock_sweep.assert_called_once_with([1000000.0, 2000000.0], [5, 10], 50, "sma", "country")
+    mock_pipeline.assert_not_called()
+    output = capsys.readouterr().out
+    assert "PPI Scenario Sweep" in output
+    assert "2,000,000" in output and "2.40" in output
+    assert pd.read_csv(output_path).shape == (4, 5)
+
+@patch('src.main.run_analysis_pipeline')
+def test_main_rejects_output_without_sweep(mock_pipeline, capsys, tmp_path):
+    """--output is a sweep option: a single run must fail loudly instead of ignoring it"""
+    test_args = ["main.py", "--budget", "1000000", "--days", "5", "--output", str(tmp_path / "sweep.csv")]
+    with patch.object(sys, 'argv', test_args):
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+
+    assert exit_info.value.code == 2
+    assert "--output needs a scenario sweep" in capsys.readouterr().err
+    mock_pipeline.assert_not_called()
+
 def test_main_invalid_args(capsys):
     """Test input validation (negative budget)"""
     test_args = ["main.py", "--budget", "-100", "--days", "5"]
@@ -74,3 +140,17 @@ def test_main_invalid_args(capsys):
     captured = capsys.readouterr()
     assert "!!! ANALYSIS FAILED !!!" in captured.out
     assert "positive values" in captured.out
+
+
+def test_main_import_defers_heavy_dependencies():
+    """Importing the CLI (as for --help) must not load pandas/requests or need an API key"""
+    code = (
+        "import sys; sys.path.insert(0, 'src'); import main; "
+        "print(any(m in sys.modules for m in ('pandas', 'requests', 'services.travel_service')))"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "EXIM_API_KEY"}
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "False"